@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -21,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "myapp.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -54,6 +56,63 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            # Take the write lock at BEGIN so busy_timeout applies, instead of
+            # failing immediately when a read transaction tries to upgrade.
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
+        # A file rather than the in-memory default, so threaded tests exercise
+        # the same WAL/busy_timeout locking as the real database.
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+    }
+}
+
+# Applied to every SQLite connection by myapp.database.configure_sqlite_connection.
+# SQLITE_WAL=0 falls back to SQLite's defaults (rollback journal, FULL sync).
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,
+    "busy_timeout": 20000,
+    "temp_store": "MEMORY",
+    "cache_size": -20000,
+} if os.environ.get("SQLITE_WAL", "1") == "1" else {}
+
+# Point DJANGO_Q_DB_PATH at a separate SQLite file to move the django_q broker,
+# schedules and results off the main database's write lock. Run
+# `python manage.py migrate --database django_q` once after enabling it.
+DJANGO_Q_DATABASE = "default"
+DATABASE_ROUTERS = ["myapp.routers.DjangoQRouter", "myapp.routers.ReadReplicaRouter"]
+if os.environ.get("DJANGO_Q_DB_PATH"):
+    DJANGO_Q_DATABASE = "django_q"
+    DATABASES["django_q"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ["DJANGO_Q_DB_PATH"],
+        "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 20},
+    }
+
+# Analytics views (instructor dashboard, timeline, exports) read from this
+# alias when it exists and was synced within MAX_STALENESS_SECONDS. Locally,
+# set REPLICA_DB_PATH and keep it fresh with `python manage.py sync_replica --interval 30`.
+READ_REPLICA = {
+    "ALIAS": "replica",
+    "MAX_STALENESS_SECONDS": int(os.environ.get("REPLICA_MAX_STALENESS_SECONDS", "60")),
+}
+if os.environ.get("REPLICA_DB_PATH"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ["REPLICA_DB_PATH"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Computed analytics (e.g. /groups/{id}/velocity/) are cached until the
+# underlying rows change. Per-process memory is enough for runserver; point
+# this at a shared backend when running several web workers.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "myapp",
     }
 }
 
@@ -70,8 +129,6 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
-import os
-
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 ENV_PATH = BASE_DIR / ".env"
 if ENV_PATH.exists() and not GEMINI_API_KEY:
@@ -80,6 +137,35 @@ if ENV_PATH.exists() and not GEMINI_API_KEY:
             GEMINI_API_KEY = line.split("=", 1)[1].strip()
             break
 
+# LLM calls go through the shared client in myapp.llm. "fake" is a deterministic
+# in-process backend for local runs, tests and benchmarks; it is only used when
+# asked for with LLM_BACKEND=fake. With the gemini backend and no key, every
+# call raises LLMError and callers skip the work. Transient errors are retried MAX_RETRIES times with
+# exponential backoff; after BREAKER_THRESHOLD consecutive failures calls fail
+# fast for BREAKER_COOLDOWN_SECONDS.
+LLM = {
+    "BACKEND": os.environ.get("LLM_BACKEND") or "gemini",
+    "MODEL": "gemini-1.5-flash",
+    "TIMEOUT_SECONDS": 30,
+    "MAX_RETRIES": 3,
+    "BACKOFF_SECONDS": 0.5,
+    "BACKOFF_MAX_SECONDS": 8,
+    "BREAKER_THRESHOLD": 5,
+    "BREAKER_COOLDOWN_SECONDS": 30,
+    "FAKE_LATENCY_MS": int(os.environ.get("LLM_FAKE_LATENCY_MS", "0")),
+}
+
+# myapp.dispute_resolution: LLM calls in flight at once, calls allowed per
+# minute, disputes per load/write batch, and seconds per run (kept under the
+# django_q timeout; calls stop starting LLM["TIMEOUT_SECONDS"] before it, and a
+# run that runs out of time re-queues itself).
+DISPUTE_RESOLUTION = {
+    "CONCURRENCY": 4,
+    "CALLS_PER_MINUTE": 60,
+    "BATCH_SIZE": 20,
+    "MAX_SECONDS": 75,
+}
+
 Q_CLUSTER = {
     'name': 'myapp',
     'workers': 2,
@@ -87,5 +173,29 @@ Q_CLUSTER = {
     'retry': 120,
     'queue_limit': 50,
     'bulk': 10,
-    'orm': 'default',  # use Django's DB as broker (no Redis/RabbitMQ needed)
-}
\ No newline at end of file
+    'orm': DJANGO_Q_DATABASE,  # use Django's DB as broker (no Redis/RabbitMQ needed)
+}
+
+# Per-request timing (Server-Timing header + slow-request log). Cheap enough to
+# leave on; set PERF_INSTRUMENTATION=0 to remove the middleware entirely.
+PERF_INSTRUMENTATION = {
+    "ENABLED": os.environ.get("PERF_INSTRUMENTATION", "1") == "1",
+    "SLOW_REQUEST_MS": int(os.environ.get("PERF_SLOW_REQUEST_MS", "500")),
+    "QUERY_SAMPLE_RATE": float(os.environ.get("PERF_QUERY_SAMPLE_RATE", "0.1")),
+    "MAX_FINGERPRINTS": 5,
+    "SERVER_TIMING": True,
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "plain": {"format": "%(asctime)s %(name)s %(levelname)s %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "plain"},
+    },
+    "loggers": {
+        "myapp.perf": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
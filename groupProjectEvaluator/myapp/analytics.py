@@ -0,0 +1,264 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import DecimalField, IntegerField, Sum, Value
+from django.utils import timezone
+
+from .models import Sprint, SprintContribution, Story_Point_Estimates, Task, TaskStatusEvent
+
+VELOCITY_CACHE_KEY = "group_velocity:{group_id}"
+FLOW_CACHE_KEY = "sprint_flow:{sprint_id}"
+FLOW_STATUSES = [code for code, _ in Task.STATUS_CHOICES]
+
+
+def velocity_cache_key(group_id):
+    return VELOCITY_CACHE_KEY.format(group_id=group_id)
+
+
+def invalidate_group_velocity(group_id):
+    if group_id:
+        cache.delete(velocity_cache_key(group_id))
+
+
+def group_velocity(group_id):
+    """
+    Per-sprint committed (Story_Point_Estimates) vs delivered
+    (SprintContribution) story points and hours for a group, with per-member
+    breakdowns and burn-up totals. Cached until the next contribution or
+    estimate write in the group.
+    """
+    key = velocity_cache_key(group_id)
+    data = cache.get(key)
+    if data is None:
+        data = _compute_group_velocity(group_id)
+        cache.set(key, data, timeout=None)
+    return data
+
+
+def _compute_group_velocity(group_id):
+    sprints = list(
+        Sprint.objects.filter(group_id=group_id)
+        .order_by("start_date", "id")
+        .values("id", "name", "start_date", "end_date", "is_active")
+    )
+
+    # Both per-(sprint, member) aggregates come back from one UNION ALL query.
+    zero_points = Value(0, output_field=IntegerField())
+    zero_hours = Value(Decimal("0"), output_field=DecimalField(max_digits=8, decimal_places=2))
+    committed = (
+        Story_Point_Estimates.objects.filter(sprint__group_id=group_id)
+        .values("sprint_id", "member_id")
+        .annotate(committed=Sum("point_estimate"), delivered=zero_points, hours=zero_hours)
+        .values_list("sprint_id", "member_id", "member__name", "committed", "delivered", "hours")
+    )
+    delivered = (
+        SprintContribution.objects.filter(sprint__group_id=group_id)
+        .values("sprint_id", "member_id")
+        .annotate(committed=zero_points, delivered=Sum("story_points"), hours=Sum("hours_worked"))
+        .values_list("sprint_id", "member_id", "member__name", "committed", "delivered", "hours")
+    )
+
+    by_sprint = {sprint["id"]: {} for sprint in sprints}
+    for sprint_id, member_id, member_name, committed_points, delivered_points, hours in committed.union(
+        delivered, all=True
+    ):
+        members = by_sprint.get(sprint_id)
+        if members is None:
+            continue
+        entry = members.setdefault(
+            member_id,
+            {"member_id": member_id, "name": member_name, "committed": 0, "delivered": 0, "hours": Decimal("0")},
+        )
+        entry["committed"] += committed_points or 0
+        entry["delivered"] += delivered_points or 0
+        entry["hours"] += Decimal(str(hours or 0))
+
+    today = date.today()
+    cumulative_committed = cumulative_delivered = 0
+    total_hours = Decimal("0")
+    closed_velocities = []
+    rows = []
+    for sprint in sprints:
+        members = sorted(by_sprint[sprint["id"]].values(), key=lambda entry: (entry["name"] or "", entry["member_id"] or 0))
+        committed_points = sum(entry["committed"] for entry in members)
+        delivered_points = sum(entry["delivered"] for entry in members)
+        hours = sum((entry["hours"] for entry in members), Decimal("0"))
+        cumulative_committed += committed_points
+        cumulative_delivered += delivered_points
+        total_hours += hours
+        if sprint["end_date"] < today:
+            closed_velocities.append(delivered_points)
+
+        rows.append(
+            {
+                "sprint_id": sprint["id"],
+                "name": sprint["name"],
+                "start_date": sprint["start_date"].isoformat(),
+                "end_date": sprint["end_date"].isoformat(),
+                "is_active": sprint["is_active"],
+                "committed_points": committed_points,
+                "delivered_points": delivered_points,
+                "hours_worked": str(hours.quantize(Decimal("0.01"))),
+                "delivery_rate": round(delivered_points / committed_points, 2) if committed_points else None,
+                "cumulative_committed_points": cumulative_committed,
+                "cumulative_delivered_points": cumulative_delivered,
+                "members": [
+                    {
+                        "member_id": entry["member_id"],
+                        "name": entry["name"],
+                        "committed_points": entry["committed"],
+                        "delivered_points": entry["delivered"],
+                        "hours_worked": str(entry["hours"].quantize(Decimal("0.01"))),
+                    }
+                    for entry in members
+                ],
+            }
+        )
+
+    return {
+        "group_id": int(group_id),
+        "sprints": rows,
+        "totals": {
+            "committed_points": cumulative_committed,
+            "delivered_points": cumulative_delivered,
+            "hours_worked": str(total_hours.quantize(Decimal("0.01"))),
+        },
+        "average_velocity": (
+            round(sum(closed_velocities) / len(closed_velocities), 2) if closed_velocities else None
+        ),
+    }
+
+
+def invalidate_sprint_flow(sprint_id):
+    if sprint_id:
+        cache.delete(FLOW_CACHE_KEY.format(sprint_id=sprint_id))
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class _FlowState:
+    """Each scoped task's (status, estimated_hours) plus running per-status counts."""
+
+    def __init__(self, tasks=None):
+        self.tasks = dict(tasks or {})
+        self.counts = dict.fromkeys(FLOW_STATUSES, 0)
+        self.remaining_hours = Decimal("0")
+        for status, hours in self.tasks.values():
+            self._add(status, hours, 1)
+
+    def _add(self, status, hours, sign):
+        self.counts[status] += sign
+        if status != "DONE":
+            self.remaining_hours += sign * hours
+
+    def apply(self, task_id, status, hours):
+        previous = self.tasks.get(task_id)
+        if previous:
+            self._add(*previous, -1)
+        self.tasks[task_id] = (status, hours)
+        self._add(status, hours, 1)
+
+    def row(self, day):
+        total = sum(self.counts.values())
+        return {
+            "date": day.isoformat(),
+            "counts": dict(self.counts),
+            "total_tasks": total,
+            "remaining_tasks": total - self.counts["DONE"],
+            "remaining_hours": str(self.remaining_hours.quantize(Decimal("0.01"))),
+        }
+
+
+def sprint_flow(sprint):
+    """
+    Daily cumulative-flow counts (tasks per status at the end of each day) and
+    burndown (tasks and estimated hours not DONE) for a sprint, replayed from
+    TaskStatusEvent in a single ordered scan.
+
+    Events are only ever appended with the current time, so a day that has
+    ended never changes: its rows are cached together with every task's
+    status at the end of the last closed day, and the next call scans only
+    events after that checkpoint. Deleting a task or moving it between
+    sprints drops the cache.
+    """
+    today = timezone.localdate()
+    last_day = min(sprint.end_date, today)
+    key = FLOW_CACHE_KEY.format(sprint_id=sprint.id)
+    cached = cache.get(key)
+    if cached and (cached["start_date"], cached["end_date"]) == (sprint.start_date, sprint.end_date):
+        days, state = list(cached["days"]), _FlowState(cached["tasks"])
+        day = cached["through"] + timedelta(days=1)
+    else:
+        days, state, day = [], _FlowState(), sprint.start_date
+
+    if day <= last_day:
+        events = TaskStatusEvent.objects.filter(task__sprint_id=sprint.id)
+        if day > sprint.start_date:
+            events = events.filter(occurred_at__gte=_start_of_day(day))
+        events = (
+            events.order_by("occurred_at", "id")
+            .values_list("task_id", "to_status", "occurred_at", "task__estimated_hours")
+            .iterator(chunk_size=2000)
+        )
+        pending = next(events, None)
+        while day <= last_day:
+            # Everything before the first day (tasks planned ahead) lands in the first row.
+            end_of_day = _start_of_day(day + timedelta(days=1))
+            while pending is not None and pending[2] < end_of_day:
+                task_id, status, _, hours = pending
+                state.apply(task_id, status, hours)
+                pending = next(events, None)
+            days.append(state.row(day))
+            if day < today and (day == last_day or day + timedelta(days=1) == today):
+                cache.set(
+                    key,
+                    {
+                        "start_date": sprint.start_date,
+                        "end_date": sprint.end_date,
+                        "through": day,
+                        "days": list(days),
+                        "tasks": dict(state.tasks),
+                    },
+                    timeout=None,
+                )
+            day += timedelta(days=1)
+
+    # Ideal burndown: the first day's remaining hours falling linearly to zero on end_date.
+    sprint_days = (sprint.end_date - sprint.start_date).days
+    start_hours = Decimal(days[0]["remaining_hours"]) if days else Decimal("0")
+    series = []
+    for i, row in enumerate(days):
+        ideal = start_hours * (1 - Decimal(i) / sprint_days) if sprint_days else Decimal("0")
+        series.append({**row, "ideal_remaining_hours": str(ideal.quantize(Decimal("0.01")))})
+
+    return {
+        "sprint_id": sprint.id,
+        "name": sprint.name,
+        "start_date": sprint.start_date.isoformat(),
+        "end_date": sprint.end_date.isoformat(),
+        "statuses": FLOW_STATUSES,
+        "days": series,
+    }
+
+
+def task_status_history(task):
+    """A task's status events and the total time spent in each status, up to now."""
+    events = list(
+        TaskStatusEvent.objects.filter(task=task)
+        .order_by("occurred_at", "id")
+        .values("from_status", "to_status", "occurred_at")
+    )
+    durations = dict.fromkeys(FLOW_STATUSES, 0.0)
+    now = timezone.now()
+    for event, following in zip(events, events[1:] + [None]):
+        until = following["occurred_at"] if following else now
+        durations[event["to_status"]] += (until - event["occurred_at"]).total_seconds()
+    return {
+        "task_id": task.id,
+        "status": task.status,
+        "events": events,
+        "seconds_in_status": {status: round(seconds) for status, seconds in durations.items()},
+    }
@@ -1,15 +1,21 @@
-# from django.apps import AppConfig
-
-# class MyappConfig(AppConfig):
-#     name = "myapp"
-
-#     def ready(self):
-#         # Keep the scheduled cleanup job idempotent across app restarts.
-#         Schedule.objects.update_or_create(
-#             name="get_discrepencies",
-#             defaults={
-#                 "func": "myapp.discrpencies.flag_overdue_tasks_as_disputes",
-#                 "schedule_type": Schedule.CRON,
-#                 "cron": "0 23 * * *",
-#             },
-#         )
+import atexit
+
+from django.apps import AppConfig
+from django.core.signals import request_finished
+from django.db.backends.signals import connection_created
+
+
+class MyappConfig(AppConfig):
+    name = "myapp"
+
+    def ready(self):
+        from .database import configure_sqlite_connection
+
+        connection_created.connect(configure_sqlite_connection, dispatch_uid="myapp.configure_sqlite_connection")
+
+        # Buffered audit entries are written once the response has been sent, and on shutdown.
+        from . import audit
+
+        request_finished.connect(audit.flush, dispatch_uid="myapp.flush_audit_log")
+        atexit.register(audit.flush)
+
@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AuditEntry
+
+logger = logging.getLogger(__name__)
+
+# The buffer is written out when it holds FLUSH_SIZE entries, when an entry
+# arrives FLUSH_SECONDS after the last write, at the end of every request
+# (after the response has gone out) and at process exit.
+FLUSH_SIZE = 200
+FLUSH_SECONDS = 5.0
+
+
+def _plain(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def snapshot(instance, fields):
+    """JSON-ready values of `fields` on a model instance; many-to-many fields become sorted id lists."""
+    values = {}
+    for name in fields:
+        field = instance._meta.get_field(name)
+        if field.many_to_many:
+            values[name] = sorted(obj.pk for obj in getattr(instance, name).all())
+        elif field.is_relation:
+            values[name] = getattr(instance, field.attname)
+        else:
+            values[name] = _plain(getattr(instance, name))
+    return values
+
+
+def diff(before, after):
+    """{field: [old, new]} for the fields whose value changed."""
+    return {name: [before.get(name), value] for name, value in after.items() if before.get(name) != value}
+
+
+class AuditBuffer:
+    """Per-process queue of unsaved AuditEntry rows, written with one bulk_create."""
+
+    def __init__(self, size=FLUSH_SIZE, seconds=FLUSH_SECONDS):
+        self.size = size
+        self.seconds = seconds
+        self._entries = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+            due = len(self._entries) >= self.size or time.monotonic() - self._last_flush >= self.seconds
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            entries, self._entries = self._entries, []
+            self._last_flush = time.monotonic()
+        if not entries:
+            return 0
+        try:
+            AuditEntry.objects.bulk_create(entries, batch_size=self.size)
+        except Exception:
+            # Auditing must never fail the request it describes.
+            logger.exception("Dropped %s audit entries.", len(entries))
+            return 0
+        return len(entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+buffer = AuditBuffer()
+
+
+def record(action, target, changes, group_id=None, actor_id=None):
+    """
+    Queue an audit entry for `target` (a model instance). Entries are only
+    queued once the surrounding transaction commits, so rolled-back changes
+    leave no trail; `changes` should already be a diff or snapshot.
+    """
+    entry = AuditEntry(
+        group_id=group_id,
+        actor_id=actor_id,
+        action=action,
+        target_type=target._meta.model_name,
+        target_id=target.pk,
+        changes=changes,
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: buffer.add(entry))
+
+
+def flush(**kwargs):
+    """Write out everything buffered; connected to request_finished and run at exit."""
+    return buffer.flush()
@@ -0,0 +1,21 @@
+from django.conf import settings
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    connection_created hook: applies settings.SQLITE_PRAGMAS to every new
+    SQLite connection (WAL, synchronous, mmap_size, busy_timeout, ...).
+    Connections to the read replica are also made query-only. Other database
+    vendors are left alone.
+    """
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "SQLITE_PRAGMAS", {})
+    is_replica = connection.alias == getattr(settings, "READ_REPLICA", {}).get("ALIAS")
+    if not pragmas and not is_replica:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        if is_replica:
+            cursor.execute("PRAGMA query_only = ON")
@@ -1,10 +1,36 @@
 # myapp/tasks.py
+import logging
+from datetime import date
 
-def flag_overdue_tasks_as_disputes():
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Coalesce, Mod
+
+from .locks import singleton_job
+from .metrics import timed_job
+from .models import Dispute, Member, Task
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ("OPEN", "UNDER_REVIEW")
+
+
+def _shard_key(shard=0, shards=1):
+    return f"{shard}/{shards}" if shards > 1 else None
+
+
+@singleton_job("flag_overdue_tasks_as_disputes", key=_shard_key)
+@timed_job("flag_overdue_tasks_as_disputes")
+def flag_overdue_tasks_as_disputes(shard=0, shards=1):
     """
     Runs at end of day. Finds all incomplete tasks whose sprint has ended,
     checks whether any assigned member has submitted a contribution covering
     that task, and opens a Dispute against members who haven't.
+
+    With shards > 1 only groups whose id % shards == shard are handled, so
+    the work can be split across workers; each shard holds its own lease.
+    Overlapping runs can't open duplicates: the dispute_open_auto_unique
+    constraint allows one unresolved auto-generated dispute per task and
+    member, and a run that loses that race just moves on.
     """
     today = date.today()
 
@@ -20,21 +46,30 @@ def flag_overdue_tasks_as_disputes():
         "discrepancies",
         "contribution_entries",
     )
+    if shards > 1:
+        # Tasks in group-less sprints go to shard 0.
+        overdue_tasks = overdue_tasks.annotate(
+            shard=Mod(Coalesce("sprint__group_id", 0), shards)
+        ).filter(shard=shard)
+
+    overdue_tasks = list(overdue_tasks)
+
+    # (task, member) pairs that already have an unresolved dispute, auto-generated or not.
+    already_disputed = set(
+        Dispute.tasks_affected.through.objects.filter(
+            task_id__in=[task.pk for task in overdue_tasks],
+            dispute__status__in=OPEN_STATUSES,
+        ).values_list("task_id", "dispute__accused_member_id")
+    )
 
     disputes_opened = 0
 
     for task in overdue_tasks:
         # Members who have a contribution entry covering this task
-        members_with_contribution = set(
-            task.contribution_entries.values_list("member_id", flat=True)
-        )
+        members_with_contribution = {c.member_id for c in task.contribution_entries.all()}
 
         # Members who have a non-negative user_contribution discrepancy
-        members_with_discrepancy = set(
-            task.discrepancies.filter(
-                user_contribution__gte=0
-            ).values_list("member_id", flat=True)
-        )
+        members_with_discrepancy = {d.member_id for d in task.discrepancies.all() if d.user_contribution >= 0}
 
         members_accounted_for = members_with_contribution | members_with_discrepancy
 
@@ -50,28 +85,27 @@ def flag_overdue_tasks_as_disputes():
             if member.pk in members_accounted_for:
                 continue  # already has a contribution, skip
 
-            # Avoid duplicate open disputes for the same task/member pair
-            already_disputed = Dispute.objects.filter(
-                accused_member=member,
-                tasks_affected=task,
-                status__in=("OPEN", "UNDER_REVIEW"),
-            ).exists()
-
-            if already_disputed:
+            if (task.pk, member.pk) in already_disputed:
                 continue
 
-            dispute = Dispute.objects.create(
-                raised_by=raiser,
-                accused_member=member,
-                sprint=task.sprint,
-                description=(
-                    f"Auto-generated: Task \"{task.title}\" was not completed by the "
-                    f"end of sprint \"{task.sprint}\" ({task.sprint.end_date}), and "
-                    f"{member.name} has no recorded contribution for it."
-                ),
-                status="OPEN",
-            )
-            dispute.tasks_affected.add(task)
+            try:
+                with transaction.atomic():
+                    dispute = Dispute.objects.create(
+                        raised_by=raiser,
+                        accused_member=member,
+                        sprint=task.sprint,
+                        auto_task=task,
+                        description=(
+                            f"Auto-generated: Task \"{task.title}\" was not completed by the "
+                            f"end of sprint \"{task.sprint}\" ({task.sprint.end_date}), and "
+                            f"{member.name} has no recorded contribution for it."
+                        ),
+                        status="OPEN",
+                    )
+                    dispute.tasks_affected.add(task)
+            except IntegrityError:
+                # A concurrent run opened this one first.
+                continue
 
             disputes_opened += 1
             logger.info(
@@ -80,6 +114,7 @@ def flag_overdue_tasks_as_disputes():
             )
 
     logger.info("flag_overdue_tasks_as_disputes complete — %d dispute(s) opened.", disputes_opened)
+    return disputes_opened
 
 
 def _get_fallback_raiser(task: Task) -> Member | None:
@@ -0,0 +1,239 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from . import llm
+from .locks import singleton_job
+from .metrics import timed_job
+from .models import ContributionReaction, Dispute, Task, TaskComment
+
+logger = logging.getLogger(__name__)
+
+MAX_COMMENTS_PER_TASK = 10
+# A run that runs out of time continues in a one-off task this much later,
+# after its lease has been released.
+CONTINUE_AFTER_SECONDS = 5
+
+
+class MinuteBudget:
+    """Blocking sliding-window limiter: at most `calls` acquisitions in any 60 seconds."""
+
+    def __init__(self, calls, window=60.0):
+        self.calls = calls
+        self.window = window
+        self._times = deque()
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        while self._times and now - self._times[0] >= self.window:
+            self._times.popleft()
+
+    def available(self):
+        """Acquisitions that would succeed right now without waiting."""
+        with self._lock:
+            self._expire(time.monotonic())
+            return self.calls - len(self._times)
+
+    def wait_seconds(self):
+        """How long until the next acquisition can succeed (0 if one is available)."""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if len(self._times) < self.calls:
+                return 0.0
+            return self.window - (now - self._times[0])
+
+    def acquire(self, deadline=None):
+        """
+        Block until a call is allowed and take it. Returns False, without
+        taking one, if that would mean waiting past `deadline` (a
+        time.monotonic() value).
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._expire(now)
+                if len(self._times) < self.calls:
+                    if deadline is not None and now >= deadline:
+                        return False
+                    self._times.append(now)
+                    return True
+                wait = self.window - (now - self._times[0])
+            if deadline is not None and now + wait >= deadline:
+                return False
+            time.sleep(wait)
+
+
+def pending_disputes():
+    return Dispute.objects.filter(status="OPEN", ai_resolved=False)
+
+
+def load_evidence(dispute_ids):
+    """
+    Disputes with everything the prompt needs, in a fixed number of queries
+    regardless of batch size: disputes with their people, sprint and
+    contribution; affected tasks; their comments; contribution reactions.
+    """
+    return list(
+        Dispute.objects.filter(id__in=dispute_ids)
+        .select_related("raised_by", "accused_member", "sprint", "contribution")
+        .prefetch_related(
+            Prefetch(
+                "tasks_affected",
+                queryset=Task.objects.prefetch_related(
+                    Prefetch("comments", queryset=TaskComment.objects.select_related("author").order_by("created_at"))
+                ),
+            ),
+            Prefetch("contribution__reactions", queryset=ContributionReaction.objects.select_related("member")),
+        )
+        .order_by("id")
+    )
+
+
+def build_prompt(dispute):
+    lines = [
+        "You are helping an instructor review a peer dispute in a student software team.",
+        "Weigh the evidence and respond ONLY with a JSON object in this exact format:",
+        '{"recommendation": "UPHOLD" | "DISMISS" | "NEEDS_REVIEW", "summary": "two or three sentences"}',
+        "",
+        f"Raised by: {dispute.raised_by.name}",
+        f"Accused member: {dispute.accused_member.name}",
+        f"Sprint: {dispute.sprint.name if dispute.sprint else 'n/a'}",
+        f"Complaint: {dispute.description or '(none)'}",
+    ]
+
+    contribution = dispute.contribution
+    if contribution:
+        lines += [
+            "",
+            "--- Accused member's sprint contribution ---",
+            f"Story points: {contribution.story_points}, hours: {contribution.hours_worked}",
+            contribution.description or "(no description)",
+        ]
+        reactions = [f"{r.member.name}: {r.reaction}" for r in contribution.reactions.all()]
+        if reactions:
+            lines.append("Peer reactions: " + ", ".join(reactions))
+
+    for task in dispute.tasks_affected.all():
+        lines += [
+            "",
+            f"--- Task: {task.title} ({task.status}) ---",
+            f"Estimated {task.estimated_hours}h, actual {task.actual_hours}h",
+            task.description or "(no description)",
+        ]
+        for comment in list(task.comments.all())[-MAX_COMMENTS_PER_TASK:]:
+            author = comment.author.name if comment.author else "unknown"
+            lines.append(f"Comment from {author}: {comment.text}")
+    return "\n".join(lines)
+
+
+def _resolve_one(dispute_id, prompt, budget, deadline):
+    """(dispute_id, resolution text or None, whether the LLM was called)."""
+    if not budget.acquire(deadline):
+        return dispute_id, None, False
+    try:
+        result = llm.parse_json(llm.generate(prompt))
+        recommendation = str(result.get("recommendation", "NEEDS_REVIEW")).upper()
+        summary = str(result.get("summary", "")).strip()
+        return dispute_id, f"{recommendation}: {summary}" if summary else recommendation, True
+    except Exception as exc:
+        logger.warning("AI resolution failed for dispute %s: %s", dispute_id, exc)
+        return dispute_id, None, True
+
+
+def _write_results(results):
+    """Store a batch of resolutions; rows resolved meanwhile by another run are left alone."""
+    resolved = {dispute_id: text for dispute_id, text, _ in results if text}
+    if not resolved:
+        return 0
+    with transaction.atomic():
+        disputes = list(Dispute.objects.filter(id__in=resolved, ai_resolved=False).only("id"))
+        now = timezone.now()
+        for dispute in disputes:
+            dispute.ai_resolution = resolved[dispute.id]
+            dispute.ai_resolved = True
+            dispute.updated_at = now
+        Dispute.objects.bulk_update(disputes, ["ai_resolution", "ai_resolved", "updated_at"])
+    return len(disputes)
+
+
+@singleton_job("resolve_open_disputes")
+@timed_job("resolve_open_disputes")
+def resolve_open_disputes(limit=None, concurrency=None, calls_per_minute=None, max_seconds=None):
+    """
+    django_q task: fill ai_resolution for OPEN disputes that have none, in
+    batches. LLM calls run on a bounded thread pool under a per-minute
+    budget. Each batch is no larger than the calls the budget allows right
+    now, so calls never wait on it mid-batch; the batch is written before
+    any wait for more budget. A call only starts while a full LLM timeout
+    is left before max_seconds, so the run finishes, and its last batch is
+    written, before django_q's timeout kills it. Overlapping runs are
+    prevented by a lease; re-running never touches resolved rows.
+    """
+    try:
+        llm.get_client()
+    except llm.LLMError as exc:
+        logger.warning("Skipping AI dispute resolution: %s", exc)
+        return {"resolved": 0, "failed": 0, "remaining": pending_disputes().count()}
+
+    config = settings.DISPUTE_RESOLUTION
+    concurrency = concurrency or config["CONCURRENCY"]
+    budget = MinuteBudget(calls_per_minute or config["CALLS_PER_MINUTE"])
+    max_seconds = max_seconds or config["MAX_SECONDS"]
+    batch_size = config["BATCH_SIZE"]
+    # Latest moment a call may start and still return before max_seconds.
+    deadline = time.monotonic() + max(max_seconds - settings.LLM["TIMEOUT_SECONDS"], 0)
+
+    summary = {"resolved": 0, "failed": 0, "remaining": 0}
+    seen = set()
+    timed_out = False
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="dispute-ai") as pool:
+        while limit is None or len(seen) < limit:
+            wait = budget.wait_seconds()
+            if time.monotonic() + wait >= deadline:
+                timed_out = True
+                break
+            time.sleep(wait)
+            take = min(batch_size, budget.available())
+            if limit is not None:
+                take = min(take, limit - len(seen))
+            # Failed disputes stay pending; `seen` keeps this run from retrying them in a loop.
+            batch_ids = list(pending_disputes().exclude(id__in=seen).order_by("id").values_list("id", flat=True)[:take])
+            if not batch_ids:
+                break
+
+            prompts = [(dispute.id, build_prompt(dispute)) for dispute in load_evidence(batch_ids)]
+            results = list(pool.map(lambda item: _resolve_one(*item, budget, deadline), prompts))
+            # Disputes whose call never started (out of time) are left for the next run.
+            seen.update(dispute_id for dispute_id, _, attempted in results if attempted)
+            summary["resolved"] += _write_results(results)
+            summary["failed"] += sum(1 for _, text, attempted in results if attempted and not text)
+            if not all(attempted for _, _, attempted in results):
+                timed_out = True
+                break
+
+    summary["remaining"] = pending_disputes().count()
+    if timed_out and summary["resolved"] and limit is None:
+        # Out of time for this run (django_q kills tasks at Q_CLUSTER['timeout']). Continue in a
+        # one-off task a little later, so it doesn't find this run's lease still held.
+        from django_q.models import Schedule
+        from django_q.tasks import schedule
+
+        schedule(
+            "myapp.dispute_resolution.resolve_open_disputes",
+            schedule_type=Schedule.ONCE,
+            next_run=timezone.now() + timedelta(seconds=CONTINUE_AFTER_SECONDS),
+        )
+    logger.info(
+        "AI dispute resolution: %(resolved)d resolved, %(failed)d failed, %(remaining)d still pending.", summary
+    )
+    return summary
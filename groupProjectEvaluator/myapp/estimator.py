@@ -0,0 +1,233 @@
+import logging
+
+import numpy as np
+from django.core.cache import cache
+from django.db import models
+from django.db.models import Count
+
+from .locks import singleton_job
+from .metrics import timed_job
+from .models import Group, Sprint, Task, TaskEstimator
+
+logger = logging.getLogger(__name__)
+
+ESTIMATION_KEYWORDS = [
+    "api",
+    "auth",
+    "database",
+    "migration",
+    "dashboard",
+    "real-time",
+    "analytics",
+    "integration",
+    "testing",
+    "deploy",
+    "bug",
+    "ai",
+]
+FEATURES = (
+    "bias",
+    "keyword_hits",
+    "requirement_lines",
+    "description_words",
+    "tag_count",
+    "assignee_count",
+    "estimated_hours",
+)
+MIN_TRAINING_TASKS = 10
+# Ridge penalty on every coefficient except the bias; keeps small groups from
+# fitting noise in the text features.
+RIDGE_PENALTY = 1.0
+COEFFICIENTS_CACHE_KEY = "estimator:{group_id}"
+# Web processes re-read TaskEstimator this often, so a refit in the django_q
+# cluster reaches them without a shared cache.
+MODEL_CACHE_SECONDS = 300
+REFIT_PENDING_KEY = "estimator:refit_pending"
+REFIT_PENDING_SECONDS = 600
+
+
+def count_keywords(text, words=ESTIMATION_KEYWORDS):
+    content = (text or "").lower()
+    return sum(content.count(word) for word in words)
+
+
+def _feature_row(title, description, requirements, estimated_hours, tag_count, assignee_count):
+    return (
+        1.0,
+        count_keywords(f"{title} {description} {requirements}"),
+        max(len((requirements or "").splitlines()) - 1, 0),
+        len((description or "").split()),
+        tag_count or 0,
+        assignee_count or 0,
+        float(estimated_hours or 0),
+    )
+
+
+def _training_data(group_id):
+    tasks = Task.objects.filter(actual_hours__gt=0)
+    if group_id is not None:
+        tasks = tasks.filter(sprint__group_id=group_id)
+    rows = tasks.annotate(
+        tag_count=Count("tags", distinct=True),
+        assignee_count=Count("member", distinct=True),
+    ).values_list(
+        "title", "description", "requirements", "estimated_hours", "tag_count", "assignee_count", "actual_hours"
+    )
+    features, targets = [], []
+    for *inputs, actual_hours in rows.iterator(chunk_size=2000):
+        features.append(_feature_row(*inputs))
+        targets.append(float(actual_hours))
+    return np.array(features, dtype=float).reshape(-1, len(FEATURES)), np.array(targets, dtype=float)
+
+
+def fit(group_id=None):
+    """
+    Least-squares fit of actual_hours on FEATURES for one group (None = all
+    groups). Returns (coefficients, trained_on, rmse), or None when there is
+    too little history.
+    """
+    X, y = _training_data(group_id)
+    if len(y) < MIN_TRAINING_TASKS:
+        return None
+
+    # Ridge regression as an augmented least-squares problem: append
+    # sqrt(penalty) * I rows (bias excluded) with zero targets.
+    penalty = np.sqrt(RIDGE_PENALTY) * np.eye(len(FEATURES))[1:]
+    X_aug = np.vstack([X, penalty])
+    y_aug = np.concatenate([y, np.zeros(len(FEATURES) - 1)])
+    coefficients, *_ = np.linalg.lstsq(X_aug, y_aug, rcond=None)
+
+    residuals = X @ coefficients - y
+    return coefficients.tolist(), int(len(y)), float(np.sqrt(np.mean(residuals ** 2)))
+
+
+def _cache_key(group_id):
+    return COEFFICIENTS_CACHE_KEY.format(group_id="all" if group_id is None else group_id)
+
+
+@singleton_job("refit_estimators")
+@timed_job("refit_estimators")
+def refit_estimators(group_ids=None):
+    """
+    django_q task: refit the estimator for each group that has tasks with
+    logged hours, plus the all-groups fallback, and store the coefficients.
+    The nightly run and refits queued by get_model() don't overlap.
+    """
+    if group_ids is None:
+        group_ids = list(
+            Group.objects.filter(sprints__tasks__actual_hours__gt=0).values_list("id", flat=True).distinct()
+        )
+    fitted = 0
+    for group_id in [None, *group_ids]:
+        result = fit(group_id)
+        if result is None:
+            TaskEstimator.objects.filter(group_id=group_id).delete()
+        else:
+            coefficients, trained_on, rmse = result
+            TaskEstimator.objects.update_or_create(
+                group_id=group_id,
+                defaults={
+                    "features": list(FEATURES),
+                    "coefficients": coefficients,
+                    "trained_on": trained_on,
+                    "rmse": round(rmse, 4),
+                },
+            )
+            fitted += 1
+        cache.delete(_cache_key(group_id))
+    cache.delete(REFIT_PENDING_KEY)
+    logger.info("Refit %s task estimators.", fitted)
+    return fitted
+
+
+def get_model(group_id):
+    """
+    Coefficients for group_id as {"coefficients", "trained_on", "rmse"},
+    falling back to the all-groups model. Read from the cache, then from
+    TaskEstimator; when nothing has been fitted yet one background refit is
+    queued and None is returned meanwhile.
+    """
+    keys = [_cache_key(group_id), _cache_key(None)]
+    cached = cache.get_many(keys)
+    if len(cached) < len(keys):
+        stored = {
+            row["group_id"]: row
+            for row in TaskEstimator.objects.filter(
+                models.Q(group_id=group_id) | models.Q(group__isnull=True)
+            ).values("group_id", "features", "coefficients", "trained_on", "rmse")
+        }
+        for key, key_group in zip(keys, (group_id, None)):
+            row = stored.get(key_group)
+            # A row fitted on a different feature list is ignored until the next refit.
+            cached[key] = row if row and row["features"] == list(FEATURES) else False
+        cache.set_many(cached, timeout=MODEL_CACHE_SECONDS)
+
+    model = cached[keys[0]] or cached[keys[1]]
+    if not model:
+        if cache.add(REFIT_PENDING_KEY, True, timeout=REFIT_PENDING_SECONDS):
+            from django_q.tasks import async_task
+
+            async_task("myapp.estimator.refit_estimators")
+        return None
+    return model
+
+
+def _task_counts(tasks):
+    """(tag_count, assignee_count) per task, from preset attributes or one query for saved tasks."""
+    missing = [
+        task.id for task in tasks
+        if task.id and (getattr(task, "tag_count", None) is None or getattr(task, "assignee_count", None) is None)
+    ]
+    counts = {}
+    if missing:
+        counts = {
+            row[0]: row[1:]
+            for row in Task.objects.filter(id__in=missing)
+            .annotate(tag_count=Count("tags", distinct=True), assignee_count=Count("member", distinct=True))
+            .values_list("id", "tag_count", "assignee_count")
+        }
+    result = []
+    for task in tasks:
+        stored_tags, stored_assignees = counts.get(task.id, (0, 0))
+        tag_count = getattr(task, "tag_count", None)
+        assignee_count = getattr(task, "assignee_count", None)
+        result.append((
+            stored_tags if tag_count is None else tag_count,
+            stored_assignees if assignee_count is None else assignee_count,
+        ))
+    return result
+
+
+def predict(tasks):
+    """
+    Predicted actual hours for each task, as a list aligned with `tasks`
+    (None where no model is available yet). Tasks are scored with one matrix
+    multiply per group, so a whole sprint costs a single dot product.
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return []
+    counts = _task_counts(tasks)
+    X = np.array(
+        [
+            _feature_row(task.title, task.description, task.requirements, task.estimated_hours, *task_counts)
+            for task, task_counts in zip(tasks, counts)
+        ],
+        dtype=float,
+    )
+
+    sprint_groups = dict(
+        Sprint.objects.filter(id__in={task.sprint_id for task in tasks if task.sprint_id})
+        .values_list("id", "group_id")
+    )
+    group_ids = np.array([sprint_groups.get(task.sprint_id) or -1 for task in tasks])
+    predictions = [None] * len(tasks)
+    for group_id in np.unique(group_ids):
+        model = get_model(None if group_id == -1 else int(group_id))
+        if model is None:
+            continue
+        rows = np.flatnonzero(group_ids == group_id)
+        scores = X[rows] @ np.array(model["coefficients"])
+        for row, score in zip(rows, scores):
+            predictions[row] = max(float(score), 0.0)
+    return predictions
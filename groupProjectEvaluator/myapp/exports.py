@@ -0,0 +1,219 @@
+import csv
+import datetime
+import json
+import zlib
+from collections import namedtuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import Dispute, SprintContribution, Task
+from .replica import read_alias
+
+FORMATS = ("csv", "ndjson")
+CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+# Rows fetched per database round trip, and bytes buffered before a chunk is
+# handed to the response (or compressor); together they bound memory per export.
+ROW_CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+# columns: (output name, values() lookup). date_field drives since/until.
+Dataset = namedtuple("Dataset", ["queryset", "columns", "date_field"])
+
+DATASETS = {
+    "contributions": Dataset(
+        lambda: SprintContribution.objects.all(),
+        (
+            ("id", "id"),
+            ("group_id", "sprint__group_id"),
+            ("group", "sprint__group__name"),
+            ("sprint_id", "sprint_id"),
+            ("sprint", "sprint__name"),
+            ("member_id", "member_id"),
+            ("member", "member__name"),
+            ("story_points", "story_points"),
+            ("hours_worked", "hours_worked"),
+            ("looks_good", "looks_good_count"),
+            ("needs_clarification", "needs_clarification_count"),
+            ("needs_more_detail", "needs_more_detail_count"),
+            ("great_progress", "great_progress_count"),
+            ("has_overlapping_contributions", "has_overlapping_contributions"),
+            ("submitted_at", "submitted_at"),
+            ("description", "description"),
+        ),
+        "submitted_at",
+    ),
+    "tasks": Dataset(
+        lambda: Task.objects.all(),
+        (
+            ("id", "id"),
+            ("group_id", "sprint__group_id"),
+            ("sprint_id", "sprint_id"),
+            ("sprint", "sprint__name"),
+            ("title", "title"),
+            ("status", "status"),
+            ("estimated_hours", "estimated_hours"),
+            ("ai_estimated_hours", "ai_estimated_hours"),
+            ("actual_hours", "actual_hours"),
+            ("discrepancy_rating", "discrepancy_rating"),
+            ("is_estimation_outlier", "is_estimation_outlier"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+        ),
+        "created_at",
+    ),
+    # Tasks with logged hours only, i.e. the ones a discrepancy rating means something for.
+    "discrepancies": Dataset(
+        lambda: Task.objects.filter(actual_hours__gt=0),
+        (
+            ("id", "id"),
+            ("group_id", "sprint__group_id"),
+            ("sprint_id", "sprint_id"),
+            ("title", "title"),
+            ("estimated_hours", "estimated_hours"),
+            ("ai_estimated_hours", "ai_estimated_hours"),
+            ("actual_hours", "actual_hours"),
+            ("discrepancy_rating", "discrepancy_rating"),
+            ("is_estimation_outlier", "is_estimation_outlier"),
+            ("updated_at", "updated_at"),
+        ),
+        "updated_at",
+    ),
+    "disputes": Dataset(
+        lambda: Dispute.objects.all(),
+        (
+            ("id", "id"),
+            ("group_id", "sprint__group_id"),
+            ("sprint_id", "sprint_id"),
+            ("raised_by_id", "raised_by_id"),
+            ("raised_by", "raised_by__name"),
+            ("accused_member_id", "accused_member_id"),
+            ("accused_member", "accused_member__name"),
+            ("contribution_id", "contribution_id"),
+            ("status", "status"),
+            ("ai_resolved", "ai_resolved"),
+            ("ai_resolution", "ai_resolution"),
+            ("description", "description"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+        ),
+        "created_at",
+    ),
+}
+
+
+def _parse_id(params, name):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    if not str(value).isdigit():
+        raise ValueError(f"{name} must be a positive integer.")
+    return int(value)
+
+
+def _parse_date(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a date (YYYY-MM-DD).") from None
+
+
+def parse_filters(params):
+    """group_id / sprint_id / since / until from a query dict. Raises ValueError."""
+    filters = {
+        "group_id": _parse_id(params, "group_id"),
+        "sprint_id": _parse_id(params, "sprint_id"),
+        "since": _parse_date(params, "since"),
+        "until": _parse_date(params, "until"),
+    }
+    if filters["since"] and filters["until"] and filters["since"] > filters["until"]:
+        raise ValueError("since must not be after until.")
+    return filters
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def export_rows(dataset, group_id=None, sprint_id=None, since=None, until=None, using="default"):
+    """values_list queryset for `dataset` on `using`, filtered; since/until are inclusive dates."""
+    spec = DATASETS[dataset]
+    qs = spec.queryset().using(using)
+    if group_id is not None:
+        qs = qs.filter(sprint__group_id=group_id)
+    if sprint_id is not None:
+        qs = qs.filter(sprint_id=sprint_id)
+    # Whole-day bounds as datetimes keep the comparison on the raw column.
+    if since is not None:
+        qs = qs.filter(**{f"{spec.date_field}__gte": _start_of_day(since)})
+    if until is not None:
+        qs = qs.filter(**{f"{spec.date_field}__lt": _start_of_day(until + datetime.timedelta(days=1))})
+    lookups = [lookup for _, lookup in spec.columns]
+    return qs.order_by("id").values_list(*lookups)
+
+
+class _Line:
+    """Write target for csv.writer that hands back the formatted line."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(_Line())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(["" if value is None else value for value in row])
+
+
+def _ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def stream_export(dataset, fmt="csv", compress=False, using=None, **filters):
+    """
+    Bytes chunks of the export, produced lazily: rows come from the database
+    ROW_CHUNK_SIZE at a time and leave in ~FLUSH_BYTES pieces (gzipped when
+    `compress`), so memory use doesn't depend on how many rows match.
+
+    The database is chosen now, not when the chunks are pulled: a streamed
+    response is iterated after the view returns, possibly in another context,
+    so the rows are read from `using` (default: the replica if fresh).
+    """
+    rows = export_rows(dataset, using=using or read_alias(), **filters)
+    return _stream_rows(dataset, fmt, compress, rows)
+
+
+def _stream_rows(dataset, fmt, compress, rows):
+    columns = [name for name, _ in DATASETS[dataset].columns]
+    lines = _csv_lines if fmt == "csv" else _ndjson_lines
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31 = gzip container
+
+    buffer, size = [], 0
+    for line in lines(columns, rows.iterator(chunk_size=ROW_CHUNK_SIZE)):
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            chunk = "".join(buffer).encode()
+            buffer, size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+    tail = "".join(buffer).encode()
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
+
+
+def filename(dataset, fmt, compress, filters):
+    parts = [dataset]
+    for key in ("group_id", "sprint_id"):
+        if filters.get(key) is not None:
+            parts.append(f"{key.split('_')[0]}{filters[key]}")
+    name = "-".join(parts) + f".{fmt}"
+    return name + ".gz" if compress else name
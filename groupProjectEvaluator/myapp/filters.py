@@ -0,0 +1,104 @@
+from django.db.models import CharField, Count, Exists, F, OuterRef, Q, Value
+from django.db.models.functions import Cast
+
+from .models import Member, Sprint, SprintContribution, Task
+
+TaskTag = Task.tags.through
+TaskMember = Task.member.through
+MemberGroup = Member.group.through
+TAG_MATCH_MODES = ("any", "all")
+
+
+def parse_id_list(value):
+    """'1,2,3' -> [1, 2, 3]. Returns None when any entry is not an integer."""
+    ids = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            return None
+        ids.append(int(part))
+    return list(dict.fromkeys(ids))
+
+
+def group_scope(model, group_id):
+    """
+    Filter expression for the rows of model that belong to group_id. Paths
+    through many-to-many tables (assignees, memberships) are subqueries
+    rather than joins, so scoping never multiplies rows or needs .distinct().
+    """
+    if model is Task:
+        # A task is in the group when its sprint is, or when any assignee is a
+        # group member. Two indexed IN id sets let SQLite answer the OR as a
+        # union of index lookups (MULTI-INDEX OR) instead of scanning every task.
+        group_sprints = Sprint.objects.filter(group_id=group_id).values("id")
+        group_members = MemberGroup.objects.filter(group_id=group_id).values("member_id")
+        return Q(sprint_id__in=group_sprints) | Q(
+            id__in=TaskMember.objects.filter(member_id__in=group_members).values("task_id")
+        )
+    if model is Member:
+        return Exists(MemberGroup.objects.filter(member_id=OuterRef("pk"), group_id=group_id))
+    if model is SprintContribution:
+        return Q(sprint__group_id=group_id)
+    raise TypeError(f"No group scope defined for {model.__name__}.")
+
+
+def scope_to_group(queryset, group_id):
+    return queryset.filter(group_scope(queryset.model, group_id))
+
+
+def filter_tasks_by_tags(queryset, tag_ids, match="any"):
+    """
+    Keep tasks carrying any (or all) of tag_ids. Both modes filter on a
+    subquery over the task/tag through table, so the outer query never joins
+    tags and needs no .distinct().
+    """
+    if not tag_ids:
+        return queryset
+    if match == "all" and len(tag_ids) > 1:
+        fully_tagged = (
+            TaskTag.objects.filter(tag_id__in=tag_ids)
+            .values("task_id")
+            .annotate(matched=Count("tag_id"))
+            .filter(matched=len(tag_ids))
+            .values("task_id")
+        )
+        return queryset.filter(id__in=fully_tagged)
+    return queryset.filter(
+        Exists(TaskTag.objects.filter(task_id=OuterRef("pk"), tag_id__in=tag_ids))
+    )
+
+
+def task_facets(queryset):
+    """
+    Task counts per status and per tag for the tasks in queryset, fetched as
+    one UNION ALL of two GROUP BYs so the facets cost a single round-trip.
+    """
+    tasks = queryset.order_by().prefetch_related(None)
+    by_status = (
+        tasks.values("status")
+        .annotate(facet=Value("status"), key=F("status"), label=Value(""), total=Count("id", distinct=True))
+        .values_list("facet", "key", "label", "total")
+    )
+    by_tag = (
+        TaskTag.objects.filter(task_id__in=tasks.values("id"))
+        .values("tag_id")
+        .annotate(
+            facet=Value("tag"),
+            key=Cast("tag_id", CharField()),
+            label=F("tag__name"),
+            total=Count("id"),
+        )
+        .values_list("facet", "key", "label", "total")
+    )
+
+    statuses = {code: 0 for code, _ in Task.STATUS_CHOICES}
+    tags = []
+    for facet, key, label, total in by_status.union(by_tag, all=True):
+        if facet == "status":
+            statuses[key] = total
+        else:
+            tags.append({"id": int(key), "name": label, "count": total})
+    tags.sort(key=lambda tag: (-tag["count"], tag["name"]))
+    return {"status": statuses, "tags": tags}
@@ -0,0 +1,128 @@
+import logging
+from datetime import timedelta
+
+import requests
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .instrumentation import track_external
+from .metrics import timed_job
+from .models import GitHubActivity, Member
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://api.github.com"
+REQUEST_TIMEOUT_SECONDS = 10
+# Summaries younger than STALE_AFTER are served without calling GitHub. The
+# refresh job re-fetches anything older than REFRESH_AFTER, so members with a
+# linked account normally never hit the live path.
+STALE_AFTER = timedelta(hours=2)
+REFRESH_AFTER = timedelta(hours=1)
+# Two API calls per member; unauthenticated clients get 60 calls an hour.
+MEMBERS_PER_RUN = 25
+
+
+def fetch_activity(member):
+    """
+    Recent commits, repos and issue count for the member's GitHub account.
+    Raises requests.RequestException, including for non-200 responses (rate
+    limits, outages), so an error is never mistaken for an idle account.
+    """
+    username = member.github_username
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if member.github_token:
+        headers["Authorization"] = f"token {member.github_token}"
+
+    commits = []
+    repos_set = set()
+
+    with track_external("github"):
+        events_res = requests.get(
+            f"{API_URL}/users/{username}/events/public", headers=headers, timeout=REQUEST_TIMEOUT_SECONDS
+        )
+    events_res.raise_for_status()
+    for event in events_res.json()[:30]:
+        if event.get("type") == "PushEvent":
+            repo_name = event.get("repo", {}).get("name", "")
+            repos_set.add(repo_name)
+            for c in event.get("payload", {}).get("commits", [])[:5]:
+                commits.append(
+                    {
+                        "repo": repo_name,
+                        "message": c.get("message", ""),
+                        "sha": c.get("sha", "")[:7],
+                    }
+                )
+        elif event.get("type") in ["CreateEvent", "PullRequestEvent", "IssuesEvent"]:
+            repos_set.add(event.get("repo", {}).get("name", ""))
+
+    with track_external("github"):
+        issues_res = requests.get(
+            f"{API_URL}/search/issues?q=author:{username}+type:issue", headers=headers, timeout=REQUEST_TIMEOUT_SECONDS
+        )
+    issues_res.raise_for_status()
+    issues_count = issues_res.json().get("total_count", 0)
+
+    return {
+        "username": username,
+        "commits": commits[:20],
+        "issues_count": issues_count,
+        "repos": list(repos_set)[:15],
+    }
+
+
+def refresh_activity(member):
+    """Fetch and store the member's summary. Raises requests.RequestException."""
+    data = fetch_activity(member)
+    GitHubActivity.objects.update_or_create(
+        member=member,
+        defaults={"username": member.github_username, "data": data, "fetched_at": timezone.now()},
+    )
+    return data
+
+
+def get_activity(member):
+    """
+    The stored summary if it is recent and for the current username,
+    otherwise a live fetch. When GitHub fails, an older summary for the same
+    username is served instead; with none, the RequestException propagates.
+    """
+    stored = GitHubActivity.objects.filter(member=member, username=member.github_username).first()
+    if stored is not None and stored.fetched_at >= timezone.now() - STALE_AFTER:
+        return stored.data
+    try:
+        return refresh_activity(member)
+    except requests.RequestException as exc:
+        if stored is None:
+            raise
+        logger.warning("GitHub fetch failed for member %s; serving the summary from %s: %s", member.pk, stored.fetched_at, exc)
+        return stored.data
+
+
+@timed_job("refresh_github_activity")
+def refresh_github_activity(limit=MEMBERS_PER_RUN):
+    """
+    django_q task: re-fetch the stalest summaries (missing ones first) for
+    members with a linked account, at most `limit` per run to stay inside
+    GitHub's rate limit. One member's API error doesn't stop the run.
+    """
+    cutoff = timezone.now() - REFRESH_AFTER
+    due = (
+        Member.objects.exclude(github_username="")
+        .filter(
+            Q(github_activity__isnull=True)
+            | Q(github_activity__fetched_at__lt=cutoff)
+            | ~Q(github_activity__username=F("github_username"))
+        )
+        .order_by(F("github_activity__fetched_at").asc(nulls_first=True), "id")[:limit]
+    )
+    refreshed = failed = 0
+    for member in due:
+        try:
+            refresh_activity(member)
+            refreshed += 1
+        except requests.RequestException as exc:
+            logger.warning("GitHub refresh failed for member %s: %s", member.pk, exc)
+            failed += 1
+    logger.info("Refreshed GitHub activity for %s members (%s failed).", refreshed, failed)
+    return refreshed
@@ -0,0 +1,111 @@
+import contextvars
+import re
+import time
+from contextlib import contextmanager
+
+from .metrics import EXTERNAL_CALLS, EXTERNAL_DURATION
+
+# Stats for the request currently being handled on this thread/task, or None
+# when instrumentation is off or we're outside a request.
+_current_stats = contextvars.ContextVar("perf_request_stats", default=None)
+
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_sql(sql):
+    """Collapse literals and IN-lists so queries differing only by values group together."""
+    sql = _LITERALS.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _IN_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class RequestStats:
+    def __init__(self, sample_queries=False):
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.external = {}
+        self.fingerprints = {} if sample_queries else None
+
+    def record_query(self, sql, elapsed_ms):
+        self.db_queries += 1
+        self.db_ms += elapsed_ms
+        if self.fingerprints is not None:
+            entry = self.fingerprints.setdefault(fingerprint_sql(sql), [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+
+    def record_external(self, service, elapsed_ms):
+        entry = self.external.setdefault(service, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed_ms
+
+    def top_fingerprints(self, limit):
+        if not self.fingerprints:
+            return []
+        ranked = sorted(self.fingerprints.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            {"sql": sql, "count": count, "ms": round(ms, 2)}
+            for sql, (count, ms) in ranked[:limit]
+        ]
+
+
+def current_stats():
+    return _current_stats.get()
+
+
+def start_request(sample_queries=False):
+    stats = RequestStats(sample_queries=sample_queries)
+    return stats, _current_stats.set(stats)
+
+
+def end_request(token):
+    _current_stats.reset(token)
+
+
+@contextmanager
+def resume_request(stats):
+    """
+    Charge queries and outbound calls in this block to `stats` again, for
+    request work that runs after the middleware returned (a streamed body).
+    Set and reset within one step, so it never spans a context switch.
+    """
+    token = _current_stats.set(stats)
+    try:
+        yield
+    finally:
+        _current_stats.reset(token)
+
+
+def query_timer(execute, sql, params, many, context):
+    """connection.execute_wrapper hook that charges each query to the current request."""
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record_query(sql, (time.perf_counter() - started) * 1000)
+
+
+@contextmanager
+def track_external(service):
+    """
+    Time an outbound call (Gemini, GitHub, ...). Always feeds the process-wide
+    metrics; also charged to the current request when instrumentation is on.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        elapsed = time.perf_counter() - started
+        EXTERNAL_CALLS.inc(service=service, outcome=outcome)
+        EXTERNAL_DURATION.observe(elapsed, service=service)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record_external(service, elapsed * 1000)
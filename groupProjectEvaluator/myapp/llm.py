@@ -0,0 +1,266 @@
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+
+from django.conf import settings
+
+from .instrumentation import track_external
+from .metrics import LLM_CALLS, LLM_DURATION, LLM_RETRIES, LLM_TOKENS
+
+logger = logging.getLogger(__name__)
+
+LLMResponse = namedtuple("LLMResponse", ["text", "prompt_tokens", "completion_tokens"])
+
+_lock = threading.Lock()
+_client = None
+
+
+class LLMError(Exception):
+    """The LLM call failed after retries (or could not be retried)."""
+
+
+class LLMUnavailable(LLMError):
+    """The circuit breaker is open: the backend failed repeatedly and is not being called."""
+
+
+class GeminiBackend:
+    """google-generativeai, configured once per process with one reused model handle."""
+
+    service = "gemini"
+
+    def __init__(self, model_name, api_key, timeout):
+        import google.generativeai as genai
+        from google.api_core import exceptions
+
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+        self._timeout = timeout
+        self.retryable = (
+            TimeoutError,
+            ConnectionError,
+            exceptions.DeadlineExceeded,
+            exceptions.InternalServerError,
+            exceptions.ResourceExhausted,
+            exceptions.ServiceUnavailable,
+        )
+
+    def generate(self, prompt):
+        response = self._model.generate_content(prompt, request_options={"timeout": self._timeout})
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            response.text,
+            getattr(usage, "prompt_token_count", 0) or 0,
+            getattr(usage, "candidates_token_count", 0) or 0,
+        )
+
+
+class FakeBackend:
+    """
+    Deterministic in-process stand-in for local runs, tests and benchmarks.
+    Answers every prompt with one JSON object (derived from a hash of the
+    prompt) carrying the fields each caller in this app parses.
+    """
+
+    service = "fake_llm"
+    retryable = (TimeoutError, ConnectionError)
+    RECOMMENDATIONS = ("UPHOLD", "DISMISS", "NEEDS_REVIEW")
+
+    def __init__(self, latency_ms=0):
+        self._latency = latency_ms / 1000
+
+    def generate(self, prompt):
+        if self._latency:
+            time.sleep(self._latency)
+        digest = hashlib.sha256(prompt.encode()).digest()
+        recommendation = self.RECOMMENDATIONS[digest[0] % len(self.RECOMMENDATIONS)]
+        text = json.dumps(
+            {
+                "overlapping": digest[1] % 4 == 0,
+                "reason": f"Fake review {digest.hex()[:8]}.",
+                "recommendation": recommendation,
+                "summary": f"Fake assessment {digest.hex()[:8]}: {recommendation.lower().replace('_', ' ')}.",
+            }
+        )
+        return LLMResponse(text, len(prompt.split()), len(text.split()))
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls for
+    `cooldown` seconds; then lets a single trial call through (half-open)
+    and closes again if it succeeds.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self._opened_at >= self.cooldown else "open"
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.threshold:
+                if self._opened_at is None:
+                    logger.warning("LLM circuit opened after %s consecutive failures.", self._failures)
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class LLMClient:
+    """
+    The process-wide LLM client: one backend instance, retries with
+    exponential backoff on transient errors, a circuit breaker, and
+    coalescing of identical prompts that are in flight at the same time.
+    """
+
+    def __init__(self, backend, max_retries=3, backoff_seconds=0.5, backoff_max_seconds=8.0,
+                 breaker_threshold=5, breaker_cooldown_seconds=30.0):
+        self.backend = backend
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown_seconds)
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+
+    @property
+    def service(self):
+        return self.backend.service
+
+    def generate(self, prompt):
+        """Response text for `prompt`. Raises LLMUnavailable or LLMError."""
+        with self._in_flight_lock:
+            future = self._in_flight.get(prompt)
+            leader = future is None
+            if leader:
+                future = self._in_flight[prompt] = Future()
+        if not leader:
+            LLM_CALLS.inc(backend=self.service, outcome="coalesced")
+            return future.result()
+
+        try:
+            future.set_result(self._call_with_retries(prompt))
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[prompt]
+        return future.result()
+
+    def _call_with_retries(self, prompt):
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                LLM_CALLS.inc(backend=self.service, outcome="rejected")
+                raise LLMUnavailable(f"{self.service} circuit is open; not calling the LLM.")
+
+            started = time.perf_counter()
+            try:
+                with track_external(self.service):
+                    response = self.backend.generate(prompt)
+            except self.backend.retryable as exc:
+                self._record(started, "error")
+                self.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise LLMError(f"{self.service} failed after {attempt + 1} attempts: {exc}") from exc
+                delay = min(self.backoff_max_seconds, self.backoff_seconds * 2 ** attempt)
+                LLM_RETRIES.inc(backend=self.service)
+                logger.info("LLM call failed (%s); retry %s in %.2fs.", exc, attempt + 1, delay)
+                # Full jitter so callers that failed together don't retry together.
+                time.sleep(random.uniform(0, delay))
+            except Exception as exc:
+                # Not transient (bad request, safety block): retrying won't help, and
+                # the backend did answer, so it doesn't count against the breaker.
+                self._record(started, "error")
+                self.breaker.record_success()
+                raise LLMError(f"{self.service} call failed: {exc}") from exc
+            else:
+                self._record(started, "success")
+                self.breaker.record_success()
+                LLM_TOKENS.inc(response.prompt_tokens, backend=self.service, kind="prompt")
+                LLM_TOKENS.inc(response.completion_tokens, backend=self.service, kind="completion")
+                return response.text
+
+    def _record(self, started, outcome):
+        LLM_CALLS.inc(backend=self.service, outcome=outcome)
+        LLM_DURATION.observe(time.perf_counter() - started, backend=self.service, outcome=outcome)
+
+
+def _build_backend(config):
+    if config["BACKEND"] == "fake":
+        return FakeBackend(latency_ms=config.get("FAKE_LATENCY_MS", 0))
+    if config["BACKEND"] == "gemini":
+        if not settings.GEMINI_API_KEY:
+            # Never answer with made-up text in place of a real model.
+            raise LLMError("GEMINI_API_KEY is not set; set it, or use LLM_BACKEND=fake for local runs.")
+        return GeminiBackend(config["MODEL"], settings.GEMINI_API_KEY, config.get("TIMEOUT_SECONDS", 30))
+    raise ValueError(f"Unknown LLM backend {config['BACKEND']!r}.")
+
+
+def build_client(config=None):
+    """LLMClient for `config` (settings.LLM by default). Raises LLMError if the backend isn't configured."""
+    config = config or settings.LLM
+    return LLMClient(
+        _build_backend(config),
+        max_retries=config.get("MAX_RETRIES", 3),
+        backoff_seconds=config.get("BACKOFF_SECONDS", 0.5),
+        backoff_max_seconds=config.get("BACKOFF_MAX_SECONDS", 8.0),
+        breaker_threshold=config.get("BREAKER_THRESHOLD", 5),
+        breaker_cooldown_seconds=config.get("BREAKER_COOLDOWN_SECONDS", 30.0),
+    )
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = build_client()
+    return _client
+
+
+def reset_client():
+    """Drop the shared client so the next call rebuilds it from settings.LLM (tests, benchmarks)."""
+    global _client
+    with _lock:
+        _client = None
+
+
+def generate(prompt):
+    """Send one prompt through the shared client and return the response text. Raises LLMError."""
+    return get_client().generate(prompt)
+
+
+def parse_json(text):
+    """Parse a JSON reply, tolerating a ```json fenced block."""
+    raw = text.strip().removeprefix("```json").removesuffix("```").strip()
+    return json.loads(raw)
@@ -0,0 +1,146 @@
+import functools
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import JobLease
+
+logger = logging.getLogger(__name__)
+
+# A lease is renewed every LEASE_SECONDS / HEARTBEATS_PER_LEASE seconds, so it
+# survives a couple of missed heartbeats. Keep LEASE_SECONDS below
+# Q_CLUSTER['retry'] so a run killed at the timeout has released the job by
+# the time django_q retries it.
+LEASE_SECONDS = 60
+HEARTBEATS_PER_LEASE = 3
+
+
+def _owner_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire(name, owner, seconds=LEASE_SECONDS):
+    """
+    Take the lease `name` for `owner` if it is free or expired. Returns True
+    on success. Both paths are a single INSERT or UPDATE, so two processes
+    racing for the same lease can't both win.
+    """
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            JobLease.objects.create(
+                name=name, owner=owner, acquired_at=now, heartbeat_at=now, expires_at=now + timedelta(seconds=seconds)
+            )
+        return True
+    except IntegrityError:
+        pass
+    taken = JobLease.objects.filter(name=name, expires_at__lte=now).update(
+        owner=owner, acquired_at=now, heartbeat_at=now, expires_at=now + timedelta(seconds=seconds)
+    )
+    return bool(taken)
+
+
+def heartbeat(name, owner, seconds=LEASE_SECONDS):
+    """Extend a held lease. Returns False if `owner` no longer holds it (it expired and was taken)."""
+    now = timezone.now()
+    return bool(
+        JobLease.objects.filter(name=name, owner=owner).update(
+            heartbeat_at=now, expires_at=now + timedelta(seconds=seconds)
+        )
+    )
+
+
+def release(name, owner):
+    """Give the lease up; a lease already taken over by someone else is left alone."""
+    JobLease.objects.filter(name=name, owner=owner).delete()
+
+
+def holder(name):
+    """The current unexpired JobLease for `name`, or None."""
+    return JobLease.objects.filter(name=name, expires_at__gt=timezone.now()).first()
+
+
+class Lease:
+    """
+    Context manager around acquire/heartbeat/release. While held, a daemon
+    thread renews the lease; `lost` turns True if a renewal finds the lease
+    gone, which long-running work can check to stop early.
+
+        with Lease("nightly") as lease:
+            if lease.acquired:
+                ...
+    """
+
+    def __init__(self, name, seconds=LEASE_SECONDS):
+        self.name = name
+        self.seconds = seconds
+        self.owner = _owner_id()
+        self.acquired = False
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.acquired = acquire(self.name, self.owner, self.seconds)
+        if self.acquired:
+            self._thread = threading.Thread(target=self._renew, name=f"lease-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.acquired:
+            self._stop.set()
+            self._thread.join()
+            release(self.name, self.owner)
+        return False
+
+    def _renew(self):
+        interval = self.seconds / HEARTBEATS_PER_LEASE
+        try:
+            while not self._stop.wait(interval):
+                try:
+                    alive = heartbeat(self.name, self.owner, self.seconds)
+                except Exception:
+                    # A transient DB error: the lease has slack for the next attempt.
+                    logger.exception("Heartbeat for lease %s failed.", self.name)
+                    continue
+                if not alive:
+                    self.lost = True
+                    logger.warning("Lease %s expired while held by %s.", self.name, self.owner)
+                    return
+        finally:
+            # This thread got its own connection; don't leave it open.
+            connection.close()
+
+
+def singleton_job(name, seconds=LEASE_SECONDS, key=None):
+    """
+    Decorator for background jobs that must not overlap across the cluster.
+    A run that finds the lease held by someone else logs and returns None
+    without doing anything. `key(*args, **kwargs)` can return a suffix so
+    that e.g. different shards of one job hold separate leases.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            suffix = key(*args, **kwargs) if key else None
+            lease_name = f"{name}:{suffix}" if suffix else name
+            with Lease(lease_name, seconds) as lease:
+                if not lease.acquired:
+                    current = holder(lease_name)
+                    logger.info(
+                        "Skipping %s: lease held by %s.", lease_name, current.owner if current else "another run"
+                    )
+                    return None
+                result = func(*args, **kwargs)
+                if lease.lost:
+                    logger.warning("%s finished after losing its lease; another run may have overlapped.", lease_name)
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,80 @@
+import logging
+from datetime import date, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from . import llm
+from .metrics import timed_job
+from .models import Sprint, SprintContribution
+
+logger = logging.getLogger(__name__)
+
+# Sprints that ended longer ago than this are settled; their overlap flags are left alone.
+OVERLAP_RECHECK_DAYS = 7
+# django_q keeps a Task row per run (success and failure); rows older than this are deleted.
+TASK_RESULT_RETENTION_DAYS = 14
+PRUNE_BATCH_SIZE = 1000
+
+
+def recheck_sprint_overlap(sprint_id):
+    """
+    Recompute the sprint-wide overlap flag from every contribution; stops at
+    the first overlap. Raises LLMError, leaving the stored flag as it was,
+    if any check couldn't get an answer.
+    """
+    contributions = SprintContribution.objects.filter(sprint_id=sprint_id).select_related("sprint", "member")
+    overlapping = any(c.is_overlapping(fail_open=False) for c in contributions if c.description)
+    contributions.update(has_overlapping_contributions=overlapping)
+    return overlapping
+
+
+@timed_job("recheck_overlaps")
+def recheck_overlaps(days=OVERLAP_RECHECK_DAYS):
+    """
+    django_q task: re-run the overlap check for active and recently ended
+    sprints. The check on save fails open when the LLM is unavailable, so
+    this nightly pass is what eventually corrects those flags. Sprints it
+    can't get an answer for (e.g. during an outage) keep their stored flag.
+    """
+    cutoff = date.today() - timedelta(days=days)
+    sprint_ids = list(
+        Sprint.objects.filter(Q(is_active=True) | Q(end_date__gte=cutoff), contributions__isnull=False)
+        .distinct()
+        .values_list("id", flat=True)
+    )
+    flagged = skipped = 0
+    for sprint_id in sprint_ids:
+        try:
+            flagged += recheck_sprint_overlap(sprint_id)
+        except llm.LLMError as exc:
+            logger.warning("Overlap recheck skipped for sprint %s: %s", sprint_id, exc)
+            skipped += 1
+    logger.info("Rechecked overlaps in %s sprints; %s flagged, %s skipped.", len(sprint_ids), flagged, skipped)
+    return flagged
+
+
+@timed_job("reconcile_reaction_counts")
+def reconcile_reaction_counts():
+    """django_q task: rewrite every denormalized reaction counter from ContributionReaction rows."""
+    return SprintContribution.recount_reactions()
+
+
+@timed_job("prune_task_results")
+def prune_task_results(days=TASK_RESULT_RETENTION_DAYS):
+    """
+    django_q task: delete finished django_q Task rows older than `days`, in
+    batches so the broker database isn't locked for one long DELETE. The job
+    health endpoint only looks back JOB_HEALTH_WINDOW_DAYS, well inside this.
+    """
+    from django_q.models import Task as QueuedTask
+
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while True:
+        ids = list(QueuedTask.objects.filter(stopped__lt=cutoff).values_list("id", flat=True)[:PRUNE_BATCH_SIZE])
+        if not ids:
+            break
+        deleted += QueuedTask.objects.filter(id__in=ids).delete()[0]
+    logger.info("Pruned %s django_q task results older than %s days.", deleted, days)
+    return deleted
@@ -0,0 +1,172 @@
+# myapp/management/commands/bench_api.py
+import json
+import math
+import platform
+import statistics
+import time
+from io import StringIO
+from pathlib import Path
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from myapp.models import Group, Member, Project, Sprint, Tag, Task
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hot API endpoints in-process on freshly seeded test "
+        "databases and write latency percentiles, query counts and response "
+        "sizes to a JSON file. Use --compare to diff two result files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales", nargs="+", default=["10k"],
+            help="seed --scale presets to benchmark (default: 10k).",
+        )
+        parser.add_argument("--requests", type=int, default=50, help="Timed requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=3, help="Untimed requests per endpoint.")
+        parser.add_argument("--seed", type=int, default=582)
+        parser.add_argument("--output", default="bench_results.json", help="Where to write the results.")
+        parser.add_argument(
+            "--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"),
+            help="Compare two result files instead of running the benchmark.",
+        )
+        parser.add_argument(
+            "--threshold", type=float, default=0.10,
+            help="Relative p95 slowdown that counts as a regression (default: 0.10).",
+        )
+
+    def handle(self, *args, **options):
+        if options["compare"]:
+            self._compare(*options["compare"], threshold=options["threshold"])
+            return
+
+        results = {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "requests": options["requests"],
+                "seed": options["seed"],
+            },
+            "scales": {},
+        }
+        for scale in options["scales"]:
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                self.stdout.write(f"== seeding {scale} ==")
+                call_command("seed", scale=scale, seed=options["seed"], stdout=StringIO())
+                results["scales"][scale] = self._run_scale(options["requests"], options["warmup"])
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        Path(options["output"]).write_text(json.dumps(results, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+
+    def _endpoints(self):
+        """(name, method, path, payload) for each hot endpoint, scoped to one seeded group."""
+        group = Group.objects.order_by("id").first()
+        tag = Tag.objects.filter(group=group, tasks__isnull=False).order_by("id").first()
+        member = Member.objects.filter(group=group, disputes_received__isnull=False).order_by("id").first()
+        sprint = Sprint.objects.filter(group=group).order_by("id").first()
+        project = Project.objects.filter(group=group).order_by("id").first()
+        task = Task.objects.filter(sprint=sprint, comments__isnull=False).order_by("id").first()
+
+        return [
+            ("tasks_by_group", "get", f"/api/tasks/?group_id={group.id}", None),
+            ("tasks_by_tag", "get", f"/api/tasks/?group_id={group.id}&tag_id={tag.id}", None),
+            ("contributions", "get", f"/api/contributions/?group_id={group.id}&current_member_id={member.id}", None),
+            ("disputes", "get", f"/api/disputes/?member_id={member.id}", None),
+            ("instructor_dashboard", "get", "/api/dashboard/instructor-discrepancy/", None),
+            ("project_timeline", "get", f"/api/projects/{project.id}/timeline/", None),
+            ("task_comments", "get", f"/api/task-comments/?task_id={task.id}", None),
+            ("login", "post", "/api/auth/login/", {"identifier": member.email, "password": member.password}),
+        ]
+
+    def _run_scale(self, request_count, warmup):
+        client = Client()
+        results = {}
+        for name, method, path, payload in self._endpoints():
+            send = getattr(client, method)
+            kwargs = {"data": json.dumps(payload), "content_type": "application/json"} if payload else {}
+
+            for _ in range(warmup):
+                send(path, **kwargs)
+
+            latencies = []
+            query_counts = []
+            sizes = []
+            for _ in range(request_count):
+                # The capture context stops Django clearing the query log between requests.
+                reset_queries()
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = send(path, **kwargs)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    raise CommandError(f"{name} returned {response.status_code}: {response.content[:200]!r}")
+                query_counts.append(len(queries))
+                sizes.append(len(response.content))
+
+            results[name] = {
+                "p50_ms": round(percentile(latencies, 50), 3),
+                "p95_ms": round(percentile(latencies, 95), 3),
+                "p99_ms": round(percentile(latencies, 99), 3),
+                "mean_ms": round(statistics.fmean(latencies), 3),
+                "queries": max(query_counts),
+                "bytes": max(sizes),
+            }
+            row = results[name]
+            self.stdout.write(
+                f"{name:<22} p50 {row['p50_ms']:>9.2f}ms  p95 {row['p95_ms']:>9.2f}ms  "
+                f"p99 {row['p99_ms']:>9.2f}ms  {row['queries']:>5} queries  {row['bytes']:>9} bytes"
+            )
+        return results
+
+    def _compare(self, baseline_path, candidate_path, threshold):
+        baseline = json.loads(Path(baseline_path).read_text())["scales"]
+        candidate = json.loads(Path(candidate_path).read_text())["scales"]
+
+        regressions = []
+        for scale, endpoints in candidate.items():
+            for name, row in endpoints.items():
+                before = baseline.get(scale, {}).get(name)
+                if before is None:
+                    self.stdout.write(f"{scale:<6} {name:<22} (new)")
+                    continue
+
+                change = (row["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0
+                flags = []
+                if change > threshold:
+                    flags.append(f"p95 +{change:.0%}")
+                if row["queries"] > before["queries"]:
+                    flags.append(f"queries {before['queries']} -> {row['queries']}")
+                if flags:
+                    regressions.append((scale, name, flags))
+
+                line = (
+                    f"{scale:<6} {name:<22} p95 {before['p95_ms']:>9.2f} -> {row['p95_ms']:>9.2f}ms ({change:+.0%})  "
+                    f"queries {before['queries']:>5} -> {row['queries']:<5}"
+                )
+                self.stdout.write(self.style.ERROR(line) if flags else line)
+
+        if regressions:
+            raise CommandError(
+                "Regressions found: "
+                + "; ".join(f"{scale}/{name} ({', '.join(flags)})" for scale, name, flags in regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions."))
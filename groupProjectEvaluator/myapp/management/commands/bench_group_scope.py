@@ -0,0 +1,159 @@
+# myapp/management/commands/bench_group_scope.py
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Q
+
+from myapp.filters import scope_to_group
+from myapp.models import Group, Member, Sprint, Task
+
+BENCH_ALIAS = "bench_group_scope"
+TASKS_PER_SPRINT = 100
+SPRINTS_PER_GROUP = 10
+MEMBERS_PER_GROUP = 8
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the old OR-join-distinct group filter on tasks with "
+        "scope_to_group on a throwaway SQLite database where "
+        "members belong to many groups and tasks have many assignees. Prints "
+        "timings per scale, time per 1k tasks and EXPLAIN QUERY PLAN."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales", nargs="+", type=int, default=[10_000, 50_000, 200_000],
+            help="Task counts to benchmark (default: 10k 50k 200k).",
+        )
+        parser.add_argument("--assignees", type=int, default=4, help="Assignees per task.")
+        parser.add_argument("--groups-per-member", type=int, default=5, help="Extra groups each member joins.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query.")
+        parser.add_argument("--seed", type=int, default=582, help="Random seed for data generation.")
+        parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file.")
+
+    def handle(self, *args, **options):
+        results = []
+        for scale in options["scales"]:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                connections.settings[BENCH_ALIAS] = dict(
+                    connections.settings["default"], NAME=str(Path(tmp_dir) / "bench.sqlite3")
+                )
+                try:
+                    call_command("migrate", database=BENCH_ALIAS, verbosity=0)
+                    group_id = self._populate(scale, options, random.Random(options["seed"]))
+                    connections[BENCH_ALIAS].cursor().execute("ANALYZE")
+                    for name, queryset in self._queries(group_id).items():
+                        row = {"scale": scale, "query": name, **self._time(queryset, options["repeat"])}
+                        results.append(row)
+                finally:
+                    connections[BENCH_ALIAS].close()
+                    del connections[BENCH_ALIAS]
+                    del connections.settings[BENCH_ALIAS]
+
+        self._report(results, options["scales"])
+        if options["json_path"]:
+            Path(options["json_path"]).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Results written to {options['json_path']}")
+
+    def _populate(self, scale, options, rng):
+        db = BENCH_ALIAS
+        group_count = max(2, scale // (TASKS_PER_SPRINT * SPRINTS_PER_GROUP))
+        today = date.today()
+
+        with transaction.atomic(using=db):
+            groups = Group.objects.using(db).bulk_create(
+                [Group(name=f"Group {i}", group_code=1000 + i) for i in range(group_count)],
+                batch_size=BATCH_SIZE,
+            )
+            members = Member.objects.using(db).bulk_create(
+                [
+                    Member(name=f"Member {i}", email=f"m{i}@bench.local", username=f"m{i}", password="x")
+                    for i in range(group_count * MEMBERS_PER_GROUP)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            memberships = set()
+            for i, member in enumerate(members):
+                memberships.add((member.id, groups[i // MEMBERS_PER_GROUP].id))
+                for group in rng.sample(groups, min(options["groups_per_member"], group_count)):
+                    memberships.add((member.id, group.id))
+            Member.group.through.objects.using(db).bulk_create(
+                [Member.group.through(member_id=m, group_id=g) for m, g in memberships],
+                batch_size=BATCH_SIZE,
+            )
+            sprints = Sprint.objects.using(db).bulk_create(
+                [
+                    Sprint(
+                        name=f"Sprint {s + 1}",
+                        start_date=today - timedelta(days=14 * (s + 1)),
+                        end_date=today - timedelta(days=14 * s),
+                        group=group,
+                    )
+                    for group in groups
+                    for s in range(SPRINTS_PER_GROUP)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            tasks = Task.objects.using(db).bulk_create(
+                [
+                    Task(title=f"Task {i}", sprint=sprints[i // TASKS_PER_SPRINT])
+                    for i in range(min(scale, len(sprints) * TASKS_PER_SPRINT))
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            Task.member.through.objects.using(db).bulk_create(
+                [
+                    Task.member.through(task_id=task.id, member_id=member.id)
+                    for i, task in enumerate(tasks)
+                    for member in rng.sample(
+                        self._group_members(members, i // (TASKS_PER_SPRINT * SPRINTS_PER_GROUP)),
+                        min(options["assignees"], MEMBERS_PER_GROUP),
+                    )
+                ],
+                batch_size=BATCH_SIZE,
+            )
+        return groups[len(groups) // 2].id
+
+    def _group_members(self, members, group_index):
+        return members[group_index * MEMBERS_PER_GROUP:(group_index + 1) * MEMBERS_PER_GROUP]
+
+    def _queries(self, group_id):
+        tasks = Task.objects.using(BENCH_ALIAS)
+        return {
+            "or_join_distinct": tasks.filter(
+                Q(sprint__group_id=group_id) | Q(member__group__id=group_id)
+            ).distinct().values_list("id", flat=True),
+            "scope_to_group": scope_to_group(tasks, group_id).values_list("id", flat=True),
+        }
+
+    def _time(self, queryset, repeat):
+        rows = len(list(queryset.all()))  # warm the page cache
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        return {"rows": rows, "ms": round(statistics.median(timings), 3), "plan": queryset.explain()}
+
+    def _report(self, results, scales):
+        for row in results:
+            per_thousand = row["ms"] / (row["scale"] / 1000)
+            self.stdout.write(
+                f"{row['scale']:>9} tasks  {row['query']:<18} {row['ms']:>10.3f}ms  "
+                f"{per_thousand:>7.3f}ms/1k tasks  {row['rows']} rows"
+            )
+        largest = [row for row in results if row["scale"] == max(scales)]
+        for row in largest:
+            self.stdout.write(f"-- plan: {row['query']} at {row['scale']} tasks")
+            for line in row["plan"].splitlines():
+                self.stdout.write(f"    {line}")
@@ -0,0 +1,282 @@
+# myapp/management/commands/bench_indexes.py
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Count
+
+from myapp.models import (
+    Dispute, Group, Member, Sprint, SprintContribution, Task, TaskComment
+)
+
+BENCH_ALIAS = "bench_indexes"
+TASKS_PER_SPRINT = 100
+SPRINTS_PER_GROUP = 10
+MEMBERS_PER_GROUP = 8
+BATCH_SIZE = 5000
+STATUSES = ["BACKLOG", "TODO", "IN_PROGRESS", "DONE"]
+
+# Models whose Meta.indexes were added for the hot query paths.
+INDEXED_MODELS = [Sprint, Task, TaskComment, SprintContribution, Dispute]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hot query paths with and without the Meta.indexes on "
+        "a throwaway SQLite database, printing EXPLAIN QUERY PLAN and timings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales", nargs="+", type=int, default=[10_000, 100_000, 1_000_000],
+            help="Task counts to benchmark (default: 10k 100k 1M).",
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query.")
+        parser.add_argument("--seed", type=int, default=582, help="Random seed for data generation.")
+        parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file.")
+
+    def handle(self, *args, **options):
+        results = []
+        for scale in options["scales"]:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                self._open_bench_database(Path(tmp_dir) / "bench.sqlite3")
+                try:
+                    self.stdout.write(f"== {scale} tasks ==")
+                    started = time.perf_counter()
+                    params = self._populate(scale, random.Random(options["seed"]))
+                    self.stdout.write(f"seeded in {time.perf_counter() - started:.1f}s")
+
+                    self._toggle_indexes(enabled=False)
+                    before = self._run_queries(params, options["repeat"])
+                    self._toggle_indexes(enabled=True)
+                    after = self._run_queries(params, options["repeat"])
+                finally:
+                    connections[BENCH_ALIAS].close()
+                    del connections[BENCH_ALIAS]
+                    del connections.settings[BENCH_ALIAS]
+
+            for name in before:
+                row = {
+                    "scale": scale,
+                    "query": name,
+                    "before_ms": before[name]["ms"],
+                    "after_ms": after[name]["ms"],
+                    "before_plan": before[name]["plan"],
+                    "after_plan": after[name]["plan"],
+                }
+                results.append(row)
+                self._report(row)
+
+        if options["json_path"]:
+            Path(options["json_path"]).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Results written to {options['json_path']}")
+
+    def _open_bench_database(self, path):
+        connections.settings[BENCH_ALIAS] = dict(connections.settings["default"], NAME=str(path))
+        call_command("migrate", database=BENCH_ALIAS, verbosity=0)
+        cursor = connections[BENCH_ALIAS].cursor()
+        cursor.execute("PRAGMA journal_mode=OFF")
+        cursor.execute("PRAGMA synchronous=OFF")
+
+    def _toggle_indexes(self, enabled):
+        connection = connections[BENCH_ALIAS]
+        with connection.schema_editor() as editor:
+            for model in INDEXED_MODELS:
+                for index in model._meta.indexes:
+                    if enabled:
+                        editor.add_index(model, index)
+                    else:
+                        editor.remove_index(model, index)
+        connection.cursor().execute("ANALYZE")
+
+    def _populate(self, scale, rng):
+        db = BENCH_ALIAS
+        group_count = max(1, scale // (TASKS_PER_SPRINT * SPRINTS_PER_GROUP))
+        today = date.today()
+
+        with transaction.atomic(using=db):
+            groups = Group.objects.using(db).bulk_create(
+                [Group(name=f"Group {i}", group_code=1000 + i) for i in range(group_count)],
+                batch_size=BATCH_SIZE,
+            )
+            members = Member.objects.using(db).bulk_create(
+                [
+                    Member(
+                        name=f"Member {g}-{i}",
+                        email=f"m{g}-{i}@bench.local",
+                        username=f"m{g}-{i}",
+                        password="password123",
+                        roles="PROJECT_MANAGER" if i == 0 else "TEAM_MEMBER",
+                    )
+                    for g in range(group_count)
+                    for i in range(MEMBERS_PER_GROUP)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            Member.group.through.objects.using(db).bulk_create(
+                [
+                    Member.group.through(member_id=member.id, group_id=groups[i // MEMBERS_PER_GROUP].id)
+                    for i, member in enumerate(members)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            sprints = Sprint.objects.using(db).bulk_create(
+                [
+                    Sprint(
+                        name=f"Sprint {s + 1}",
+                        start_date=today - timedelta(days=14 * (SPRINTS_PER_GROUP - s)),
+                        end_date=today - timedelta(days=14 * (SPRINTS_PER_GROUP - s - 1)),
+                        is_active=s == SPRINTS_PER_GROUP - 1,
+                        group=group,
+                    )
+                    for group in groups
+                    for s in range(SPRINTS_PER_GROUP)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+
+            task_rows = []
+            for sprint in sprints:
+                for _ in range(TASKS_PER_SPRINT):
+                    estimated = Decimal(rng.randint(1, 16))
+                    task_rows.append(
+                        Task(
+                            title=f"Task {len(task_rows)}",
+                            status=rng.choice(STATUSES),
+                            sprint=sprint,
+                            estimated_hours=estimated,
+                            actual_hours=estimated * Decimal(rng.choice(["0", "0.5", "1", "2"])),
+                            is_estimation_outlier=rng.random() < 0.05,
+                        )
+                    )
+            tasks = Task.objects.using(db).bulk_create(task_rows[:scale], batch_size=BATCH_SIZE)
+
+            Task.member.through.objects.using(db).bulk_create(
+                [
+                    Task.member.through(
+                        task_id=task.id,
+                        member_id=members[
+                            (i // (TASKS_PER_SPRINT * SPRINTS_PER_GROUP)) * MEMBERS_PER_GROUP
+                            + rng.randrange(MEMBERS_PER_GROUP)
+                        ].id,
+                    )
+                    for i, task in enumerate(tasks)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            TaskComment.objects.using(db).bulk_create(
+                [TaskComment(task=task, text="Looks fine.") for task in tasks[::2]],
+                batch_size=BATCH_SIZE,
+            )
+            SprintContribution.objects.using(db).bulk_create(
+                [
+                    SprintContribution(
+                        member=members[(i // SPRINTS_PER_GROUP) * MEMBERS_PER_GROUP + m],
+                        sprint=sprint,
+                        story_points=rng.choice([1, 2, 3, 5, 8]),
+                        hours_worked=Decimal(rng.randint(2, 40)),
+                    )
+                    for i, sprint in enumerate(sprints)
+                    for m in range(MEMBERS_PER_GROUP)
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            Dispute.objects.using(db).bulk_create(
+                [
+                    Dispute(
+                        raised_by=members[0],
+                        accused_member=rng.choice(members),
+                        sprint=rng.choice(sprints),
+                        status=rng.choice(["OPEN", "UNDER_REVIEW", "RESOLVED", "DISMISSED"]),
+                    )
+                    for _ in range(max(1, scale // 50))
+                ],
+                batch_size=BATCH_SIZE,
+            )
+
+        middle_task = tasks[len(tasks) // 2]
+        return {
+            "group_id": middle_task.sprint.group_id,
+            "sprint_id": middle_task.sprint_id,
+            "task_id": middle_task.id,
+            "member_id": members[len(members) // 2].id,
+            "today": today,
+        }
+
+    def _queries(self, params):
+        """Query shapes from views.py and discrpencies.py, as (queryset, evaluate) pairs."""
+        db = BENCH_ALIAS
+        tasks = Task.objects.using(db)
+        disputes = Dispute.objects.using(db)
+        return {
+            "board_totals": (
+                tasks.filter(sprint_id=params["sprint_id"]).values("status").annotate(count=Count("id")),
+                list,
+            ),
+            "board_column_page": (
+                tasks.filter(sprint_id=params["sprint_id"], status="TODO").order_by("-updated_at", "id")[:25],
+                list,
+            ),
+            "overdue_tasks": (
+                tasks.filter(sprint__end_date__lt=params["today"] - timedelta(days=120))
+                .exclude(status="DONE").values_list("id", flat=True),
+                list,
+            ),
+            "active_sprints": (
+                Sprint.objects.using(db).filter(group_id=params["group_id"], is_active=True),
+                list,
+            ),
+            "dashboard_outliers": (
+                tasks.filter(sprint__group_id=params["group_id"], is_estimation_outlier=True),
+                lambda qs: qs.count(),
+            ),
+            "task_comments": (
+                TaskComment.objects.using(db).filter(task_id=params["task_id"]).order_by("created_at"),
+                list,
+            ),
+            "sprint_contributions": (
+                SprintContribution.objects.using(db)
+                .filter(sprint_id=params["sprint_id"]).exclude(member_id=params["member_id"]),
+                list,
+            ),
+            "open_disputes_for_member": (
+                disputes.filter(accused_member_id=params["member_id"], status__in=("OPEN", "UNDER_REVIEW")),
+                lambda qs: qs.exists(),
+            ),
+            "disputes_by_status": (
+                disputes.filter(status="OPEN"),
+                lambda qs: qs.count(),
+            ),
+        }
+
+    def _run_queries(self, params, repeat):
+        results = {}
+        for name, (queryset, evaluate) in self._queries(params).items():
+            evaluate(queryset.all())  # warm the page cache
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                evaluate(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = {
+                "ms": round(statistics.median(timings), 3),
+                "plan": queryset.explain(),
+            }
+        return results
+
+    def _report(self, row):
+        speedup = row["before_ms"] / row["after_ms"] if row["after_ms"] else float("inf")
+        self.stdout.write(
+            f"{row['query']:<26} before {row['before_ms']:>9.3f}ms  after {row['after_ms']:>9.3f}ms  ({speedup:.1f}x)"
+        )
+        for label in ("before_plan", "after_plan"):
+            for line in row[label].splitlines():
+                self.stdout.write(f"    {label[:-5]:<6} {line}")
@@ -0,0 +1,88 @@
+# myapp/management/commands/bench_outliers.py
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from myapp.models import Group, Sprint, Task
+from myapp.outliers import detect_group_outliers
+
+BENCH_ALIAS = "bench_outliers"
+TASKS_PER_SPRINT = 100
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = (
+        "Time detect_group_outliers on a throwaway SQLite database holding one "
+        "group with --tasks tasks: a first pass that rewrites every rating and "
+        "a second pass where nothing changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=100_000)
+        parser.add_argument("--outlier-rate", type=float, default=0.02, help="Share of tasks with a skewed actual.")
+        parser.add_argument("--seed", type=int, default=582, help="Random seed for data generation.")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            connections.settings[BENCH_ALIAS] = dict(
+                connections.settings["default"], NAME=str(Path(tmp_dir) / "bench.sqlite3")
+            )
+            try:
+                call_command("migrate", database=BENCH_ALIAS, verbosity=0)
+                started = time.perf_counter()
+                group_id = self._populate(options["tasks"], options["outlier_rate"], random.Random(options["seed"]))
+                self.stdout.write(f"seeded {options['tasks']} tasks in {time.perf_counter() - started:.1f}s")
+
+                for label in ("first pass", "unchanged pass"):
+                    started = time.perf_counter()
+                    summary = detect_group_outliers(group_id, using=BENCH_ALIAS)
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"{label:<15} {elapsed * 1000:>9.1f}ms  {summary['tasks'] / elapsed:>10.0f} tasks/s  "
+                        f"{summary['outliers']} outliers, {summary['updated']} rows written ({summary['method']})"
+                    )
+            finally:
+                connections[BENCH_ALIAS].close()
+                del connections[BENCH_ALIAS]
+                del connections.settings[BENCH_ALIAS]
+
+    def _populate(self, task_count, outlier_rate, rng):
+        db = BENCH_ALIAS
+        today = date.today()
+        with transaction.atomic(using=db):
+            group = Group.objects.using(db).create(name="Bench", group_code=1)
+            sprints = Sprint.objects.using(db).bulk_create(
+                [
+                    Sprint(
+                        name=f"Sprint {s + 1}",
+                        start_date=today - timedelta(days=14 * (s + 1)),
+                        end_date=today - timedelta(days=14 * s),
+                        group=group,
+                    )
+                    for s in range(max(1, task_count // TASKS_PER_SPRINT))
+                ],
+                batch_size=BATCH_SIZE,
+            )
+            rows = []
+            for i in range(task_count):
+                estimated = rng.randint(1, 16)
+                # Typical tasks land within about +/-40% of the estimate; a few are way off.
+                skew = rng.choice([0.1, 6.0]) if rng.random() < outlier_rate else rng.lognormvariate(0, 0.2)
+                rows.append(
+                    Task(
+                        title=f"Task {i}",
+                        sprint=sprints[i // TASKS_PER_SPRINT % len(sprints)],
+                        estimated_hours=Decimal(estimated),
+                        actual_hours=Decimal(f"{estimated * skew:.2f}") if rng.random() < 0.8 else Decimal("0"),
+                    )
+                )
+            Task.objects.using(db).bulk_create(rows, batch_size=BATCH_SIZE)
+        return group.id
@@ -0,0 +1,44 @@
+# myapp/management/commands/export_data.py
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp import exports
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a cohort export (contributions, tasks, discrepancies or disputes) "
+        "as CSV or NDJSON to a file or stdout, in constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(exports.DATASETS))
+        parser.add_argument("--format", choices=exports.FORMATS, default="csv", dest="fmt")
+        parser.add_argument("--group", dest="group_id", help="Only rows from this group.")
+        parser.add_argument("--sprint", dest="sprint_id", help="Only rows from this sprint.")
+        parser.add_argument("--since", help="First day to include (YYYY-MM-DD).")
+        parser.add_argument("--until", help="Last day to include (YYYY-MM-DD).")
+        parser.add_argument("--output", "-o", help="File to write; stdout when omitted.")
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output (implied by an --output ending in .gz).")
+
+    def handle(self, *args, **options):
+        try:
+            filters = exports.parse_filters(options)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        output = options["output"]
+        compress = options["gzip"] or bool(output and output.endswith(".gz"))
+
+        chunks = exports.stream_export(options["dataset"], options["fmt"], compress, **filters)
+        written = 0
+        if output:
+            with open(output, "wb") as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+                    written += len(chunk)
+            self.stderr.write(f"Wrote {written} bytes to {output}.")
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
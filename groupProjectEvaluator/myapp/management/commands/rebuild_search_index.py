@@ -0,0 +1,21 @@
+# myapp/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from myapp.search import create_search_index_sql, rebuild_search_index_sql
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text search index from tasks, comments, contributions "
+        "and disputes. Triggers keep it current; run this after restoring data "
+        "with triggers disabled or rebuilding a table outside migrations."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Full-text search requires SQLite FTS5.")
+        with transaction.atomic(), connection.cursor() as cursor:
+            for statement in create_search_index_sql() + rebuild_search_index_sql():
+                cursor.execute(statement)
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,41 @@
+# myapp/management/commands/reconcile_reaction_counts.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+
+from myapp.models import REACTION_COUNTER_FIELDS, SprintContribution
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the denormalized reaction counters on SprintContribution with "
+        "the ContributionReaction rows and rewrite the ones that drifted (for "
+        "example after reactions were removed by a member cascade)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without fixing it.")
+
+    def handle(self, *args, **options):
+        actual = {
+            f"actual_{field}": Count("reactions", filter=Q(reactions__reaction=reaction))
+            for reaction, field in REACTION_COUNTER_FIELDS.items()
+        }
+        with transaction.atomic():
+            rows = SprintContribution.objects.annotate(**actual).values("id", *REACTION_COUNTER_FIELDS.values(), *actual)
+            drifted = [
+                row["id"] for row in rows
+                if any(row[field] != row[f"actual_{field}"] for field in REACTION_COUNTER_FIELDS.values())
+            ]
+            if drifted and not options["dry_run"]:
+                for start in range(0, len(drifted), 500):
+                    SprintContribution.recount_reactions(
+                        SprintContribution.objects.filter(id__in=drifted[start:start + 500])
+                    )
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("Reaction counters are in sync."))
+        elif options["dry_run"]:
+            self.stdout.write(f"{len(drifted)} contributions have drifted reaction counters.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Reconciled reaction counters on {len(drifted)} contributions."))
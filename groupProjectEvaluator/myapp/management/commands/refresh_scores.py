@@ -0,0 +1,22 @@
+# myapp/management/commands/refresh_scores.py
+from django.core.management.base import BaseCommand
+
+from myapp.scoring import refresh_all_scores, refresh_stale_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild materialized member scores: by default only sprints queued since "
+        "their inputs changed, or every sprint with --all (optionally one --group)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Rebuild every sprint, not just stale ones.")
+        parser.add_argument("--group", type=int, help="With --all, only this group's sprints.")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            written = refresh_all_scores(options["group"])
+        else:
+            written = refresh_stale_scores()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} member scores."))
@@ -0,0 +1,35 @@
+# myapp/management/commands/resolve_disputes.py
+from django.core.management.base import BaseCommand
+from django_q.tasks import async_task
+
+from myapp.dispute_resolution import resolve_open_disputes
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in AI resolutions for OPEN disputes that have none. Safe to re-run: "
+        "resolved disputes are skipped and an interrupted run resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, help="Resolve at most this many disputes.")
+        parser.add_argument("--concurrency", type=int, help="LLM calls in flight at once.")
+        parser.add_argument("--per-minute", type=int, dest="calls_per_minute", help="LLM calls allowed per minute.")
+        parser.add_argument("--async", action="store_true", dest="run_async", help="Queue the run on django_q instead.")
+
+    def handle(self, *args, **options):
+        kwargs = {
+            key: options[key] for key in ("limit", "concurrency", "calls_per_minute") if options[key] is not None
+        }
+        if options["run_async"]:
+            task_id = async_task("myapp.dispute_resolution.resolve_open_disputes", **kwargs)
+            self.stdout.write(f"Queued dispute resolution as task {task_id}.")
+            return
+
+        summary = resolve_open_disputes(**kwargs)
+        if summary is None:
+            self.stdout.write(self.style.WARNING("Another dispute resolution run is in progress; nothing done."))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"{summary['resolved']} resolved, {summary['failed']} failed, {summary['remaining']} still pending."
+        ))
@@ -1,148 +1,367 @@
 # myapp/management/commands/seed.py
 import random
-from datetime import timedelta
+import time
+from datetime import datetime, time as clock, timedelta
+from decimal import Decimal
+from django.apps import apps
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
 from django.utils import timezone
 from faker import Faker
 from myapp.models import (
-    Group, Sprint, Project, Member,
-    Task, Story_Point_Estimates, SprintContribution, Dispute
+    Group, Sprint, Project, Member, Tag, Task, TaskComment,
+    Story_Point_Estimates, SprintContribution, ContributionReaction, Dispute, TaskStatusEvent
 )
+from myapp.scoring import refresh_all_scores
 
 fake = Faker()
 
+# Named dataset sizes; any individual option passed on the command line wins.
+SCALE_PRESETS = {
+    "demo": {
+        "groups": 3,
+        "members_per_group": 4,
+        "sprints_per_group": 3,
+        "tasks_per_sprint": 6,
+        "comments_per_task": 1,
+        "contributions_per_sprint": 4,
+        "reactions_per_contribution": 2,
+        "disputes_per_sprint": 1,
+    },
+    "10k": {
+        "groups": 10,
+        "members_per_group": 8,
+        "sprints_per_group": 10,
+        "tasks_per_sprint": 100,
+        "comments_per_task": 2,
+        "contributions_per_sprint": 6,
+        "reactions_per_contribution": 3,
+        "disputes_per_sprint": 2,
+    },
+    "100k": {
+        "groups": 100,
+        "members_per_group": 8,
+        "sprints_per_group": 10,
+        "tasks_per_sprint": 100,
+        "comments_per_task": 2,
+        "contributions_per_sprint": 6,
+        "reactions_per_contribution": 3,
+        "disputes_per_sprint": 2,
+    },
+    "1m": {
+        "groups": 1000,
+        "members_per_group": 8,
+        "sprints_per_group": 10,
+        "tasks_per_sprint": 100,
+        "comments_per_task": 1,
+        "contributions_per_sprint": 6,
+        "reactions_per_contribution": 3,
+        "disputes_per_sprint": 2,
+    },
+}
+
+STATUSES = ["BACKLOG", "TODO", "IN_PROGRESS", "DONE"]
+DISPUTE_STATUSES = ["OPEN", "UNDER_REVIEW", "RESOLVED", "DISMISSED"]
+REACTIONS = [choice for choice, _ in ContributionReaction.REACTION_CHOICES]
+TAG_NAMES = ["frontend", "backend", "api", "database", "testing", "bug", "docs"]
+TEXT_POOL_SIZE = 500
+
+
 class Command(BaseCommand):
     help = 'Seed the database with fake data'
 
-    def handle(self, *args, **kwargs):
-        self.stdout.write('Seeding...')
-
-        # Clear existing data
-        Dispute.objects.all().delete()
-        SprintContribution.objects.all().delete()
-        Story_Point_Estimates.objects.all().delete()
-        Task.objects.all().delete()
-        Sprint.objects.all().delete()
-        Project.objects.all().delete()
-        Member.objects.all().delete()
-        Group.objects.all().delete()
-
-        # Groups
-        groups = []
-        for i in range(3):
-            group = Group.objects.create(
-                name=f"Group {fake.word().capitalize()}",
-                group_code=fake.unique.random_int(min=1000, max=9999),
-            )
-            groups.append(group)
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale", choices=sorted(SCALE_PRESETS), default="demo",
+            help="Dataset size preset (default: demo). '1m' generates one million tasks.",
+        )
+        for option in SCALE_PRESETS["demo"]:
+            parser.add_argument(f"--{option.replace('_', '-')}", dest=option, type=int)
+        parser.add_argument("--seed", type=int, default=582, help="Random seed; the same seed gives the same data.")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        Faker.seed(options["seed"])
+        fake.unique.clear()
+        self.batch_size = options["batch_size"]
+
+        scale = dict(SCALE_PRESETS[options["scale"]])
+        for option in scale:
+            if options.get(option) is not None:
+                scale[option] = options[option]
+
+        self.stdout.write(
+            f"Seeding {scale['groups'] * scale['sprints_per_group'] * scale['tasks_per_sprint']} tasks..."
+        )
+        started = time.perf_counter()
+
+        # Pre-generated text keeps Faker out of the per-row hot loop.
+        self.sentences = [fake.sentence(nb_words=6).rstrip('.') for _ in range(TEXT_POOL_SIZE)]
+        self.paragraphs = [fake.paragraph() for _ in range(TEXT_POOL_SIZE)]
 
-        # Projects
-        projects = []
+        with transaction.atomic():
+            self._clear()
+            groups = self._seed_groups(scale)
+            projects = self._seed_projects(groups)
+            members_by_group = self._seed_members(groups, projects, scale)
+            sprints = self._seed_sprints(groups, scale)
+            tags_by_group = self._seed_tags(groups, members_by_group)
+            task_ids_by_sprint = self._seed_tasks(sprints, members_by_group, tags_by_group, scale)
+            self._seed_estimates(sprints, members_by_group)
+            contributions = self._seed_contributions(sprints, members_by_group, task_ids_by_sprint, scale)
+            self._seed_reactions(contributions, members_by_group, scale)
+            self._seed_disputes(sprints, members_by_group, contributions, task_ids_by_sprint, scale)
+            # Bulk inserts send no signals, so build the score table directly.
+            refresh_all_scores()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done! Database seeded successfully in {time.perf_counter() - started:.1f}s.'
+        ))
+
+    def _clear(self):
+        # Every myapp table is emptied, so the deferred FK checks pass at commit
+        # without the per-row cascade collection that QuerySet.delete() does.
+        app_models = apps.get_app_config("myapp").get_models(include_auto_created=True)
+        with transaction.atomic(), connection.cursor() as cursor:
+            for model in app_models:
+                cursor.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")
+
+    def _bulk(self, model, rows):
+        return model.objects.bulk_create(rows, batch_size=self.batch_size)
+
+    def _seed_groups(self, scale):
+        return self._bulk(Group, [
+            Group(name=f"Group {fake.word().capitalize()} {i + 1}", group_code=1000 + i)
+            for i in range(scale["groups"])
+        ])
+
+    def _seed_projects(self, groups):
+        rows = []
         for group in groups:
             for _ in range(2):
                 start = fake.date_between(start_date='-6m', end_date='today')
-                project = Project.objects.create(
+                rows.append(Project(
                     name=fake.bs().title(),
                     start_date=start,
-                    end_date=start + timedelta(days=random.randint(30, 90)),
+                    end_date=start + timedelta(days=self.rng.randint(30, 90)),
                     group=group,
-                )
-                projects.append(project)
+                ))
+        return self._bulk(Project, rows)
 
-        # Sprints
-        sprints = []
-        for group in groups:
-            for i in range(3):
-                start = fake.date_between(start_date='-3m', end_date='today')
-                sprint = Sprint.objects.create(
-                    name=f"Sprint {i + 1}",
-                    start_date=start,
-                    end_date=start + timedelta(days=14),
-                    is_active=(i == 2),
-                    group=group,
-                )
-                sprints.append(sprint)
-
-        # Members
-        members = []
-        for i in range(12):
-            first = fake.first_name()
-            last = fake.last_name()
-            member = Member.objects.create(
-                name=f"{first} {last}",
-                first_name=first,
-                last_name=last,
-                email=fake.unique.email(),
-                username=fake.unique.user_name(),
-                password="password123",
-                roles=random.choice(["PROJECT_MANAGER", "TEAM_MEMBER"]),
-                university=fake.company() + " University",
-                address={
-                    "street": fake.street_address(),
-                    "city": fake.city(),
-                    "state": fake.state(),
-                    "zip": fake.zipcode(),
-                },
+    def _seed_members(self, groups, projects, scale):
+        rows = []
+        for g, group in enumerate(groups):
+            for i in range(scale["members_per_group"]):
+                first = fake.first_name()
+                last = fake.last_name()
+                handle = f"{first.lower()}.{last.lower()}.{g}.{i}"
+                rows.append(Member(
+                    name=f"{first} {last}",
+                    first_name=first,
+                    last_name=last,
+                    email=f"{handle}@example.com",
+                    username=handle,
+                    password="password123",
+                    roles="PROJECT_MANAGER" if i == 0 else "TEAM_MEMBER",
+                    university=f"{fake.company()} University",
+                    address={"city": fake.city(), "state": fake.state()},
+                ))
+        members = self._bulk(Member, rows)
+
+        projects_by_group = {}
+        for project in projects:
+            projects_by_group.setdefault(project.group_id, []).append(project)
+
+        members_by_group = {}
+        group_links = []
+        project_links = []
+        for index, member in enumerate(members):
+            group = groups[index // scale["members_per_group"]]
+            members_by_group.setdefault(group.id, []).append(member)
+            group_links.append(Member.group.through(member_id=member.id, group_id=group.id))
+            for project in projects_by_group.get(group.id, []):
+                project_links.append(Member.project.through(member_id=member.id, project_id=project.id))
+        self._bulk(Member.group.through, group_links)
+        self._bulk(Member.project.through, project_links)
+        return members_by_group
+
+    def _seed_sprints(self, groups, scale):
+        today = timezone.now().date()
+        count = scale["sprints_per_group"]
+        return self._bulk(Sprint, [
+            Sprint(
+                name=f"Sprint {i + 1}",
+                start_date=today - timedelta(days=14 * (count - i)),
+                end_date=today - timedelta(days=14 * (count - i - 1)),
+                is_active=(i == count - 1),
+                group=group,
             )
-            # Assign to random groups and projects
-            member.group.set(random.sample(groups, k=random.randint(1, 2)))
-            member.project.set(random.sample(projects, k=random.randint(1, 3)))
-            members.append(member)
-
-        # Tasks
-        tasks = []
-        statuses = ["BACKLOG", "TODO", "IN_PROGRESS", "DONE"]
+            for group in groups
+            for i in range(count)
+        ])
+
+    def _seed_tags(self, groups, members_by_group):
+        rows = [
+            Tag(name=name, group=group, created_by=members_by_group[group.id][0])
+            for group in groups
+            if members_by_group.get(group.id)
+            for name in TAG_NAMES
+        ]
+        tags_by_group = {}
+        for tag in self._bulk(Tag, rows):
+            tags_by_group.setdefault(tag.group_id, []).append(tag.id)
+        return tags_by_group
+
+    def _seed_tasks(self, sprints, members_by_group, tags_by_group, scale):
+        """Tasks are written a batch at a time so memory stays flat at large scales."""
+        rng = self.rng
+        task_ids_by_sprint = {}
+        pending = []
+
+        def flush():
+            tasks = self._bulk(Task, [task for task, _ in pending])
+            member_links = []
+            tag_links = []
+            comments = []
+            status_events = []
+            for task, sprint in zip(tasks, (sprint for _, sprint in pending)):
+                task_ids_by_sprint.setdefault(sprint.id, []).append(task.id)
+                status_events.extend(self._status_events(task, sprint))
+                group_members = members_by_group.get(sprint.group_id, [])
+                for member in rng.sample(group_members, k=min(len(group_members), rng.randint(1, 3))):
+                    member_links.append(Task.member.through(task_id=task.id, member_id=member.id))
+                group_tags = tags_by_group.get(sprint.group_id, [])
+                for tag_id in rng.sample(group_tags, k=min(len(group_tags), rng.randint(0, 2))):
+                    tag_links.append(Task.tags.through(task_id=task.id, tag_id=tag_id))
+                for _ in range(scale["comments_per_task"]):
+                    comments.append(TaskComment(
+                        task_id=task.id,
+                        author=rng.choice(group_members) if group_members else None,
+                        text=rng.choice(self.sentences),
+                    ))
+            self._bulk(Task.member.through, member_links)
+            self._bulk(Task.tags.through, tag_links)
+            self._bulk(TaskComment, comments)
+            self._bulk(TaskStatusEvent, status_events)
+            pending.clear()
+
         for sprint in sprints:
-            for _ in range(random.randint(4, 8)):
-                task = Task.objects.create(
-                    title=fake.sentence(nb_words=6).rstrip('.'),
-                    description=fake.paragraph(),
-                    status=random.choice(statuses),
-                    sprint=sprint,
-                )
-                task.member.set(random.sample(members, k=random.randint(1, 3)))
-                tasks.append(task)
+            creator = (members_by_group.get(sprint.group_id) or [None])[0]
+            for _ in range(scale["tasks_per_sprint"]):
+                estimated = Decimal(rng.randint(1, 16))
+                status = rng.choice(STATUSES)
+                actual = Decimal("0.00")
+                if status == "DONE":
+                    actual = (estimated * Decimal(str(rng.uniform(0.5, 2.0)))).quantize(Decimal("0.01"))
+                pending.append((
+                    Task(
+                        title=rng.choice(self.sentences),
+                        description=rng.choice(self.paragraphs),
+                        status=status,
+                        sprint=sprint,
+                        created_by=creator,
+                        estimated_hours=estimated,
+                        actual_hours=actual,
+                    ),
+                    sprint,
+                ))
+                if len(pending) >= self.batch_size:
+                    flush()
+        if pending:
+            flush()
+        return task_ids_by_sprint
 
-        # Story Point Estimates
+    def _status_events(self, task, sprint):
+        """The task's walk from BACKLOG to its seeded status, spread over the sprint so far."""
+        rng = self.rng
+        start = timezone.make_aware(datetime.combine(sprint.start_date, clock(9)))
+        end = min(timezone.make_aware(datetime.combine(sprint.end_date, clock(17))), timezone.now())
+        steps = STATUSES[:STATUSES.index(task.status) + 1]
+        span = max((end - start).total_seconds(), 0)
+        moved_at = sorted(start + timedelta(seconds=rng.uniform(0, span)) for _ in steps[1:])
+        events = [TaskStatusEvent(task_id=task.id, from_status="", to_status=steps[0], occurred_at=start - timedelta(days=1))]
+        for previous, status, occurred_at in zip(steps, steps[1:], moved_at):
+            events.append(TaskStatusEvent(task_id=task.id, from_status=previous, to_status=status, occurred_at=occurred_at))
+        return events
+
+    def _seed_estimates(self, sprints, members_by_group):
+        rows = []
         for sprint in sprints:
-            for member in random.sample(members, k=4):
-                Story_Point_Estimates.objects.create(
-                    point_estimate=random.choice([1, 2, 3, 5, 8, 13]),
+            group_members = members_by_group.get(sprint.group_id, [])
+            for member in self.rng.sample(group_members, k=min(4, len(group_members))):
+                rows.append(Story_Point_Estimates(
+                    point_estimate=self.rng.choice([1, 2, 3, 5, 8, 13]),
                     sprint=sprint,
                     member=member,
-                )
+                ))
+        self._bulk(Story_Point_Estimates, rows)
 
-        # Sprint Contributions
-        contributions = []
+    def _seed_contributions(self, sprints, members_by_group, task_ids_by_sprint, scale):
+        rng = self.rng
+        rows = []
         for sprint in sprints:
-            for member in random.sample(members, k=random.randint(3, 6)):
-                sprint_tasks = list(sprint.tasks.all())
-                contrib = SprintContribution.objects.create(
+            group_members = members_by_group.get(sprint.group_id, [])
+            k = min(scale["contributions_per_sprint"], len(group_members))
+            for member in rng.sample(group_members, k=k):
+                rows.append(SprintContribution(
                     member=member,
                     sprint=sprint,
-                    description=fake.paragraph(),
-                    story_points=random.choice([1, 2, 3, 5, 8]),
-                    hours_worked=round(random.uniform(2, 40), 2),
-                )
-                if sprint_tasks:
-                    contrib.tasks_handled.set(random.sample(sprint_tasks, k=min(3, len(sprint_tasks))))
-                contributions.append(contrib)
-
-        # Disputes
-        for _ in range(6):
-            raiser, accused = random.sample(members, k=2)
-            sprint = random.choice(sprints)
-            contrib = SprintContribution.objects.filter(member=accused, sprint=sprint).first()
-            dispute = Dispute.objects.create(
-                raised_by=raiser,
-                accused_member=accused,
-                sprint=sprint,
-                contribution=contrib,
-                description=fake.paragraph(),
-                status=random.choice(["OPEN", "UNDER_REVIEW", "RESOLVED", "DISMISSED"]),
-            )
-            sprint_tasks = list(sprint.tasks.all())
-            if sprint_tasks:
-                dispute.tasks_affected.set(random.sample(sprint_tasks, k=min(2, len(sprint_tasks))))
+                    description=rng.choice(self.paragraphs),
+                    story_points=rng.choice([1, 2, 3, 5, 8]),
+                    hours_worked=Decimal(str(round(rng.uniform(2, 40), 2))),
+                ))
+        contributions = self._bulk(SprintContribution, rows)
+
+        links = []
+        for contribution in contributions:
+            sprint_tasks = task_ids_by_sprint.get(contribution.sprint_id, [])
+            for task_id in rng.sample(sprint_tasks, k=min(3, len(sprint_tasks))):
+                links.append(SprintContribution.tasks_handled.through(
+                    sprintcontribution_id=contribution.id, task_id=task_id,
+                ))
+        self._bulk(SprintContribution.tasks_handled.through, links)
+        return contributions
+
+    def _seed_reactions(self, contributions, members_by_group, scale):
+        rng = self.rng
+        rows = []
+        for contribution in contributions:
+            group_id = contribution.sprint.group_id
+            reactors = [m for m in members_by_group.get(group_id, []) if m.id != contribution.member_id]
+            for member in rng.sample(reactors, k=min(scale["reactions_per_contribution"], len(reactors))):
+                rows.append(ContributionReaction(
+                    contribution=contribution,
+                    member=member,
+                    reaction=rng.choice(REACTIONS),
+                ))
+        self._bulk(ContributionReaction, rows)
+        # bulk_create skips the reaction action, so fill the counter columns in one pass.
+        SprintContribution.recount_reactions()
+
+    def _seed_disputes(self, sprints, members_by_group, contributions, task_ids_by_sprint, scale):
+        rng = self.rng
+        contribution_by_pair = {(c.member_id, c.sprint_id): c for c in contributions}
+        rows = []
+        for sprint in sprints:
+            group_members = members_by_group.get(sprint.group_id, [])
+            if len(group_members) < 2:
+                continue
+            for _ in range(scale["disputes_per_sprint"]):
+                raiser, accused = rng.sample(group_members, k=2)
+                rows.append(Dispute(
+                    raised_by=raiser,
+                    accused_member=accused,
+                    sprint=sprint,
+                    contribution=contribution_by_pair.get((accused.id, sprint.id)),
+                    description=rng.choice(self.paragraphs),
+                    status=rng.choice(DISPUTE_STATUSES),
+                ))
+        disputes = self._bulk(Dispute, rows)
 
-        self.stdout.write(self.style.SUCCESS('Done! Database seeded successfully.'))
\ No newline at end of file
+        links = []
+        for dispute in disputes:
+            sprint_tasks = task_ids_by_sprint.get(dispute.sprint_id, [])
+            for task_id in rng.sample(sprint_tasks, k=min(2, len(sprint_tasks))):
+                links.append(Dispute.tasks_affected.through(dispute_id=dispute.id, task_id=task_id))
+        self._bulk(Dispute.tasks_affected.through, links)
@@ -0,0 +1,121 @@
+# myapp/management/commands/stress_reactions.py
+import random
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections
+
+from myapp.models import (
+    REACTION_COUNTER_FIELDS, ContributionReaction, Group, Member, Sprint, SprintContribution
+)
+
+STRESS_ALIAS = "stress_reactions"
+REACTIONS = list(REACTION_COUNTER_FIELDS)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire parallel reaction toggles at a few contributions on a throwaway "
+        "SQLite database, then fail unless every counter column matches the "
+        "ContributionReaction rows and no toggle hit a lock error."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--clicks", type=int, default=300, help="Toggles per thread.")
+        parser.add_argument("--members", type=int, default=6, help="Members clicking (threads share them).")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            connections.settings[STRESS_ALIAS] = dict(
+                connections.settings["default"], NAME=str(Path(tmp_dir) / "stress.sqlite3")
+            )
+            try:
+                call_command("migrate", database=STRESS_ALIAS, verbosity=0)
+                fixtures = self._fixtures(options["members"])
+                connections[STRESS_ALIAS].close()
+                result = self._run(fixtures, options["threads"], options["clicks"])
+                drifted = self._drifted(fixtures["contribution_ids"])
+            finally:
+                connections[STRESS_ALIAS].close()
+                del connections[STRESS_ALIAS]
+                del connections.settings[STRESS_ALIAS]
+
+        self.stdout.write(
+            f"{result['clicks']} toggles from {options['threads']} threads in {result['seconds']:.2f}s, "
+            f"{result['errors']} errors, {len(drifted)} contributions with wrong counts"
+        )
+        for contribution_id, stored, actual in drifted:
+            self.stdout.write(f"  contribution {contribution_id}: stored {stored}, actual {actual}")
+        if result["errors"] or drifted:
+            raise CommandError("Reaction toggles were not applied consistently under concurrency.")
+
+    def _fixtures(self, member_count):
+        db = STRESS_ALIAS
+        group = Group.objects.using(db).create(name="Stress", group_code=1)
+        sprint = Sprint.objects.using(db).create(
+            name="Stress sprint", start_date=date.today(), end_date=date.today() + timedelta(days=14), group=group,
+        )
+        author = Member.objects.using(db).create(name="Author", email="author@stress.local", username="author", password="x")
+        clickers = [
+            Member.objects.using(db).create(
+                name=f"Clicker {i}", email=f"clicker{i}@stress.local", username=f"clicker{i}", password="x",
+            )
+            for i in range(member_count)
+        ]
+        contribution = SprintContribution.objects.using(db).create(member=author, sprint=sprint)
+        return {"contribution_ids": [contribution.id], "member_ids": [member.id for member in clickers]}
+
+    def _worker(self, fixtures, clicks, seed, totals, lock):
+        rng = random.Random(seed)
+        done = errors = 0
+        try:
+            for _ in range(clicks):
+                try:
+                    ContributionReaction.toggle(
+                        rng.choice(fixtures["contribution_ids"]),
+                        rng.choice(fixtures["member_ids"]),
+                        rng.choice(REACTIONS),
+                        using=STRESS_ALIAS,
+                    )
+                    done += 1
+                except OperationalError:
+                    errors += 1
+        finally:
+            connections[STRESS_ALIAS].close()
+            with lock:
+                totals["clicks"] += done
+                totals["errors"] += errors
+
+    def _run(self, fixtures, thread_count, clicks):
+        totals = {"clicks": 0, "errors": 0}
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=self._worker, args=(fixtures, clicks, seed, totals, lock))
+            for seed in range(thread_count)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {**totals, "seconds": time.perf_counter() - started}
+
+    def _drifted(self, contribution_ids):
+        db = STRESS_ALIAS
+        drifted = []
+        for contribution in SprintContribution.objects.using(db).filter(id__in=contribution_ids):
+            stored = contribution.reaction_summary()
+            actual = {reaction: 0 for reaction in REACTIONS}
+            for reaction in ContributionReaction.objects.using(db).filter(contribution=contribution).values_list(
+                "reaction", flat=True
+            ):
+                actual[reaction] += 1
+            if stored != actual:
+                drifted.append((contribution.id, stored, actual))
+        return drifted
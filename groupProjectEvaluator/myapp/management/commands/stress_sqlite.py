@@ -0,0 +1,152 @@
+# myapp/management/commands/stress_sqlite.py
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+from django.test.utils import override_settings
+from django_q.models import OrmQ
+
+from myapp.models import Group, Member, Sprint, SprintContribution, Task, TaskComment
+
+STRESS_ALIAS = "stress_sqlite"
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer a throwaway SQLite database with concurrent writers (task "
+        "read-modify-write, comment inserts, F() updates and broker-style queue "
+        "churn) and fail if any 'database is locked' errors occur. --baseline "
+        "runs the same load with SQLite's default settings for comparison."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--ops", type=int, default=300, help="Operations per thread.")
+        parser.add_argument("--baseline", action="store_true", help="Use SQLite defaults instead of the tuned settings.")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_settings = dict(connections.settings["default"], NAME=str(Path(tmp_dir) / "stress.sqlite3"))
+            pragma_override = {}
+            if options["baseline"]:
+                db_settings["OPTIONS"] = {}
+                pragma_override = {"SQLITE_PRAGMAS": {}}
+
+            with override_settings(**pragma_override):
+                connections.settings[STRESS_ALIAS] = db_settings
+                try:
+                    call_command("migrate", database=STRESS_ALIAS, verbosity=0)
+                    # DjangoQRouter keeps django_q off non-queue aliases; the broker table is
+                    # created directly so queue churn contends for the same write lock.
+                    with connections[STRESS_ALIAS].schema_editor() as editor:
+                        editor.create_model(OrmQ)
+                    fixtures = self._fixtures()
+                    connections[STRESS_ALIAS].close()
+                    result = self._run(fixtures, options["threads"], options["ops"])
+                finally:
+                    connections[STRESS_ALIAS].close()
+                    del connections[STRESS_ALIAS]
+                    del connections.settings[STRESS_ALIAS]
+
+        mode = "baseline (SQLite defaults)" if options["baseline"] else "tuned"
+        self.stdout.write(
+            f"{mode}: {result['ops']} ops from {options['threads']} threads in {result['seconds']:.2f}s "
+            f"({result['ops'] / result['seconds']:.0f} ops/s), p95 {result['p95_ms']:.1f}ms, "
+            f"{result['locked']} lock errors, {result['other_errors']} other errors"
+        )
+        if result["locked"] and not options["baseline"]:
+            raise CommandError(f"{result['locked']} 'database is locked' errors under concurrent writes.")
+
+    def _fixtures(self):
+        db = STRESS_ALIAS
+        group = Group.objects.using(db).create(name="Stress", group_code=1)
+        sprint = Sprint.objects.using(db).create(
+            name="Stress sprint", start_date=date.today(), end_date=date.today() + timedelta(days=14), group=group,
+        )
+        members = [
+            Member.objects.using(db).create(
+                name=f"Writer {i}", email=f"writer{i}@stress.local", username=f"writer{i}", password="x",
+            )
+            for i in range(4)
+        ]
+        contributions = [
+            SprintContribution.objects.using(db).create(member=member, sprint=sprint) for member in members
+        ]
+        tasks = Task.objects.using(db).bulk_create([Task(title=f"Task {i}", sprint=sprint) for i in range(50)])
+        return {
+            "task_ids": [task.id for task in tasks],
+            "member_ids": [member.id for member in members],
+            "contribution_ids": [contribution.id for contribution in contributions],
+        }
+
+    def _worker(self, fixtures, ops, seed, latencies, errors, lock):
+        db = STRESS_ALIAS
+        rng = random.Random(seed)
+        local_latencies = []
+        local_errors = {"locked": 0, "other": 0}
+        try:
+            for _ in range(ops):
+                operation = rng.choice(("read_modify_write", "comment", "f_update", "queue"))
+                started = time.perf_counter()
+                try:
+                    if operation == "read_modify_write":
+                        with transaction.atomic(using=db):
+                            task = Task.objects.using(db).get(id=rng.choice(fixtures["task_ids"]))
+                            task.actual_hours = task.actual_hours + Decimal("0.25")
+                            task.save(using=db, update_fields=["actual_hours", "updated_at"])
+                    elif operation == "comment":
+                        TaskComment.objects.using(db).create(
+                            task_id=rng.choice(fixtures["task_ids"]),
+                            author_id=rng.choice(fixtures["member_ids"]),
+                            text="stress",
+                        )
+                    elif operation == "f_update":
+                        SprintContribution.objects.using(db).filter(
+                            id=rng.choice(fixtures["contribution_ids"])
+                        ).update(hours_worked=F("hours_worked") + 1)
+                    else:
+                        with transaction.atomic(using=db):
+                            package = OrmQ.objects.using(db).create(key="stress", payload="x", lock=None)
+                            OrmQ.objects.using(db).filter(id=package.id).delete()
+                except OperationalError as exc:
+                    local_errors["locked" if "locked" in str(exc) else "other"] += 1
+                    continue
+                local_latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            connections[db].close()
+            with lock:
+                latencies.extend(local_latencies)
+                errors["locked"] += local_errors["locked"]
+                errors["other"] += local_errors["other"]
+
+    def _run(self, fixtures, thread_count, ops):
+        latencies = []
+        errors = {"locked": 0, "other": 0}
+        lock = threading.Lock()
+        threads = [
+            threading.Thread(target=self._worker, args=(fixtures, ops, seed, latencies, errors, lock))
+            for seed in range(thread_count)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started
+
+        return {
+            "ops": len(latencies),
+            "seconds": seconds,
+            "p95_ms": statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0.0,
+            "locked": errors["locked"],
+            "other_errors": errors["other"],
+        }
@@ -0,0 +1,24 @@
+# myapp/management/commands/sync_replica.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.replica import replica_alias, sync_replica
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database into the read replica (once, or every --interval seconds)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0, help="Keep syncing every N seconds.")
+
+    def handle(self, *args, **options):
+        if replica_alias() is None:
+            raise CommandError("No read replica is configured (set REPLICA_DB_PATH).")
+
+        while True:
+            elapsed = sync_replica()
+            self.stdout.write(f"Replica synced in {elapsed * 1000:.0f}ms.")
+            if not options["interval"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,24 @@
+# myapp/management/commands/sync_schedules.py
+from django.core.management.base import BaseCommand
+
+from myapp.schedules import sync_schedules
+
+
+class Command(BaseCommand):
+    help = (
+        "Make django_q's Schedule table match the jobs declared in myapp/schedules.py: "
+        "create or update them by name and delete recurring myapp schedules that are no "
+        "longer declared. Idempotent; run it on deploy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Show what would change without writing.")
+        parser.add_argument("--keep-undeclared", action="store_true", help="Don't delete undeclared schedules.")
+
+    def handle(self, *args, **options):
+        changes = sync_schedules(dry_run=options["dry_run"], prune=not options["keep_undeclared"])
+        for name, change in changes:
+            self.stdout.write(f"{change:>9}  {name}")
+        changed = sum(1 for _, change in changes if change != "unchanged")
+        suffix = " (dry run, nothing written)" if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(f"{changed} schedule(s) changed{suffix}."))
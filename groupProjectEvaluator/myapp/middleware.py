@@ -0,0 +1,124 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .instrumentation import end_request, query_timer, resume_request, start_request
+from .metrics import REQUEST_DURATION, REQUEST_QUERIES
+
+logger = logging.getLogger("myapp.perf")
+
+
+class PerformanceMiddleware:
+    """
+    Times each request and reports wall, DB and outbound (Gemini/GitHub) time
+    in a Server-Timing header, and feeds the per-view latency and query-count
+    histograms served at /api/metrics/. Requests slower than SLOW_REQUEST_MS
+    are logged as one JSON line, with query fingerprints when the request was
+    sampled. Streamed responses are recorded once their body has been sent,
+    so queries made while streaming count too. Disabled entirely (no per-request cost) when
+    PERF_INSTRUMENTATION["ENABLED"] is false.
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, "PERF_INSTRUMENTATION", {})
+        if not config.get("ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_request_ms = config.get("SLOW_REQUEST_MS", 500)
+        self.query_sample_rate = config.get("QUERY_SAMPLE_RATE", 0.1)
+        self.max_fingerprints = config.get("MAX_FINGERPRINTS", 5)
+        self.server_timing = config.get("SERVER_TIMING", True)
+
+    def __call__(self, request):
+        stats, token = start_request(sample_queries=random.random() < self.query_sample_rate)
+        started = time.perf_counter()
+        try:
+            with self._timing_queries():
+                response = self.get_response(request)
+        finally:
+            end_request(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        # Headers go out before a streamed body, so Server-Timing covers the view only.
+        if self.server_timing:
+            response["Server-Timing"] = self._server_timing(stats, total_ms)
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._measure_stream(
+                request, response, response.streaming_content, stats, started
+            )
+        else:
+            self._record(request, response, stats, total_ms)
+        return response
+
+    @contextmanager
+    def _timing_queries(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(query_timer))
+            yield
+
+    def _measure_stream(self, request, response, content, stats, started):
+        # Each chunk is produced under the request's stats, which are only
+        # set while that chunk is being pulled.
+        content = iter(content)
+        try:
+            while True:
+                with resume_request(stats), self._timing_queries():
+                    chunk = next(content, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self._record(request, response, stats, (time.perf_counter() - started) * 1000)
+
+    def _record(self, request, response, stats, total_ms):
+        view, action = self._view_and_action(request, response)
+        REQUEST_DURATION.observe(
+            total_ms / 1000, view=view, action=action, method=request.method, status=response.status_code
+        )
+        REQUEST_QUERIES.observe(stats.db_queries, view=view, action=action)
+        if total_ms >= self.slow_request_ms:
+            self._log_slow_request(request, response, stats, total_ms)
+
+    def _view_and_action(self, request, response):
+        # DRF responses carry the view instance, which knows its viewset action.
+        view = (getattr(response, "renderer_context", None) or {}).get("view")
+        if view is not None:
+            return type(view).__name__, getattr(view, "action", None) or request.method.lower()
+        match = getattr(request, "resolver_match", None)
+        return (match.view_name if match else "unmatched"), request.method.lower()
+
+    def _server_timing(self, stats, total_ms):
+        metrics = [
+            f"app;dur={total_ms:.1f}",
+            f'db;dur={stats.db_ms:.1f};desc="{stats.db_queries} queries"',
+        ]
+        for service, (count, ms) in sorted(stats.external.items()):
+            metrics.append(f'{service};dur={ms:.1f};desc="{count} calls"')
+        return ", ".join(metrics)
+
+    def _log_slow_request(self, request, response, stats, total_ms):
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "event": "slow_request",
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 1),
+            "db_ms": round(stats.db_ms, 1),
+            "db_queries": stats.db_queries,
+            "external": {
+                service: {"calls": count, "ms": round(ms, 1)}
+                for service, (count, ms) in stats.external.items()
+            },
+        }
+        if stats.fingerprints is not None:
+            record["top_queries"] = stats.top_fingerprints(self.max_fingerprints)
+        logger.warning(json.dumps(record))
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0013_tag_task_tags'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(fields=['status'], name='dispute_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(fields=['sprint', 'status'], name='dispute_sprint_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(condition=models.Q(('status__in', ['OPEN', 'UNDER_REVIEW'])), fields=['accused_member'], name='dispute_open_accused_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(fields=['group', 'is_active'], name='sprint_group_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(fields=['end_date'], name='sprint_end_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprintcontribution',
+            index=models.Index(fields=['sprint', 'member'], name='contrib_sprint_member_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['sprint', 'status', '-updated_at'], name='task_sprint_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status'], name='task_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_estimation_outlier', True)), fields=['sprint'], name='task_outlier_sprint_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcomment',
+            index=models.Index(fields=['task', 'created_at'], name='taskcomment_task_created_idx'),
+        ),
+    ]
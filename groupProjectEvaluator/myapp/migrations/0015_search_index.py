@@ -0,0 +1,71 @@
+from django.db import migrations
+
+# The SQL is frozen here as it was when this migration was written; later
+# changes to the triggers go in new migrations, not in myapp.search.
+
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS myapp_search USING fts5(group_id UNINDEXED, title, body, tokenize = 'porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS myapp_task_search_ai AFTER INSERT ON myapp_task BEGIN INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 0, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), NEW.title, NEW.description || ' ' || NEW.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_task_search_au AFTER UPDATE OF title, description, requirements, sprint_id ON myapp_task BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 0; INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 0, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), NEW.title, NEW.description || ' ' || NEW.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_task_search_ad AFTER DELETE ON myapp_task BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 0; END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_taskcomment_search_ai AFTER INSERT ON myapp_taskcomment BEGIN INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = NEW.task_id), '', NEW.text); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_taskcomment_search_au AFTER UPDATE OF text, task_id ON myapp_taskcomment BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 1; INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = NEW.task_id), '', NEW.text); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_taskcomment_search_ad AFTER DELETE ON myapp_taskcomment BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 1; END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_sprintcontribution_search_ai AFTER INSERT ON myapp_sprintcontribution BEGIN INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 2, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), '', NEW.description); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_sprintcontribution_search_au AFTER UPDATE OF description, sprint_id ON myapp_sprintcontribution BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 2; INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 2, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), '', NEW.description); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_sprintcontribution_search_ad AFTER DELETE ON myapp_sprintcontribution BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 2; END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_dispute_search_ai AFTER INSERT ON myapp_dispute BEGIN INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 3, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), '', NEW.description); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_dispute_search_au AFTER UPDATE OF description, sprint_id ON myapp_dispute BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 3; INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 3, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), '', NEW.description); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_dispute_search_ad AFTER DELETE ON myapp_dispute BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 3; END",
+]
+
+REBUILD_SQL = [
+    "DELETE FROM myapp_search",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 0, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), src.title, src.description || ' ' || src.requirements FROM myapp_task src",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = src.task_id), '', src.text FROM myapp_taskcomment src",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 2, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), '', src.description FROM myapp_sprintcontribution src",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 3, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), '', src.description FROM myapp_dispute src",
+    "INSERT INTO myapp_search(myapp_search) VALUES ('optimize')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS myapp_task_search_ai",
+    "DROP TRIGGER IF EXISTS myapp_task_search_au",
+    "DROP TRIGGER IF EXISTS myapp_task_search_ad",
+    "DROP TRIGGER IF EXISTS myapp_taskcomment_search_ai",
+    "DROP TRIGGER IF EXISTS myapp_taskcomment_search_au",
+    "DROP TRIGGER IF EXISTS myapp_taskcomment_search_ad",
+    "DROP TRIGGER IF EXISTS myapp_sprintcontribution_search_ai",
+    "DROP TRIGGER IF EXISTS myapp_sprintcontribution_search_au",
+    "DROP TRIGGER IF EXISTS myapp_sprintcontribution_search_ad",
+    "DROP TRIGGER IF EXISTS myapp_dispute_search_ai",
+    "DROP TRIGGER IF EXISTS myapp_dispute_search_au",
+    "DROP TRIGGER IF EXISTS myapp_dispute_search_ad",
+    "DROP TABLE IF EXISTS myapp_search",
+]
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite-only; other backends get no index and /search/ reports it.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in CREATE_SQL + REBUILD_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0014_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
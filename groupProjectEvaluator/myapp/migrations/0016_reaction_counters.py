@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:16
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+COUNTER_FIELDS = {
+    "LOOKS_GOOD": "looks_good_count",
+    "NEEDS_CLARIFICATION": "needs_clarification_count",
+    "NEEDS_MORE_DETAIL": "needs_more_detail_count",
+    "GREAT_PROGRESS": "great_progress_count",
+}
+
+
+def backfill_reaction_counts(apps, schema_editor):
+    SprintContribution = apps.get_model("myapp", "SprintContribution")
+    ContributionReaction = apps.get_model("myapp", "ContributionReaction")
+    SprintContribution.objects.update(**{
+        field: Coalesce(
+            Subquery(
+                ContributionReaction.objects.filter(contribution_id=OuterRef("pk"), reaction=reaction)
+                .values("contribution_id")
+                .annotate(total=Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+        for reaction, field in COUNTER_FIELDS.items()
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0015_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sprintcontribution',
+            name='great_progress_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='sprintcontribution',
+            name='looks_good_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='sprintcontribution',
+            name='needs_clarification_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='sprintcontribution',
+            name='needs_more_detail_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_reaction_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0016_reaction_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskEstimator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('features', models.JSONField(default=list)),
+                ('coefficients', models.JSONField(default=list)),
+                ('trained_on', models.IntegerField(default=0)),
+                ('rmse', models.FloatField(default=0.0)),
+                ('fitted_at', models.DateTimeField(auto_now=True)),
+                ('group', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='task_estimator', to='myapp.group')),
+            ],
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:35
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0017_task_estimator'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreRefresh',
+            fields=[
+                ('sprint', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score_refresh', serialize=False, to='myapp.sprint')),
+                ('queued_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MemberSprintScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('story_points', models.IntegerField(default=0)),
+                ('hours_worked', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=8)),
+                ('positive_reactions', models.PositiveIntegerField(default=0)),
+                ('negative_reactions', models.PositiveIntegerField(default=0)),
+                ('tasks_assigned', models.PositiveIntegerField(default=0)),
+                ('tasks_done', models.PositiveIntegerField(default=0)),
+                ('estimation_accuracy', models.FloatField(blank=True, null=True)),
+                ('disputes_upheld', models.PositiveIntegerField(default=0)),
+                ('disputes_pending', models.PositiveIntegerField(default=0)),
+                ('disputes_dismissed', models.PositiveIntegerField(default=0)),
+                ('contribution_score', models.FloatField(default=0.0)),
+                ('peer_score', models.FloatField(default=0.0)),
+                ('delivery_score', models.FloatField(default=0.0)),
+                ('accuracy_score', models.FloatField(default=0.0)),
+                ('dispute_penalty', models.FloatField(default=0.0)),
+                ('score', models.FloatField(default=0.0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_scores', to='myapp.group')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sprint_scores', to='myapp.member')),
+                ('sprint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='member_scores', to='myapp.sprint')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', 'sprint'], name='score_group_sprint_idx'), models.Index(fields=['sprint'], name='score_sprint_idx')],
+                'unique_together': {('member', 'sprint')},
+            },
+        ),
+    ]
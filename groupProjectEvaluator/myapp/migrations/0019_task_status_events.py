@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_status_events(apps, schema_editor):
+    # Only the current status is known for existing tasks: assume each was
+    # created in BACKLOG and, if it has moved since, moved at its last update.
+    # Two INSERT ... SELECTs keep this one statement each at any table size.
+    Task = apps.get_model("myapp", "Task")
+    TaskStatusEvent = apps.get_model("myapp", "TaskStatusEvent")
+    quote = schema_editor.quote_name
+    events, tasks = quote(TaskStatusEvent._meta.db_table), quote(Task._meta.db_table)
+    columns = "task_id, from_status, to_status, occurred_at"
+    schema_editor.execute(
+        f"INSERT INTO {events} ({columns}) SELECT id, '', 'BACKLOG', created_at FROM {tasks}"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {events} ({columns}) "
+        f"SELECT id, 'BACKLOG', status, updated_at FROM {tasks} WHERE status <> 'BACKLOG'"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0018_member_sprint_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('BACKLOG', 'Backlog'), ('TODO', 'To-Do'), ('IN_PROGRESS', 'In Progress'), ('DONE', 'Done')], default='', max_length=20)),
+                ('to_status', models.CharField(choices=[('BACKLOG', 'Backlog'), ('TODO', 'To-Do'), ('IN_PROGRESS', 'In Progress'), ('DONE', 'Done')], max_length=20)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='myapp.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'occurred_at'], name='status_event_task_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_status_events, migrations.RunPython.noop),
+    ]
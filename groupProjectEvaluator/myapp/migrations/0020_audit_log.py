@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:40
+
+import django.db.models.deletion
+import django.utils.timezone
+import myapp.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0019_task_status_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(choices=[('UPDATE', 'Update'), ('STATUS', 'Status change'), ('DELETE', 'Delete')], max_length=20)),
+                ('target_type', models.CharField(max_length=50)),
+                ('target_id', models.IntegerField()),
+                ('changes', models.JSONField(default=dict, encoder=myapp.models.CompactJSONEncoder)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='audit_entries', to='myapp.member')),
+                ('group', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='audit_entries', to='myapp.group')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', '-created_at'], name='audit_group_created_idx'), models.Index(fields=['target_type', 'target_id'], name='audit_target_idx')],
+            },
+        ),
+    ]
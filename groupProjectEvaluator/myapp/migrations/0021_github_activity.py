@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0020_audit_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GitHubActivity',
+            fields=[
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='github_activity', serialize=False, to='myapp.member')),
+                ('username', models.CharField(max_length=100)),
+                ('data', models.JSONField(default=dict)),
+                ('fetched_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_auto_disputes(apps, schema_editor):
+    # Disputes opened by flag_overdue_tasks_as_disputes before auto_task
+    # existed are recognised by their description. Where overlapping runs
+    # opened duplicates, only the oldest unresolved one per (task, member) is
+    # linked, so the new constraint holds; the rest stay ordinary disputes.
+    Dispute = apps.get_model("myapp", "Dispute")
+    rows = (
+        Dispute.tasks_affected.through.objects.filter(dispute__description__startswith="Auto-generated: Task")
+        .order_by("dispute_id")
+        .values_list("dispute_id", "task_id", "dispute__accused_member_id", "dispute__status")
+    )
+    open_pairs = set()
+    by_task = {}
+    for dispute_id, task_id, member_id, status in rows:
+        if status in ("OPEN", "UNDER_REVIEW"):
+            if (task_id, member_id) in open_pairs:
+                continue
+            open_pairs.add((task_id, member_id))
+        by_task.setdefault(task_id, []).append(dispute_id)
+    for task_id, dispute_ids in by_task.items():
+        Dispute.objects.filter(id__in=dispute_ids).update(auto_task_id=task_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0021_github_activity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobLease',
+            fields=[
+                ('name', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('owner', models.CharField(max_length=200)),
+                ('acquired_at', models.DateTimeField()),
+                ('heartbeat_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='dispute',
+            name='auto_task',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='auto_disputes', to='myapp.task'),
+        ),
+        migrations.RunPython(link_auto_disputes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dispute',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['OPEN', 'UNDER_REVIEW'])), fields=('auto_task', 'accused_member'), name='dispute_open_auto_unique'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# Frozen SQL: re-index a task's comments when the task moves sprint, then
+# rebuild so comments already indexed under the wrong group are corrected.
+
+CREATE_SQL = [
+    "CREATE TRIGGER IF NOT EXISTS myapp_task_search_sprint_id_au AFTER UPDATE OF sprint_id ON myapp_task WHEN OLD.sprint_id IS NOT NEW.sprint_id BEGIN DELETE FROM myapp_search WHERE rowid IN (SELECT id * 4 + 1 FROM myapp_taskcomment WHERE task_id = NEW.id); INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = src.task_id), '', src.text FROM myapp_taskcomment src WHERE src.task_id = NEW.id; END",
+]
+
+REBUILD_SQL = [
+    "DELETE FROM myapp_search",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 0, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), src.title, src.description || ' ' || src.requirements FROM myapp_task src",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = src.task_id), '', src.text FROM myapp_taskcomment src",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 2, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), '', src.description FROM myapp_sprintcontribution src",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 3, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), '', src.description FROM myapp_dispute src",
+    "INSERT INTO myapp_search(myapp_search) VALUES ('optimize')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS myapp_task_search_sprint_id_au",
+]
+
+
+def add_comment_reindex_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in CREATE_SQL + REBUILD_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+def drop_comment_reindex_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0022_lease_lock_and_auto_dispute_uniqueness'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_comment_reindex_trigger, drop_comment_reindex_trigger),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:05
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+def drop_duplicate_fallbacks(apps, schema_editor):
+    # Overlapping refits could each create an all-groups row; keep the
+    # most recently fitted one so the constraint can be added.
+    TaskEstimator = apps.get_model("myapp", "TaskEstimator")
+    fallbacks = TaskEstimator.objects.filter(group__isnull=True).order_by("-fitted_at", "-id")
+    keep = fallbacks.values_list("id", flat=True).first()
+    if keep is not None:
+        fallbacks.exclude(id=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0023_search_reindex_moved_task_comments'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_fallbacks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='taskestimator',
+            constraint=models.UniqueConstraint(django.db.models.functions.comparison.Coalesce('group', models.Value(0)), condition=models.Q(('group__isnull', True)), name='task_estimator_one_fallback'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# Frozen SQL. Moving a sprint to another group re-indexes everything scoped
+# through it. Every trigger is (re)created: 0016 rebuilt
+# myapp_sprintcontribution to add the reaction counters, which dropped its
+# search triggers. The rebuild corrects rows indexed while they were missing.
+
+CREATE_SQL = [
+    "DROP TRIGGER IF EXISTS myapp_task_search_sprint_id_au",
+    "CREATE TRIGGER IF NOT EXISTS myapp_task_search_ai AFTER INSERT ON myapp_task BEGIN INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 0, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), NEW.title, NEW.description || ' ' || NEW.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_task_search_au AFTER UPDATE OF title, description, requirements, sprint_id ON myapp_task BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 0; INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 0, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), NEW.title, NEW.description || ' ' || NEW.requirements); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_task_search_ad AFTER DELETE ON myapp_task BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 0; END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_taskcomment_search_ai AFTER INSERT ON myapp_taskcomment BEGIN INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = NEW.task_id), '', NEW.text); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_taskcomment_search_au AFTER UPDATE OF text, task_id ON myapp_taskcomment BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 1; INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = NEW.task_id), '', NEW.text); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_taskcomment_search_ad AFTER DELETE ON myapp_taskcomment BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 1; END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_sprintcontribution_search_ai AFTER INSERT ON myapp_sprintcontribution BEGIN INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 2, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), '', NEW.description); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_sprintcontribution_search_au AFTER UPDATE OF description, sprint_id ON myapp_sprintcontribution BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 2; INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 2, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), '', NEW.description); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_sprintcontribution_search_ad AFTER DELETE ON myapp_sprintcontribution BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 2; END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_dispute_search_ai AFTER INSERT ON myapp_dispute BEGIN INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 3, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), '', NEW.description); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_dispute_search_au AFTER UPDATE OF description, sprint_id ON myapp_dispute BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 3; INSERT INTO myapp_search(rowid, group_id, title, body) VALUES (NEW.id * 4 + 3, (SELECT group_id FROM myapp_sprint WHERE id = NEW.sprint_id), '', NEW.description); END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_dispute_search_ad AFTER DELETE ON myapp_dispute BEGIN DELETE FROM myapp_search WHERE rowid = OLD.id * 4 + 3; END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_task_search_sprint_id_au AFTER UPDATE OF sprint_id ON myapp_task WHEN OLD.sprint_id IS NOT NEW.sprint_id BEGIN DELETE FROM myapp_search WHERE rowid IN (SELECT src.id * 4 + 1 FROM myapp_taskcomment src WHERE src.task_id = NEW.id); INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = src.task_id), '', src.text FROM myapp_taskcomment src WHERE src.task_id = NEW.id; END",
+    "CREATE TRIGGER IF NOT EXISTS myapp_sprint_search_group_id_au AFTER UPDATE OF group_id ON myapp_sprint WHEN OLD.group_id IS NOT NEW.group_id BEGIN DELETE FROM myapp_search WHERE rowid IN (SELECT src.id * 4 + 0 FROM myapp_task src WHERE src.sprint_id = NEW.id); INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 0, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), src.title, src.description || ' ' || src.requirements FROM myapp_task src WHERE src.sprint_id = NEW.id; DELETE FROM myapp_search WHERE rowid IN (SELECT src.id * 4 + 1 FROM myapp_taskcomment src WHERE src.task_id IN (SELECT id FROM myapp_task WHERE sprint_id = NEW.id)); INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = src.task_id), '', src.text FROM myapp_taskcomment src WHERE src.task_id IN (SELECT id FROM myapp_task WHERE sprint_id = NEW.id); DELETE FROM myapp_search WHERE rowid IN (SELECT src.id * 4 + 2 FROM myapp_sprintcontribution src WHERE src.sprint_id = NEW.id); INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 2, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), '', src.description FROM myapp_sprintcontribution src WHERE src.sprint_id = NEW.id; DELETE FROM myapp_search WHERE rowid IN (SELECT src.id * 4 + 3 FROM myapp_dispute src WHERE src.sprint_id = NEW.id); INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 3, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), '', src.description FROM myapp_dispute src WHERE src.sprint_id = NEW.id; END",
+]
+
+REBUILD_SQL = [
+    "DELETE FROM myapp_search",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 0, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), src.title, src.description || ' ' || src.requirements FROM myapp_task src",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 1, (SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = src.task_id), '', src.text FROM myapp_taskcomment src",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 2, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), '', src.description FROM myapp_sprintcontribution src",
+    "INSERT INTO myapp_search(rowid, group_id, title, body) SELECT src.id * 4 + 3, (SELECT group_id FROM myapp_sprint WHERE id = src.sprint_id), '', src.description FROM myapp_dispute src",
+    "INSERT INTO myapp_search(myapp_search) VALUES ('optimize')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS myapp_sprint_search_group_id_au",
+]
+
+
+def add_sprint_reindex_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in CREATE_SQL + REBUILD_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+def drop_sprint_reindex_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_SQL:
+        schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0024_task_estimator_one_fallback'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_sprint_reindex_trigger, drop_sprint_reindex_trigger),
+    ]
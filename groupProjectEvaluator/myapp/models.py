@@ -1,11 +1,16 @@
+import json
 import logging
 from decimal import Decimal
 
-import google.generativeai as genai
-from django.conf import settings
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.utils import timezone
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from . import llm
+from .metrics import timed_job
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +27,19 @@ class Sprint(models.Model):
         related_name="sprints",
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["group", "is_active"], name="sprint_group_active_idx"),
+            models.Index(fields=["end_date"], name="sprint_end_date_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets invalidate_velocity_on_sprint_change clear the group a sprint moved out of.
+        instance._loaded_group_id = instance.__dict__.get("group_id")
+        return instance
+
     def __str__(self):
         return self.name
 
@@ -169,9 +187,58 @@ class Task(models.Model):
     is_estimation_outlier = models.BooleanField(default=False)
     estimation_analysis = models.TextField(blank=True, default="")
 
+    class Meta:
+        indexes = [
+            # Sprint board columns and the overdue-task job.
+            models.Index(fields=["sprint", "status", "-updated_at"], name="task_sprint_status_idx"),
+            models.Index(fields=["status"], name="task_status_idx"),
+            # Instructor dashboard only ever counts flagged tasks.
+            models.Index(
+                fields=["sprint"],
+                name="task_outlier_sprint_idx",
+                condition=models.Q(is_estimation_outlier=True),
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # What the row held when loaded, so record_status_change can tell a
+        # status transition from any other save. Absent when deferred.
+        instance._loaded_status = instance.__dict__.get("status")
+        instance._loaded_sprint_id = instance.__dict__.get("sprint_id")
+        return instance
+
     def __str__(self):
         return self.title
-        
+
+
+class TaskStatusEvent(models.Model):
+    """
+    Append-only log of task status transitions, written by the
+    record_status_change signal on every save that changes Task.status
+    (from_status is blank for the task's creation). Burndown and
+    cumulative-flow series are replayed from it in myapp.analytics.
+    """
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="status_events")
+    from_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES, blank=True, default="")
+    to_status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    occurred_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "occurred_at"], name="status_event_task_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Task status events are append-only.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.task_id}: {self.from_status or '-'} -> {self.to_status}"
+
+
 class TaskComment(models.Model):
     task = models.ForeignKey(
         Task,
@@ -191,6 +258,9 @@ class TaskComment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["task", "created_at"], name="taskcomment_task_created_idx"),
+        ]
 
     def __str__(self):
         return f"Comment on {self.task.title}"
@@ -228,6 +298,14 @@ class Discrepancy(models.Model):
     # negative one means no user contribution
     user_contribution = models.IntegerField(default=-1)
 
+# ContributionReaction.reaction -> the SprintContribution column counting it.
+REACTION_COUNTER_FIELDS = {
+    "LOOKS_GOOD": "looks_good_count",
+    "NEEDS_CLARIFICATION": "needs_clarification_count",
+    "NEEDS_MORE_DETAIL": "needs_more_detail_count",
+    "GREAT_PROGRESS": "great_progress_count",
+}
+
 class SprintContribution(models.Model):
     member = models.ForeignKey(
         Member,
@@ -247,9 +325,62 @@ class SprintContribution(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     has_overlapping_contributions = models.BooleanField(default=False)
 
+    # Denormalized reaction counts so listing contributions never loads the
+    # reaction rows. Adjusted with F() by adjust_reaction_counts; the
+    # reconcile_reaction_counts command repairs any drift.
+    looks_good_count = models.PositiveIntegerField(default=0)
+    needs_clarification_count = models.PositiveIntegerField(default=0)
+    needs_more_detail_count = models.PositiveIntegerField(default=0)
+    great_progress_count = models.PositiveIntegerField(default=0)
+
+    def save(self, *args, **kwargs):
+        # An ordinary save of a loaded row must not write the counters back:
+        # the in-memory values may be stale and would undo concurrent F()
+        # adjustments. Pass update_fields explicitly to write them.
+        if not self._state.adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in REACTION_COUNTER_FIELDS.values()
+            ]
+        super().save(*args, **kwargs)
+
+    def reaction_summary(self):
+        return {reaction: getattr(self, field) for reaction, field in REACTION_COUNTER_FIELDS.items()}
+
+    @classmethod
+    def adjust_reaction_counts(cls, contribution_id, added=None, removed=None, using="default"):
+        """Move one count from the removed reaction to the added one, in a single UPDATE."""
+        changes = {}
+        if removed:
+            field = REACTION_COUNTER_FIELDS[removed]
+            changes[field] = models.F(field) - 1
+        if added:
+            field = REACTION_COUNTER_FIELDS[added]
+            changes[field] = models.F(field) + 1
+        if changes:
+            cls.objects.using(using).filter(id=contribution_id).update(**changes)
+
+    @classmethod
+    def recount_reactions(cls, queryset=None):
+        """Recompute every counter column from ContributionReaction rows in one UPDATE."""
+        counts = {
+            field: Coalesce(
+                models.Subquery(
+                    ContributionReaction.objects.filter(contribution_id=models.OuterRef("pk"), reaction=reaction)
+                    .values("contribution_id")
+                    .annotate(total=models.Count("id"))
+                    .values("total")
+                ),
+                0,
+            )
+            for reaction, field in REACTION_COUNTER_FIELDS.items()
+        }
+        return (queryset if queryset is not None else cls.objects.all()).update(**counts)
+
     # go through each sprint contribution for this sprint
     # and flag the sprint if the contributions have overlapping information
-    def is_overlapping(self):
+    def is_overlapping(self, fail_open=True):
         contributions = SprintContribution.objects.filter(sprint=self.sprint).exclude(member=self.member)
 
         if not contributions.exists():
@@ -261,10 +392,6 @@ class SprintContribution(models.Model):
         if not other_descriptions or not self.description:
             return False
 
-        # Ask Gemini to evaluate semantic overlap
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-
         prompt = f"""
         You are reviewing sprint contributions for a software team.
 
@@ -281,17 +408,22 @@ class SprintContribution(models.Model):
         {json.dumps(other_descriptions, indent=2)}
         """
         try:
-            response = model.generate_content(prompt)
-            raw = response.text.strip().removeprefix("```json").removesuffix("```").strip()
-            result = json.loads(raw)
-            return result.get("overlapping", False)
-        except (json.JSONDecodeError, Exception) as e:
+            result = llm.parse_json(llm.generate(prompt))
+            return bool(result.get("overlapping", False))
+        except (llm.LLMError, ValueError, AttributeError) as e:
+            if not fail_open:
+                # The caller would rather know the answer is unknown than read it as "no overlap".
+                raise llm.LLMError(f"Overlap check failed for contribution {self.pk}: {e}") from e
             # Fail open — don't block on API errors
-            print(f"Gemini overlap check failed: {e}")
+            logger.warning("Overlap check failed for contribution %s: %s", self.pk, e)
             return False
 
     class Meta:
         unique_together = ("member", "sprint")
+        indexes = [
+            # unique_together leads with member; sprint-scoped lookups need their own index.
+            models.Index(fields=["sprint", "member"], name="contrib_sprint_member_idx"),
+        ]
 
     def __str__(self):
         return f"{self.member} – Sprint {self.sprint}"
@@ -325,6 +457,56 @@ class ContributionReaction(models.Model):
     def __str__(self):
         return f"{self.member} reacted {self.reaction} to {self.contribution}"
 
+    @classmethod
+    def toggle(cls, contribution_id, member_id, reaction, using="default"):
+        """
+        Set the member's reaction, or clear it when it is already `reaction`,
+        and move the contribution's counters to match. Returns the new
+        reaction_summary and the member's current reaction (None when cleared).
+
+        What keeps the counters right under parallel clicks: on SQLite the
+        transaction takes the write lock at BEGIN (transaction_mode IMMEDIATE),
+        so toggles run one after another and each reads the previous reaction
+        it then replaces; select_for_update() is a no-op there and only does
+        the same job on backends with row locks. The counters move by an F()
+        UPDATE, so they never depend on values read in Python.
+        Raises SprintContribution.DoesNotExist, or IntegrityError on commit when
+        the member does not exist.
+        """
+        with transaction.atomic(using=using):
+            counts = (
+                SprintContribution.objects.using(using)
+                .select_for_update()
+                .filter(id=contribution_id)
+                .values("sprint_id", *REACTION_COUNTER_FIELDS.values())
+                .get()
+            )
+            mine = cls.objects.using(using).filter(contribution_id=contribution_id, member_id=member_id)
+            previous = mine.values_list("reaction", flat=True).first()
+            if previous == reaction:
+                mine.delete()
+                current = None
+            else:
+                cls.objects.using(using).bulk_create(
+                    [cls(contribution_id=contribution_id, member_id=member_id, reaction=reaction)],
+                    update_conflicts=True,
+                    unique_fields=["contribution", "member"],
+                    update_fields=["reaction", "updated_at"],
+                )
+                current = reaction
+            SprintContribution.adjust_reaction_counts(contribution_id, added=current, removed=previous, using=using)
+            # No receiver listens on reactions (and bulk_create sends no signals), so flag the sprint here.
+            from .scoring import mark_stale
+
+            mark_stale([counts["sprint_id"]], using=using)
+
+        if previous:
+            counts[REACTION_COUNTER_FIELDS[previous]] -= 1
+        if current:
+            counts[REACTION_COUNTER_FIELDS[current]] += 1
+        summary = {code: counts[field] for code, field in REACTION_COUNTER_FIELDS.items()}
+        return summary, current
+
 
 class Dispute(models.Model):
     STATUS_CHOICES = [
@@ -360,30 +542,318 @@ class Dispute(models.Model):
     )
     description = models.TextField(blank=True, default="")
     tasks_affected = models.ManyToManyField(Task, blank=True, related_name="disputes")
+    # Only set on disputes opened by flag_overdue_tasks_as_disputes: the overdue task it was raised for.
+    auto_task = models.ForeignKey(
+        Task,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="auto_disputes",
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="OPEN")
     ai_resolution = models.TextField(blank=True, default="")
     ai_resolved = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["status"], name="dispute_status_idx"),
+            models.Index(fields=["sprint", "status"], name="dispute_sprint_status_idx"),
+            # Duplicate check in flag_overdue_tasks_as_disputes only looks at unresolved disputes.
+            models.Index(
+                fields=["accused_member"],
+                name="dispute_open_accused_idx",
+                condition=models.Q(status__in=["OPEN", "UNDER_REVIEW"]),
+            ),
+        ]
+        constraints = [
+            # One unresolved auto-generated dispute per (task, member), however many job runs overlap.
+            models.UniqueConstraint(
+                fields=["auto_task", "accused_member"],
+                name="dispute_open_auto_unique",
+                condition=models.Q(status__in=["OPEN", "UNDER_REVIEW"]),
+            ),
+        ]
+
     def __str__(self):
         return f"Dispute #{self.id} - {self.status}"
 
+
+class TaskEstimator(models.Model):
+    """
+    Fitted coefficients of the task-hours regression (see myapp.estimator).
+    One row per group, plus one with no group fitted on every group's tasks.
+    Rows are written by the refit job and read through the cache.
+    """
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="task_estimator",
+    )
+    features = models.JSONField(default=list)
+    coefficients = models.JSONField(default=list)
+    trained_on = models.IntegerField(default=0)
+    rmse = models.FloatField(default=0.0)
+    fitted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # NULLs never collide in a unique index, so the one-to-one on group
+            # doesn't cover the all-groups row; index a constant over those rows.
+            models.UniqueConstraint(
+                Coalesce("group", models.Value(0)),
+                name="task_estimator_one_fallback",
+                condition=models.Q(group__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"Estimator for {self.group or 'all groups'} ({self.trained_on} tasks)"
+
+
+class CompactJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder without the spaces after separators."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs["separators"] = (",", ":")
+        super().__init__(*args, **kwargs)
+
+
+class AuditEntry(models.Model):
+    """
+    One audited write: who did what to which row, with the changed fields as
+    {field: [old, new]} (a snapshot of the row for deletions). Rows are
+    buffered and bulk-inserted by myapp.audit and never updated. The group
+    and actor references have no database constraint so the trail outlives
+    the rows it mentions.
+    """
+    ACTION_CHOICES = [
+        ("UPDATE", "Update"),
+        ("STATUS", "Status change"),
+        ("DELETE", "Delete"),
+    ]
+
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="audit_entries",
+    )
+    actor = models.ForeignKey(
+        Member,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name="audit_entries",
+    )
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    target_type = models.CharField(max_length=50)
+    target_id = models.IntegerField()
+    changes = models.JSONField(default=dict, encoder=CompactJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["group", "-created_at"], name="audit_group_created_idx"),
+            models.Index(fields=["target_type", "target_id"], name="audit_target_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.target_type} #{self.target_id}"
+
+
+class MemberSprintScore(models.Model):
+    """
+    Materialized peer-evaluation score of one member in one sprint, with the
+    inputs and component scores it was built from (see myapp.scoring). A
+    sprint's rows are rebuilt together whenever a ScoreRefresh row says its
+    inputs changed; the API only ever reads this table.
+    """
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name="sprint_scores")
+    sprint = models.ForeignKey(Sprint, on_delete=models.CASCADE, related_name="member_scores")
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="member_scores")
+
+    story_points = models.IntegerField(default=0)
+    hours_worked = models.DecimalField(max_digits=8, decimal_places=2, default=Decimal("0.00"))
+    positive_reactions = models.PositiveIntegerField(default=0)
+    negative_reactions = models.PositiveIntegerField(default=0)
+    tasks_assigned = models.PositiveIntegerField(default=0)
+    tasks_done = models.PositiveIntegerField(default=0)
+    estimation_accuracy = models.FloatField(null=True, blank=True)
+    disputes_upheld = models.PositiveIntegerField(default=0)
+    disputes_pending = models.PositiveIntegerField(default=0)
+    disputes_dismissed = models.PositiveIntegerField(default=0)
+
+    contribution_score = models.FloatField(default=0.0)
+    peer_score = models.FloatField(default=0.0)
+    delivery_score = models.FloatField(default=0.0)
+    accuracy_score = models.FloatField(default=0.0)
+    dispute_penalty = models.FloatField(default=0.0)
+    score = models.FloatField(default=0.0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("member", "sprint")
+        indexes = [
+            models.Index(fields=["group", "sprint"], name="score_group_sprint_idx"),
+            models.Index(fields=["sprint"], name="score_sprint_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.member} – {self.sprint}: {self.score:.1f}"
+
+
+class ScoreRefresh(models.Model):
+    """Sprints whose MemberSprintScore rows are out of date, waiting for the refresh job."""
+    sprint = models.OneToOneField(Sprint, on_delete=models.CASCADE, primary_key=True, related_name="score_refresh")
+    queued_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Refresh scores for {self.sprint_id}"
+
+
+class JobLease(models.Model):
+    """
+    Cluster-wide lock for a background job (see myapp.locks). The holder
+    keeps pushing expires_at forward while it runs; a lease that isn't
+    renewed expires, so a killed worker can't block the job for good.
+    """
+    name = models.CharField(max_length=200, primary_key=True)
+    owner = models.CharField(max_length=200)
+    acquired_at = models.DateTimeField()
+    heartbeat_at = models.DateTimeField()
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} held by {self.owner} until {self.expires_at}"
+
+
+class GitHubActivity(models.Model):
+    """Last GitHub activity summary fetched for a member; kept fresh by the refresh_github_activity job."""
+    member = models.OneToOneField(Member, on_delete=models.CASCADE, primary_key=True, related_name="github_activity")
+    username = models.CharField(max_length=100)
+    data = models.JSONField(default=dict)
+    fetched_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"GitHub activity for {self.username}"
+
+@receiver(post_save, sender=SprintContribution)
+@receiver(post_delete, sender=SprintContribution)
+@receiver(post_save, sender=Story_Point_Estimates)
+@receiver(post_delete, sender=Story_Point_Estimates)
+def invalidate_velocity_cache(sender, instance, **kwargs):
+    from .analytics import invalidate_group_velocity
+
+    if instance.sprint_id:
+        invalidate_group_velocity(instance.sprint.group_id)
+
+
+@receiver(post_save, sender=Sprint)
+@receiver(post_delete, sender=Sprint)
+def invalidate_velocity_on_sprint_change(sender, instance, **kwargs):
+    from .analytics import invalidate_group_velocity
+
+    # The velocity report lists the group's sprints by name and dates, so any
+    # sprint write stales it; a sprint moved between groups stales both.
+    invalidate_group_velocity(instance.group_id)
+    previous_group_id = getattr(instance, "_loaded_group_id", None)
+    if previous_group_id != instance.group_id:
+        invalidate_group_velocity(previous_group_id)
+    instance._loaded_group_id = instance.group_id
+
+
+def _deleting_sprint(origin):
+    # Rows removed by a sprint or group delete cascade: their sprint is going
+    # too, and queueing it would leave a ScoreRefresh row pointing at nothing.
+    model = getattr(origin, "model", type(origin))
+    return model in (Sprint, Group)
+
+
+@receiver(post_save, sender=SprintContribution)
+@receiver(post_delete, sender=SprintContribution)
+@receiver(post_save, sender=Dispute)
+@receiver(post_delete, sender=Dispute)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def mark_scores_stale(sender, instance, using, **kwargs):
+    from .scoring import mark_stale
+
+    if instance.sprint_id and not _deleting_sprint(kwargs.get("origin")):
+        mark_stale([instance.sprint_id], using=using)
+
+
+@receiver(post_save, sender=Task)
+def record_status_change(sender, instance, created, using, **kwargs):
+    status = instance.__dict__.get("status")
+    if status is None:
+        return
+    previous = getattr(instance, "_loaded_status", None)
+    if created:
+        TaskStatusEvent.objects.using(using).create(task=instance, from_status="", to_status=status)
+    elif previous is not None and previous != status:
+        TaskStatusEvent.objects.using(using).create(task=instance, from_status=previous, to_status=status)
+
+    previous_sprint_id = getattr(instance, "_loaded_sprint_id", None)
+    if not created and "sprint_id" in instance.__dict__ and previous_sprint_id != instance.sprint_id:
+        # Closed days of both sprints' flow series were built with a different task set.
+        from .analytics import invalidate_sprint_flow
+
+        invalidate_sprint_flow(previous_sprint_id)
+        invalidate_sprint_flow(instance.sprint_id)
+    instance._loaded_status = status
+    instance._loaded_sprint_id = instance.__dict__.get("sprint_id")
+
+
+@receiver(post_delete, sender=Task)
+def invalidate_flow_on_task_delete(sender, instance, **kwargs):
+    from .analytics import invalidate_sprint_flow
+
+    invalidate_sprint_flow(instance.sprint_id)
+
+
+@receiver(m2m_changed, sender=Task.member.through)
+def mark_scores_stale_on_assignment(sender, instance, action, reverse, pk_set, using, **kwargs):
+    from .scoring import mark_stale
+
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+    if not reverse:
+        sprint_ids = [instance.sprint_id] if instance.sprint_id else []
+    elif pk_set:
+        sprint_ids = (
+            Task.objects.using(using).filter(id__in=pk_set, sprint__isnull=False).values_list("sprint_id", flat=True)
+        )
+    else:
+        # member.tasks.clear(): the removed task ids aren't passed along.
+        sprint_ids = MemberSprintScore.objects.using(using).filter(member=instance).values_list("sprint_id", flat=True)
+    mark_stale(set(sprint_ids), using=using)
+
+
 @receiver(post_save, sender=SprintContribution)
+@timed_job("overlap_check")
 def check_contribution_overlap(sender, instance, **kwargs):
     if not instance.description:
         return
 
-    sprint = instance.sprint
+    sprint_contributions = SprintContribution.objects.filter(sprint_id=instance.sprint_id)
 
     if instance.is_overlapping():
-        sprint.has_overlapping_contributions = True
+        overlapping = True
     else:
         # Re-check all contributions in case this edit resolved the overlap
-        sprint.has_overlapping_contributions = any(
+        overlapping = any(
             c.is_overlapping()
-            for c in SprintContribution.objects.filter(sprint=sprint)
+            for c in sprint_contributions.exclude(pk=instance.pk)
             if c.description
         )
 
-    sprint.save(update_fields=["has_overlapping_contributions"])
+    # The flag is sprint-wide but stored on each contribution; update() sends
+    # no post_save, so this doesn't re-trigger the check.
+    sprint_contributions.update(has_overlapping_contributions=overlapping)
@@ -0,0 +1,152 @@
+import logging
+from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
+from django.db import connections, transaction
+
+from .metrics import timed_job
+from .models import Group, Task
+
+logger = logging.getLogger(__name__)
+
+# Iglewicz & Hoaglin: |modified z| above 3.5 is an outlier. 0.6745 scales the
+# MAD to a standard deviation for normally distributed data.
+Z_THRESHOLD = 3.5
+MAD_SCALE = 0.6745
+# Below this many tasks with logged hours a group has no usable distribution,
+# so the old fixed rule (50% off the estimate) applies.
+MIN_SAMPLE = 8
+FALLBACK_RATIO = 0.5
+MAX_RATING = 9999.99  # discrepancy_rating is DecimalField(max_digits=6, decimal_places=2)
+STATS_CACHE_KEY = "outlier_stats:{group_id}"
+STATS_CACHE_SECONDS = 300
+BATCH_SIZE = 2000
+
+
+def _group_arrays(group_id, using="default"):
+    rows = (
+        Task.objects.using(using)
+        .filter(sprint__group_id=group_id)
+        .values_list("id", "estimated_hours", "ai_estimated_hours", "actual_hours", "discrepancy_rating", "is_estimation_outlier")
+    )
+    data = list(rows.iterator(chunk_size=BATCH_SIZE))
+    if not data:
+        empty = np.array([], dtype=float)
+        return np.array([], dtype=np.int64), empty, empty, empty, np.array([], dtype=bool)
+    ids, estimated, refined, actual, ratings, flags = zip(*data)
+    estimated = np.array(estimated, dtype=float)
+    refined = np.array(refined, dtype=float)
+    # Compare against the refined estimate when one exists, as the analysis does.
+    estimate = np.where(refined > 0, refined, estimated)
+    return (
+        np.array(ids, dtype=np.int64),
+        estimate,
+        np.array(actual, dtype=float),
+        np.array(ratings, dtype=float),
+        np.array(flags, dtype=bool),
+    )
+
+
+def _robust_stats(log_ratios):
+    """(median, scale) of the log ratios; scale is None when the sample is too small or flat."""
+    if len(log_ratios) < MIN_SAMPLE:
+        return None, None
+    median = float(np.median(log_ratios))
+    mad = float(np.median(np.abs(log_ratios - median)))
+    if mad == 0:
+        # Over half the tasks share one ratio; fall back to the mean absolute deviation.
+        mad = float(np.mean(np.abs(log_ratios - median))) * 0.7979
+    return median, (mad or None)
+
+
+def score(estimate, actual, median, scale):
+    """
+    Vectorized discrepancy_rating (percent off the estimate) and outlier flags
+    for arrays of estimates and actuals against a group's log-ratio median/scale.
+    """
+    measured = (estimate > 0) & (actual > 0)
+    safe_estimate = np.where(measured, estimate, 1.0)
+    safe_actual = np.where(measured, actual, 1.0)
+    ratio = np.abs(safe_actual - safe_estimate) / safe_estimate
+    rating = np.where(measured, np.minimum(np.round(ratio * 100, 2), MAX_RATING), 0.0)
+
+    if scale is None:
+        flags = measured & (ratio >= FALLBACK_RATIO)
+    else:
+        z = MAD_SCALE * (np.log(safe_actual / safe_estimate) - median) / scale
+        flags = measured & (np.abs(z) > Z_THRESHOLD)
+    return rating, flags
+
+
+def _write_back(using, ids, ratings, flags):
+    """
+    Batched write of the changed rows. QuerySet.bulk_update builds a CASE/WHEN
+    expression per row in Python (about 1ms a row at this size), so the same
+    batch goes through one prepared UPDATE with executemany instead.
+    """
+    connection = connections[using]
+    table = connection.ops.quote_name(Task._meta.db_table)
+    sql = f"UPDATE {table} SET discrepancy_rating = %s, is_estimation_outlier = %s WHERE id = %s"
+    params = [(f"{rating:.2f}", bool(flag), int(task_id)) for task_id, rating, flag in zip(ids, ratings, flags)]
+    with connection.cursor() as cursor:
+        for start in range(0, len(params), BATCH_SIZE):
+            cursor.executemany(sql, params[start:start + BATCH_SIZE])
+
+
+def detect_group_outliers(group_id, using="default"):
+    """
+    Recompute discrepancy_rating and is_estimation_outlier for every task in
+    the group against the group's own distribution of log(actual / estimate),
+    writing back only the rows that changed. Returns a summary dict.
+    """
+    with transaction.atomic(using=using):
+        ids, estimate, actual, old_ratings, old_flags = _group_arrays(group_id, using)
+        measured = (estimate > 0) & (actual > 0)
+        median, scale = _robust_stats(np.log(actual[measured] / estimate[measured]))
+        ratings, flags = score(estimate, actual, median, scale)
+
+        changed = np.flatnonzero((np.abs(ratings - old_ratings) >= 0.005) | (flags != old_flags))
+        _write_back(using, ids[changed], ratings[changed], flags[changed])
+    cache.set(STATS_CACHE_KEY.format(group_id=group_id), (median, scale), timeout=STATS_CACHE_SECONDS)
+
+    return {
+        "group_id": group_id,
+        "tasks": int(len(ids)),
+        "measured": int(measured.sum()),
+        "outliers": int(flags.sum()),
+        "updated": int(len(changed)),
+        "median_ratio": round(float(np.exp(median)), 4) if median is not None else None,
+        "method": "mad" if scale is not None else "fixed_ratio",
+    }
+
+
+@timed_job("detect_outliers")
+def detect_outliers(group_ids=None):
+    """django_q task: run detect_group_outliers for every group (or the given ones)."""
+    if group_ids is None:
+        group_ids = list(Group.objects.values_list("id", flat=True))
+    flagged = 0
+    for group_id in group_ids:
+        flagged += detect_group_outliers(group_id)["outliers"]
+    logger.info("Outlier detection flagged %s tasks across %s groups.", flagged, len(group_ids))
+    return flagged
+
+
+def group_stats(group_id):
+    """Cached (median, scale) of a group's log ratios, for scoring a single task."""
+    key = STATS_CACHE_KEY.format(group_id=group_id)
+    stats = cache.get(key)
+    if stats is None:
+        _, estimate, actual, _, _ = _group_arrays(group_id)
+        measured = (estimate > 0) & (actual > 0)
+        stats = _robust_stats(np.log(actual[measured] / estimate[measured]))
+        cache.set(key, stats, timeout=STATS_CACHE_SECONDS)
+    return stats
+
+
+def score_task(group_id, estimate, actual):
+    """(discrepancy_rating, is_outlier) for one task against its group's distribution."""
+    median, scale = group_stats(group_id) if group_id else (None, None)
+    rating, flag = score(np.array([float(estimate)]), np.array([float(actual)]), median, scale)
+    return Decimal(f"{rating[0]:.2f}"), bool(flag[0])
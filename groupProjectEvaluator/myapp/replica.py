@@ -0,0 +1,112 @@
+import contextvars
+import functools
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+# Set while a designated analytics view or command is running. `wrote` flips
+# once anything in the flow writes, pinning the rest of its reads to primary.
+_replica_flow = contextvars.ContextVar("replica_flow", default=None)
+
+_freshness_lock = threading.Lock()
+_freshness_cache = {"checked_at": 0.0, "synced_at": 0.0}
+FRESHNESS_CACHE_SECONDS = 1.0
+
+
+class _ReplicaFlow:
+    __slots__ = ("wrote",)
+
+    def __init__(self):
+        self.wrote = False
+
+
+def replica_alias():
+    """The configured replica alias, or None when no replica is set up."""
+    alias = getattr(settings, "READ_REPLICA", {}).get("ALIAS")
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def replica_reads():
+    """Route reads inside this block to the replica while it is fresh enough."""
+    token = _replica_flow.set(_ReplicaFlow())
+    try:
+        yield
+    finally:
+        _replica_flow.reset(token)
+
+
+def uses_replica(func):
+    """Decorator form of replica_reads for analytics views."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def current_flow():
+    return _replica_flow.get()
+
+
+def replica_synced_at(alias):
+    """Epoch seconds of the last sync, stored in the replica's PRAGMA user_version."""
+    now = time.monotonic()
+    with _freshness_lock:
+        if now - _freshness_cache["checked_at"] < FRESHNESS_CACHE_SECONDS:
+            return _freshness_cache["synced_at"]
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("PRAGMA user_version")
+            synced_at = float(cursor.fetchone()[0])
+    except Exception:
+        synced_at = 0.0
+    with _freshness_lock:
+        _freshness_cache.update(checked_at=now, synced_at=synced_at)
+    return synced_at
+
+
+def replica_is_fresh(alias):
+    max_staleness = getattr(settings, "READ_REPLICA", {}).get("MAX_STALENESS_SECONDS", 60)
+    return time.time() - replica_synced_at(alias) <= max_staleness
+
+
+def read_alias():
+    """
+    Alias a read-only flow should use, decided once up front: the replica
+    while it is fresh, otherwise the primary. For work that outlives the
+    calling context, such as a streamed response body.
+    """
+    alias = replica_alias()
+    if alias is None or not replica_is_fresh(alias):
+        return "default"
+    return alias
+
+
+def sync_replica():
+    """
+    Copy the primary SQLite file into the replica with the online backup API
+    and stamp the sync time. Returns the number of seconds the copy took.
+    """
+    alias = replica_alias()
+    if alias is None:
+        raise RuntimeError("No read replica is configured (set REPLICA_DB_PATH).")
+
+    started = time.perf_counter()
+    source = sqlite3.connect(str(settings.DATABASES["default"]["NAME"]))
+    target = sqlite3.connect(str(settings.DATABASES[alias]["NAME"]))
+    try:
+        source.backup(target)
+        target.execute(f"PRAGMA user_version = {int(time.time())}")
+        target.commit()
+    finally:
+        target.close()
+        source.close()
+
+    with _freshness_lock:
+        _freshness_cache["checked_at"] = 0.0
+    return time.perf_counter() - started
@@ -0,0 +1,76 @@
+from django.conf import settings
+
+from .replica import current_flow, replica_alias, replica_is_fresh
+
+
+class DjangoQRouter:
+    """
+    Sends the django_q app (broker queue, schedules, task results) to its own
+    database alias so queue polling doesn't compete with API writes for the
+    main SQLite file's write lock.
+    """
+
+    app_label = "django_q"
+
+    @property
+    def alias(self):
+        return getattr(settings, "DJANGO_Q_DATABASE", "default")
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == self.app_label:
+            return self.alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == self.app_label:
+            return self.alias
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if app_label == self.app_label:
+            return db == self.alias
+        if db == self.alias and self.alias != "default":
+            return False
+        return None
+
+
+class ReadReplicaRouter:
+    """
+    Sends reads made inside replica_reads()/@uses_replica to the replica alias
+    while it is within READ_REPLICA["MAX_STALENESS_SECONDS"] of the primary.
+    Everything else, every write, and any read after a write in the same flow
+    stays on the primary. The replica is never migrated; it is a copy.
+    """
+
+    def db_for_read(self, model, **hints):
+        flow = current_flow()
+        if flow is None or flow.wrote:
+            return None
+        alias = replica_alias()
+        if alias is None or not replica_is_fresh(alias):
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        flow = current_flow()
+        if flow is not None:
+            flow.wrote = True
+        alias = replica_alias()
+        instance = hints.get("instance")
+        if alias is not None and instance is not None and instance._state.db == alias:
+            return "default"
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        alias = replica_alias()
+        if alias is not None and {obj1._state.db, obj2._state.db} <= {"default", alias}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
@@ -0,0 +1,173 @@
+import logging
+from collections import Counter, namedtuple
+from datetime import timedelta
+
+from django.db import router, transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Max, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# A recurring django_q job: `cron` (a cron expression) or `minutes` (an interval), not both.
+Job = namedtuple("Job", ["name", "func", "cron", "minutes", "kwargs"], defaults=(None, None, None))
+
+# Every recurring job the app runs. `sync_schedules` makes the django_q
+# Schedule table match this list; edit here, then run the sync_schedules command.
+JOBS = (
+    # End of day: disputes against members with nothing logged for unfinished tasks. To split it
+    # across workers, declare one Job per shard with kwargs={"shard": i, "shards": n}.
+    Job("flag_overdue_tasks", "myapp.discrpencies.flag_overdue_tasks_as_disputes", cron="0 23 * * *"),
+    # Corrects overlap flags left stale when the LLM was unavailable at save time.
+    Job("recheck_overlaps", "myapp.maintenance.recheck_overlaps", cron="30 23 * * *"),
+    Job("refresh_github_activity", "myapp.github.refresh_github_activity", minutes=30),
+    # Rollups. Scores are normally refreshed 30s after a change; this catches anything missed.
+    Job("refresh_member_scores", "myapp.scoring.refresh_stale_scores", minutes=15),
+    Job("refit_estimators", "myapp.estimator.refit_estimators", cron="0 2 * * *"),
+    Job("detect_outliers", "myapp.outliers.detect_outliers", cron="30 2 * * *"),
+    Job("reconcile_reaction_counts", "myapp.maintenance.reconcile_reaction_counts", cron="0 3 * * 0"),
+    Job("resolve_open_disputes", "myapp.dispute_resolution.resolve_open_disputes", minutes=60),
+    Job("prune_task_results", "myapp.maintenance.prune_task_results", cron="0 4 * * *"),
+)
+
+# Schedules pointing at this package that aren't in JOBS are removed by a sync;
+# one-off schedules (the delayed score refresh) are never touched.
+MANAGED_FUNC_PREFIX = "myapp."
+JOB_HEALTH_WINDOW_DAYS = 7
+
+
+def _schedule_fields(job):
+    from django_q.models import Schedule
+
+    return {
+        "func": job.func,
+        "schedule_type": Schedule.CRON if job.cron else Schedule.MINUTES,
+        "cron": job.cron,
+        "minutes": job.minutes,
+        "kwargs": repr(job.kwargs) if job.kwargs else None,
+        "repeats": -1,
+    }
+
+
+def sync_schedules(dry_run=False, prune=True):
+    """
+    Create or update one Schedule per entry in JOBS (matched by name) and,
+    with `prune`, delete recurring myapp schedules that are no longer
+    declared. Safe to run on every deploy: unchanged schedules keep their
+    next_run. Returns [(name, "created" | "updated" | "unchanged" | "deleted")].
+    """
+    from django_q.models import Schedule
+
+    names = [job.name for job in JOBS]
+    changes = []
+    with transaction.atomic(using=router.db_for_write(Schedule)):
+        existing = {s.name: s for s in Schedule.objects.select_for_update().filter(name__in=names)}
+        for job in JOBS:
+            fields = _schedule_fields(job)
+            schedule = existing.get(job.name)
+            if schedule is None:
+                changes.append((job.name, "created"))
+                if not dry_run:
+                    # save() works out the first next_run for cron schedules.
+                    Schedule.objects.create(name=job.name, **fields)
+                continue
+            changed = [field for field, value in fields.items() if getattr(schedule, field) != value]
+            if not changed:
+                changes.append((job.name, "unchanged"))
+                continue
+            changes.append((job.name, "updated"))
+            if not dry_run:
+                for field in changed:
+                    setattr(schedule, field, fields[field])
+                if {"schedule_type", "cron", "minutes"} & set(changed):
+                    # Start the new cadence from now rather than from the old next_run.
+                    schedule.next_run = schedule.calculate_next_run(timezone.now())
+                schedule.save()
+
+        if prune:
+            stale = (
+                Schedule.objects.filter(func__startswith=MANAGED_FUNC_PREFIX)
+                .exclude(schedule_type=Schedule.ONCE)
+                .exclude(name__in=names)
+            )
+            for name in stale.values_list("name", flat=True):
+                changes.append((name or "(unnamed)", "deleted"))
+            if not dry_run:
+                stale.delete()
+
+    for name, change in changes:
+        if change != "unchanged":
+            logger.info("Schedule %s %s%s.", name, change, " (dry run)" if dry_run else "")
+    return changes
+
+
+def _queued_by_group():
+    from django_q.models import OrmQ
+
+    # Payloads are signed pickles, so the job name has to be read from each one.
+    # queue_limit keeps the broker table short in normal operation.
+    return Counter(queued.group() for queued in OrmQ.objects.only("payload"))
+
+
+def job_health(window_days=JOB_HEALTH_WINDOW_DAYS):
+    """
+    One entry per declared job: its schedule, last run, and run count,
+    success rate and average duration over the last `window_days`, plus
+    broker queue depth. Scheduled runs are tagged with the schedule name
+    as their django_q group, which is what ties Task rows back to a job.
+    """
+    from django_q.models import OrmQ, Schedule, Task as QueuedTask
+
+    names = [job.name for job in JOBS]
+    schedules = {s.name: s for s in Schedule.objects.filter(name__in=names)}
+    last_tasks = QueuedTask.objects.in_bulk([s.task for s in schedules.values() if s.task])
+    since = timezone.now() - timedelta(days=window_days)
+    stats = {
+        row["group"]: row
+        for row in QueuedTask.objects.filter(group__in=names, started__gte=since)
+        .values("group")
+        .annotate(
+            runs=Count("id"),
+            successes=Count("id", filter=Q(success=True)),
+            avg_duration=Avg(ExpressionWrapper(F("stopped") - F("started"), output_field=DurationField())),
+            max_duration=Max(ExpressionWrapper(F("stopped") - F("started"), output_field=DurationField())),
+        )
+    }
+    queued = _queued_by_group()
+
+    jobs = []
+    for job in JOBS:
+        schedule = schedules.get(job.name)
+        last = last_tasks.get(schedule.task) if schedule and schedule.task else None
+        row = stats.get(job.name, {})
+        runs = row.get("runs", 0)
+        jobs.append(
+            {
+                "name": job.name,
+                "func": job.func,
+                "schedule": job.cron or f"every {job.minutes} minutes",
+                "registered": schedule is not None,
+                "next_run": schedule.next_run if schedule else None,
+                "last_run": {
+                    "started": last.started,
+                    "stopped": last.stopped,
+                    "success": last.success,
+                    "duration_seconds": round((last.stopped - last.started).total_seconds(), 3),
+                } if last else None,
+                "runs": runs,
+                "success_rate": round(row["successes"] / runs, 3) if runs else None,
+                "avg_duration_seconds": round(row["avg_duration"].total_seconds(), 3) if runs else None,
+                "max_duration_seconds": round(row["max_duration"].total_seconds(), 3) if runs else None,
+                "queued": queued.get(job.name, 0),
+            }
+        )
+
+    now = timezone.now()
+    return {
+        "window_days": window_days,
+        "queue": {
+            "depth": sum(queued.values()),
+            # Pulled by a worker (locked) but not acknowledged yet.
+            "in_progress": OrmQ.objects.filter(lock__gt=now).count(),
+        },
+        "jobs": jobs,
+    }
@@ -0,0 +1,239 @@
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, F, FloatField, Q
+from django.db.models.functions import Cast, Greatest, Least
+from django.utils import timezone
+
+from .metrics import timed_job
+from .models import (
+    REACTION_COUNTER_FIELDS,
+    Dispute,
+    Member,
+    MemberSprintScore,
+    ScoreRefresh,
+    Sprint,
+    SprintContribution,
+    Task,
+)
+
+logger = logging.getLogger(__name__)
+
+MemberGroup = Member.group.through
+TaskMember = Task.member.through
+
+# Component weights; each component is in [0, 1], so the weighted sum is a
+# 0-100 score before dispute penalties.
+WEIGHTS = {"contribution": 0.35, "peer": 0.25, "delivery": 0.25, "accuracy": 0.15}
+POSITIVE_REACTIONS = ("LOOKS_GOOD", "GREAT_PROGRESS")
+NEGATIVE_REACTIONS = ("NEEDS_CLARIFICATION", "NEEDS_MORE_DETAIL")
+# Points off per dispute against the member, by how the dispute ended up.
+DISPUTE_PENALTIES = {"upheld": 10.0, "pending": 3.0, "dismissed": 0.0}
+# Dispute statuses are set by the instructor, who closes a dispute either by
+# resolving it (acting on the complaint) or dismissing it (rejecting it); the
+# UI offers exactly those two, so RESOLVED counts as upheld. The AI
+# recommendation is advisory and never changes a score on its own.
+DISPUTE_OUTCOMES = {"RESOLVED": "upheld", "OPEN": "pending", "UNDER_REVIEW": "pending", "DISMISSED": "dismissed"}
+# Used for delivery/accuracy when a member had no tasks (or none with hours) that sprint.
+NEUTRAL = 0.5
+# Changes inside this window are refreshed together by one job.
+REFRESH_DELAY_SECONDS = 30
+REFRESH_PENDING_KEY = "scoring:refresh_pending"
+SPRINTS_PER_BATCH = 200
+
+
+def mark_stale(sprint_ids, using="default"):
+    """Queue these sprints' scores for the refresh job; one upsert, no reads."""
+    sprint_ids = [sprint_id for sprint_id in sprint_ids if sprint_id]
+    if not sprint_ids:
+        return
+    now = timezone.now()
+    ScoreRefresh.objects.using(using).bulk_create(
+        [ScoreRefresh(sprint_id=sprint_id, queued_at=now) for sprint_id in sprint_ids],
+        update_conflicts=True,
+        unique_fields=["sprint"],
+        update_fields=["queued_at"],
+    )
+    if using == "default":
+        transaction.on_commit(_schedule_refresh, using=using)
+
+
+def _schedule_refresh():
+    # One delayed run per REFRESH_DELAY_SECONDS window instead of one per save.
+    if not cache.add(REFRESH_PENDING_KEY, True, timeout=REFRESH_DELAY_SECONDS):
+        return
+    from django_q.models import Schedule
+    from django_q.tasks import schedule
+
+    schedule(
+        "myapp.scoring.refresh_stale_scores",
+        schedule_type=Schedule.ONCE,
+        next_run=timezone.now() + timedelta(seconds=REFRESH_DELAY_SECONDS),
+    )
+
+
+def _score_inputs(sprint_ids):
+    """
+    One row per (member, sprint) with every raw input, from five aggregate
+    queries: group rosters, contributions, task assignments, disputes.
+    """
+    sprint_groups = dict(
+        Sprint.objects.filter(id__in=sprint_ids, group__isnull=False).values_list("id", "group_id")
+    )
+    rows = {}
+
+    def row(member_id, sprint_id):
+        key = (member_id, sprint_id)
+        if key not in rows:
+            rows[key] = {
+                "story_points": 0, "hours_worked": Decimal("0"), "positive_reactions": 0, "negative_reactions": 0,
+                "tasks_assigned": 0, "tasks_done": 0, "estimation_accuracy": None,
+                "disputes_upheld": 0, "disputes_pending": 0, "disputes_dismissed": 0,
+            }
+        return rows[key]
+
+    # Everyone on the group's roster is scored, including members who logged nothing.
+    for member_id, sprint_id in MemberGroup.objects.filter(
+        group__sprints__id__in=sprint_groups
+    ).values_list("member_id", "group__sprints__id"):
+        row(member_id, sprint_id)
+
+    positive = [F(REACTION_COUNTER_FIELDS[code]) for code in POSITIVE_REACTIONS]
+    negative = [F(REACTION_COUNTER_FIELDS[code]) for code in NEGATIVE_REACTIONS]
+    for member_id, sprint_id, points, hours, pos, neg in (
+        SprintContribution.objects.filter(sprint_id__in=sprint_groups)
+        .annotate(pos=sum(positive[1:], positive[0]), neg=sum(negative[1:], negative[0]))
+        .values_list("member_id", "sprint_id", "story_points", "hours_worked", "pos", "neg")
+    ):
+        entry = row(member_id, sprint_id)
+        entry.update(story_points=points, hours_worked=hours, positive_reactions=pos, negative_reactions=neg)
+
+    estimate = Cast("task__estimated_hours", FloatField())
+    actual = Cast("task__actual_hours", FloatField())
+    for member_id, sprint_id, assigned, done, accuracy in (
+        TaskMember.objects.filter(task__sprint_id__in=sprint_groups)
+        .values("member_id", "task__sprint_id")
+        .annotate(
+            assigned=Count("task_id"),
+            done=Count("task_id", filter=Q(task__status="DONE")),
+            # min/max of estimate and actual: 1.0 is a perfect estimate, either direction.
+            accuracy=Avg(
+                Least(estimate, actual) / Greatest(estimate, actual),
+                filter=Q(task__estimated_hours__gt=0, task__actual_hours__gt=0),
+            ),
+        )
+        .values_list("member_id", "task__sprint_id", "assigned", "done", "accuracy")
+    ):
+        entry = row(member_id, sprint_id)
+        entry.update(tasks_assigned=assigned, tasks_done=done, estimation_accuracy=accuracy)
+
+    for member_id, sprint_id, dispute_status, count in (
+        Dispute.objects.filter(sprint_id__in=sprint_groups)
+        .values("accused_member_id", "sprint_id", "status")
+        .annotate(count=Count("id"))
+        .values_list("accused_member_id", "sprint_id", "status", "count")
+    ):
+        row(member_id, sprint_id)[f"disputes_{DISPUTE_OUTCOMES[dispute_status]}"] += count
+
+    return sprint_groups, rows
+
+
+def _score(keys, rows):
+    """Component and final scores for the (member, sprint) rows, vectorized per column."""
+    def column(name):
+        return np.array([rows[key][name] for key in keys], dtype=float)
+
+    sprint_index = np.unique([sprint_id for _, sprint_id in keys], return_inverse=True)[1]
+    team_size = np.bincount(sprint_index)
+
+    def relative_to_team(values):
+        # Share of the team average, capped at 1: at or above average earns full marks.
+        team_mean = (np.bincount(sprint_index, weights=values) / team_size)[sprint_index]
+        return np.minimum(np.divide(values, team_mean, out=np.zeros_like(values), where=team_mean > 0), 1.0)
+
+    contribution = 0.5 * relative_to_team(column("story_points")) + 0.5 * relative_to_team(column("hours_worked"))
+
+    positive, negative = column("positive_reactions"), column("negative_reactions")
+    peer = (positive + 1) / (positive + negative + 2)  # Laplace-smoothed share of positive reactions
+
+    assigned, done = column("tasks_assigned"), column("tasks_done")
+    delivery = np.divide(done, assigned, out=np.full_like(done, NEUTRAL), where=assigned > 0)
+
+    accuracy = column("estimation_accuracy")  # None becomes nan
+    accuracy = np.where(np.isnan(accuracy), NEUTRAL, accuracy)
+
+    penalty = sum(DISPUTE_PENALTIES[outcome] * column(f"disputes_{outcome}") for outcome in DISPUTE_PENALTIES)
+    weighted = (
+        WEIGHTS["contribution"] * contribution
+        + WEIGHTS["peer"] * peer
+        + WEIGHTS["delivery"] * delivery
+        + WEIGHTS["accuracy"] * accuracy
+    )
+    score = np.clip(100 * weighted - penalty, 0, 100)
+    return {
+        "contribution_score": contribution,
+        "peer_score": peer,
+        "delivery_score": delivery,
+        "accuracy_score": accuracy,
+        "dispute_penalty": penalty,
+        "score": score,
+    }
+
+
+def refresh_scores(sprint_ids):
+    """Rebuild MemberSprintScore for these sprints. Returns the number of rows written."""
+    sprint_groups, rows = _score_inputs(list(sprint_ids))
+    keys = sorted(key for key in rows if key[1] in sprint_groups)
+    objects = []
+    if keys:
+        scores = _score(keys, rows)
+        for i, (member_id, sprint_id) in enumerate(keys):
+            objects.append(
+                MemberSprintScore(
+                    member_id=member_id,
+                    sprint_id=sprint_id,
+                    group_id=sprint_groups[sprint_id],
+                    **rows[(member_id, sprint_id)],
+                    **{field: round(float(values[i]), 4) for field, values in scores.items()},
+                )
+            )
+    with transaction.atomic():
+        MemberSprintScore.objects.filter(sprint_id__in=sprint_ids).delete()
+        MemberSprintScore.objects.bulk_create(objects, batch_size=1000)
+    return len(objects)
+
+
+@timed_job("refresh_member_scores")
+def refresh_stale_scores():
+    """
+    django_q task: rebuild the scores of every sprint queued by mark_stale.
+    Queue rows touched after the job started stay queued for the next run.
+    """
+    started = timezone.now()
+    stale = list(ScoreRefresh.objects.filter(queued_at__lte=started).values_list("sprint_id", flat=True))
+    written = 0
+    for start in range(0, len(stale), SPRINTS_PER_BATCH):
+        batch = stale[start:start + SPRINTS_PER_BATCH]
+        written += refresh_scores(batch)
+        ScoreRefresh.objects.filter(sprint_id__in=batch, queued_at__lte=started).delete()
+    logger.info("Refreshed %s member scores across %s sprints.", written, len(stale))
+    return written
+
+
+def refresh_all_scores(group_id=None):
+    """Rebuild every sprint (of one group), e.g. after a bulk import or a weight change."""
+    started = timezone.now()
+    sprints = Sprint.objects.filter(group__isnull=False)
+    if group_id is not None:
+        sprints = sprints.filter(group_id=group_id)
+    sprint_ids = list(sprints.values_list("id", flat=True))
+    written = 0
+    for start in range(0, len(sprint_ids), SPRINTS_PER_BATCH):
+        batch = sprint_ids[start:start + SPRINTS_PER_BATCH]
+        written += refresh_scores(batch)
+        ScoreRefresh.objects.filter(sprint_id__in=batch, queued_at__lte=started).delete()
+    return written
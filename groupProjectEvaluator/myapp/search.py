@@ -0,0 +1,214 @@
+import re
+
+from django.db import connection
+
+# One FTS5 table indexes every searchable row. The rowid packs the source
+# table into its low bits (object_id * KIND_STRIDE + kind) so triggers can
+# replace or delete an entry by rowid instead of scanning the index.
+SEARCH_TABLE = "myapp_search"
+KIND_STRIDE = 4
+KINDS = {
+    "task": 0,
+    "comment": 1,
+    "contribution": 2,
+    "dispute": 3,
+}
+KIND_NAMES = {code: name for name, code in KINDS.items()}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# (source table, kind, group_id / title / body expressions over {row}, columns
+# whose updates re-index the row).
+_SOURCES = [
+    (
+        "myapp_task",
+        KINDS["task"],
+        "(SELECT group_id FROM myapp_sprint WHERE id = {row}.sprint_id)",
+        "{row}.title",
+        "{row}.description || ' ' || {row}.requirements",
+        ("title", "description", "requirements", "sprint_id"),
+    ),
+    (
+        "myapp_taskcomment",
+        KINDS["comment"],
+        "(SELECT s.group_id FROM myapp_task t JOIN myapp_sprint s ON s.id = t.sprint_id WHERE t.id = {row}.task_id)",
+        "''",
+        "{row}.text",
+        ("text", "task_id"),
+    ),
+    (
+        "myapp_sprintcontribution",
+        KINDS["contribution"],
+        "(SELECT group_id FROM myapp_sprint WHERE id = {row}.sprint_id)",
+        "''",
+        "{row}.description",
+        ("description", "sprint_id"),
+    ),
+    (
+        "myapp_dispute",
+        KINDS["dispute"],
+        "(SELECT group_id FROM myapp_sprint WHERE id = {row}.sprint_id)",
+        "''",
+        "{row}.description",
+        ("description", "sprint_id"),
+    ),
+]
+
+# (parent table, parent column, {child table: filter over src and NEW}):
+# rows whose group comes through a parent are re-indexed when that parent
+# column changes. A comment's group is its task's sprint's group, and every
+# row's group is its sprint's group.
+_CASCADES = [
+    ("myapp_task", "sprint_id", {"myapp_taskcomment": "src.task_id = NEW.id"}),
+    (
+        "myapp_sprint",
+        "group_id",
+        {
+            "myapp_task": "src.sprint_id = NEW.id",
+            "myapp_taskcomment": "src.task_id IN (SELECT id FROM myapp_task WHERE sprint_id = NEW.id)",
+            "myapp_sprintcontribution": "src.sprint_id = NEW.id",
+            "myapp_dispute": "src.sprint_id = NEW.id",
+        },
+    ),
+]
+
+_SOURCE_BY_TABLE = {source[0]: source for source in _SOURCES}
+
+
+def create_search_index_sql():
+    """DDL for the FTS5 table and the triggers that keep it in sync."""
+    statements = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        "group_id UNINDEXED, title, body, tokenize = 'porter unicode61')"
+    ]
+    for table, kind, group_sql, title_sql, body_sql, watched in _SOURCES:
+        new = {part: sql.format(row="NEW") for part, sql in (("group", group_sql), ("title", title_sql), ("body", body_sql))}
+        insert = (
+            f"INSERT INTO {SEARCH_TABLE}(rowid, group_id, title, body) "
+            f"VALUES (NEW.id * {KIND_STRIDE} + {kind}, {new['group']}, {new['title']}, {new['body']});"
+        )
+        delete_old = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.id * {KIND_STRIDE} + {kind};"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {', '.join(watched)} ON {table} "
+            f"BEGIN {delete_old} {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        ]
+    for parent, column, children in _CASCADES:
+        body = []
+        for child, where in children.items():
+            _, kind, group_sql, title_sql, body_sql, _ = _SOURCE_BY_TABLE[child]
+            row = {part: sql.format(row="src") for part, sql in (("group", group_sql), ("title", title_sql), ("body", body_sql))}
+            body += [
+                f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN "
+                f"(SELECT src.id * {KIND_STRIDE} + {kind} FROM {child} src WHERE {where});",
+                f"INSERT INTO {SEARCH_TABLE}(rowid, group_id, title, body) "
+                f"SELECT src.id * {KIND_STRIDE} + {kind}, {row['group']}, {row['title']}, {row['body']} "
+                f"FROM {child} src WHERE {where};",
+            ]
+        statements.append(
+            f"CREATE TRIGGER IF NOT EXISTS {parent}_search_{column}_au AFTER UPDATE OF {column} ON {parent} "
+            f"WHEN OLD.{column} IS NOT NEW.{column} BEGIN {' '.join(body)} END"
+        )
+    return statements
+
+
+def drop_search_index_sql():
+    statements = []
+    for table, *_ in _SOURCES:
+        for suffix in ("ai", "au", "ad"):
+            statements.append(f"DROP TRIGGER IF EXISTS {table}_search_{suffix}")
+    for parent, column, *_ in _CASCADES:
+        statements.append(f"DROP TRIGGER IF EXISTS {parent}_search_{column}_au")
+    statements.append(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+    return statements
+
+
+def rebuild_search_index_sql():
+    """Repopulate the index from the source tables in one pass per table."""
+    statements = [f"DELETE FROM {SEARCH_TABLE}"]
+    for table, kind, group_sql, title_sql, body_sql, _ in _SOURCES:
+        row = {part: sql.format(row="src") for part, sql in (("group", group_sql), ("title", title_sql), ("body", body_sql))}
+        statements.append(
+            f"INSERT INTO {SEARCH_TABLE}(rowid, group_id, title, body) "
+            f"SELECT src.id * {KIND_STRIDE} + {kind}, {row['group']}, {row['title']}, {row['body']} FROM {table} src"
+        )
+    statements.append(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+    return statements
+
+
+def build_match_query(text):
+    """
+    Turn free text into a safe FTS5 query: every word must match, and the
+    last word also matches as a prefix so results update while typing.
+    """
+    tokens = _TOKEN.findall(text or "")
+    if not tokens:
+        return ""
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search(text, group_id, kinds=None, limit=20, offset=0):
+    """Ranked, group-scoped search. Returns (total, rows) where rows are dicts."""
+    match = build_match_query(text)
+    if not match:
+        return 0, []
+
+    where = f"{SEARCH_TABLE} MATCH %s AND group_id = %s"
+    params = [match, int(group_id)]
+    if kinds:
+        codes = [KINDS[kind] for kind in kinds]
+        where += f" AND (rowid %% {KIND_STRIDE}) IN ({', '.join(['%s'] * len(codes))})"
+        params += codes
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE} WHERE {where}", params)
+        total = cursor.fetchone()[0]
+        if total == 0 or offset >= total:
+            return total, []
+        cursor.execute(
+            f"SELECT rowid, title, snippet({SEARCH_TABLE}, 2, '[', ']', '…', 12), "
+            f"bm25({SEARCH_TABLE}, 0.0, 5.0, 1.0) AS rank "
+            f"FROM {SEARCH_TABLE} WHERE {where} ORDER BY rank LIMIT %s OFFSET %s",
+            params + [limit, offset],
+        )
+        rows = cursor.fetchall()
+
+    results = [
+        {
+            "kind": KIND_NAMES[rowid % KIND_STRIDE],
+            "id": rowid // KIND_STRIDE,
+            "title": title,
+            "snippet": snippet,
+            "score": round(-rank, 4),
+        }
+        for rowid, title, snippet, rank in rows
+    ]
+    _attach_links(results)
+    return total, results
+
+
+def _attach_links(results):
+    """Add the ids the frontend needs to link each hit, one query per kind on the page."""
+    from .models import Dispute, SprintContribution, Task, TaskComment
+
+    link_fields = {
+        "task": (Task, ("sprint_id", "status")),
+        "comment": (TaskComment, ("task_id",)),
+        "contribution": (SprintContribution, ("member_id", "sprint_id")),
+        "dispute": (Dispute, ("sprint_id", "status")),
+    }
+    by_kind = {}
+    for result in results:
+        by_kind.setdefault(result["kind"], []).append(result)
+    for kind, hits in by_kind.items():
+        model, fields = link_fields[kind]
+        links = {
+            row["id"]: row
+            for row in model.objects.filter(id__in=[hit["id"] for hit in hits]).values("id", *fields)
+        }
+        for hit in hits:
+            row = links.get(hit["id"], {})
+            hit.update({field: row.get(field) for field in fields})
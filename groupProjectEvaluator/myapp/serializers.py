@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Task, TaskComment, Sprint, Member, Project, Group, SprintContribution, Tag, ContributionReaction, Dispute
+from .models import Task, TaskComment, Sprint, Member, Project, Group, SprintContribution, Tag, Dispute
 
 class SprintSerializer(serializers.ModelSerializer):
     group_name = serializers.CharField(source="group.name", read_only=True, default=None)
@@ -32,7 +32,7 @@ class TaskCommentSerializer(serializers.ModelSerializer):
 class TaskSerializer(serializers.ModelSerializer):
     assigned_members = serializers.SerializerMethodField()
     created_by_name = serializers.CharField(source="created_by.name", read_only=True)
-    comments_count = serializers.IntegerField(source="comments.count", read_only=True)
+    comments_count = serializers.SerializerMethodField()
 
     tags = TagSerializer(many=True, read_only=True)
     tag_ids = serializers.PrimaryKeyRelatedField(
@@ -46,6 +46,11 @@ class TaskSerializer(serializers.ModelSerializer):
     def get_assigned_members(self, obj):
         return [{"id": m.id, "name": m.name, "role": m.roles} for m in obj.member.all()]
 
+    def get_comments_count(self, obj):
+        # Querysets annotated with comments_total avoid a COUNT per task.
+        annotated = getattr(obj, "comments_total", None)
+        return annotated if annotated is not None else obj.comments.count()
+
     class Meta:
         model = Task
         fields = [
@@ -136,20 +141,18 @@ class SprintContributionSerializer(serializers.ModelSerializer):
     current_user_reaction = serializers.SerializerMethodField()
 
     def get_reaction_summary(self, obj):
-        summary = {choice: 0 for choice, _ in ContributionReaction.REACTION_CHOICES}
-        for reaction in obj.reactions.all():
-            summary[reaction.reaction] = summary.get(reaction.reaction, 0) + 1
-        return summary
+        return obj.reaction_summary()
 
     def get_current_user_reaction(self, obj):
         member_id = self.context.get("member_id")
         if not member_id:
             return None
 
-        for reaction in obj.reactions.all():
-            if str(reaction.member_id) == str(member_id):
-                return reaction.reaction
-        return None
+        # The viewset prefetches only the current member's reaction into this attribute.
+        reactions = getattr(obj, "current_user_reactions", None)
+        if reactions is None:
+            return obj.reactions.filter(member_id=member_id).values_list("reaction", flat=True).first()
+        return reactions[0].reaction if reactions else None
 
     class Meta:
         model = SprintContribution
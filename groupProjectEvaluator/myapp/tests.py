@@ -1,3 +1,1280 @@
-from django.test import TestCase
+import csv
+import gzip
+import random
+import json
+import threading
+import importlib
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+import requests
+
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.db.models.signals import post_save
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import audit, exports, github, llm, locks, views
+from .analytics import group_velocity, sprint_flow, task_status_history
+from .discrpencies import flag_overdue_tasks_as_disputes
+from .dispute_resolution import MinuteBudget, resolve_open_disputes
+from .estimator import refit_estimators
+from .outliers import detect_group_outliers
+from .maintenance import recheck_overlaps
+from .models import (
+    REACTION_COUNTER_FIELDS,
+    AuditEntry,
+    ContributionReaction,
+    Dispute,
+    GitHubActivity,
+    Group,
+    JobLease,
+    Member,
+    MemberSprintScore,
+    ScoreRefresh,
+    Sprint,
+    SprintContribution,
+    Tag,
+    Task,
+    TaskComment,
+    TaskEstimator,
+    TaskStatusEvent,
+)
+from .scoring import refresh_stale_scores
+from .search import search
+from .serializers import SprintContributionSerializer
+
+
+def make_member(name):
+    return Member.objects.create(name=name, email=f"{name}@example.com", username=name, password="x")
+
+
+def make_sprint(group, name="Sprint 1", days_ago=14):
+    start = date.today() - timedelta(days=days_ago)
+    return Sprint.objects.create(name=name, start_date=start, end_date=start + timedelta(days=13), group=group)
+
+
+class SprintAndGroupDeletionTests(TransactionTestCase):
+    """Cascades from a sprint or group delete must not queue score refreshes for the deleted sprint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.group = Group.objects.create(name="Team", group_code=1)
+        self.sprint = make_sprint(self.group)
+        self.alice, self.bob = make_member("alice"), make_member("bob")
+        self.group.members.add(self.alice, self.bob)
+        SprintContribution.objects.create(member=self.alice, sprint=self.sprint, story_points=3)
+        task = Task.objects.create(title="Build", sprint=self.sprint)
+        task.member.add(self.alice)
+        Dispute.objects.create(raised_by=self.alice, accused_member=self.bob, sprint=self.sprint)
+
+    def test_delete_sprint_through_api(self):
+        response = self.client.delete(f"/api/sprints/{self.sprint.id}/")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Sprint.objects.filter(id=self.sprint.id).exists())
+        self.assertFalse(ScoreRefresh.objects.filter(sprint_id=self.sprint.id).exists())
+
+    def test_delete_group_through_api(self):
+        response = self.client.delete(f"/api/groups/{self.group.id}/")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Sprint.objects.filter(id=self.sprint.id).exists())
+        self.assertFalse(ScoreRefresh.objects.exists())
+
+    def test_delete_sprint_with_materialized_scores(self):
+        refresh_stale_scores()
+        self.assertEqual(MemberSprintScore.objects.filter(sprint=self.sprint).count(), 2)
+
+        response = self.client.delete(f"/api/sprints/{self.sprint.id}/")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(MemberSprintScore.objects.exists())
+        self.assertFalse(ScoreRefresh.objects.exists())
+
+    def test_deleting_a_contribution_still_queues_its_sprint(self):
+        ScoreRefresh.objects.all().delete()
+
+        SprintContribution.objects.get(sprint=self.sprint).delete()
+
+        self.assertTrue(ScoreRefresh.objects.filter(sprint_id=self.sprint.id).exists())
+
+
+class LLMTestCase(TestCase):
+    """Rebuilds the shared LLM client around each test so settings overrides take effect."""
+
+    def setUp(self):
+        llm.reset_client()
+        self.addCleanup(llm.reset_client)
+
+
+@override_settings(GEMINI_API_KEY="", LLM={**settings.LLM, "BACKEND": "gemini"})
+class UnconfiguredLLMTests(LLMTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice, self.bob = make_member("alice"), make_member("bob")
+        self.sprint = make_sprint(Group.objects.create(name="Team", group_code=1))
+
+    def test_generate_raises_without_a_key(self):
+        with self.assertRaises(llm.LLMError):
+            llm.generate("Is this overlapping?")
+
+    def test_dispute_resolution_leaves_disputes_pending(self):
+        dispute = Dispute.objects.create(raised_by=self.alice, accused_member=self.bob, description="No show.")
+
+        summary = resolve_open_disputes()
+
+        self.assertEqual(summary["resolved"], 0)
+        dispute.refresh_from_db()
+        self.assertFalse(dispute.ai_resolved)
+        self.assertEqual(dispute.ai_resolution, "")
+
+    def test_overlap_check_fails_open(self):
+        SprintContribution.objects.create(member=self.alice, sprint=self.sprint, description="Built the login page.")
+        contribution = SprintContribution.objects.create(
+            member=self.bob, sprint=self.sprint, description="Built the login page."
+        )
+
+        self.assertFalse(contribution.is_overlapping())
+
+    def test_overlap_recheck_keeps_flags_it_cannot_verify(self):
+        SprintContribution.objects.create(member=self.alice, sprint=self.sprint, description="Built the login page.")
+        SprintContribution.objects.create(member=self.bob, sprint=self.sprint, description="Built the login page.")
+        SprintContribution.objects.filter(sprint=self.sprint).update(has_overlapping_contributions=True)
+
+        recheck_overlaps()
+
+        self.assertTrue(
+            all(SprintContribution.objects.filter(sprint=self.sprint).values_list("has_overlapping_contributions", flat=True))
+        )
+
+
+class SQLiteConcurrentWriteTests(TransactionTestCase):
+    """Writers on separate connections queue on the write lock (busy_timeout) instead of failing."""
+
+    def test_parallel_writers_do_not_hit_locked_errors(self):
+        sprint = make_sprint(Group.objects.create(name="Team", group_code=1))
+        task = Task.objects.create(title="Shared", sprint=sprint, actual_hours=0)
+        author = make_member("writer")
+        errors = []
+
+        def write(thread_no):
+            try:
+                for i in range(25):
+                    with transaction.atomic():
+                        Task.objects.filter(id=task.id).update(actual_hours=F("actual_hours") + 1)
+                        TaskComment.objects.create(task=task, author=author, text=f"{thread_no}-{i}")
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        task.refresh_from_db()
+        self.assertEqual(task.actual_hours, 150)
+        self.assertEqual(TaskComment.objects.filter(task=task).count(), 150)
+
+
+class StubBackend:
+    """LLM backend for tests: records prompts, answers UPHOLD, and fails prompts mentioning FAIL."""
+
+    service = "stub"
+    retryable = (TimeoutError,)
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        if "FAIL" in prompt:
+            raise ValueError("blocked")
+        text = json.dumps({"recommendation": "uphold", "summary": "The evidence supports the complaint."})
+        return llm.LLMResponse(text, 10, 10)
+
+
+class ScriptedBackend(llm.FakeBackend):
+    """FakeBackend that raises the queued exceptions first, one per call, and counts calls."""
+
+    def __init__(self, *failures):
+        super().__init__()
+        self.failures = list(failures)
+        self.calls = 0
+
+    def generate(self, prompt):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return super().generate(prompt)
+
+
+class LLMClientTests(SimpleTestCase):
+    def setUp(self):
+        self.sleeps = []
+        for patcher in (
+            mock.patch.object(llm.time, "sleep", side_effect=self.sleeps.append),
+            # The top of the jitter range, so the backoff schedule is visible.
+            mock.patch.object(llm.random, "uniform", side_effect=lambda low, high: high),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make_client(self, backend, **kwargs):
+        return llm.LLMClient(backend, backoff_seconds=0.5, backoff_max_seconds=0.75, **kwargs)
+
+    def test_retries_transient_errors_with_backoff(self):
+        backend = ScriptedBackend(TimeoutError("slow"), ConnectionError("reset"), TimeoutError("slow"))
+
+        text = self.make_client(backend, max_retries=3).generate("prompt")
+
+        self.assertIn("recommendation", llm.parse_json(text))
+        self.assertEqual(backend.calls, 4)
+        self.assertEqual(self.sleeps, [0.5, 0.75, 0.75])
+
+    def test_gives_up_after_max_retries(self):
+        backend = ScriptedBackend(*[TimeoutError("slow")] * 3)
+
+        with self.assertRaises(llm.LLMError):
+            self.make_client(backend, max_retries=2).generate("prompt")
+
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_non_retryable_errors_fail_fast(self):
+        backend = ScriptedBackend(ValueError("blocked by safety filter"))
+        client = self.make_client(backend, max_retries=3, breaker_threshold=1)
+
+        with self.assertRaises(llm.LLMError):
+            client.generate("prompt")
+
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual(self.sleeps, [])
+        # The backend answered, so the breaker doesn't count it.
+        self.assertEqual(client.breaker.state, "closed")
+
+    def test_breaker_opens_then_half_opens_and_closes(self):
+        now = [1000.0]
+        patcher = mock.patch.object(llm.time, "monotonic", side_effect=lambda: now[0])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        backend = ScriptedBackend(*[TimeoutError("down")] * 3)
+        client = self.make_client(backend, max_retries=0, breaker_threshold=2, breaker_cooldown_seconds=30)
+
+        for _ in range(2):
+            with self.assertRaises(llm.LLMError):
+                client.generate("prompt")
+        self.assertEqual(client.breaker.state, "open")
+        with self.assertRaises(llm.LLMUnavailable):
+            client.generate("prompt")
+        self.assertEqual(backend.calls, 2)
+
+        now[0] += 30
+        self.assertEqual(client.breaker.state, "half_open")
+        # A failed trial call re-opens the breaker for another cooldown.
+        with self.assertRaises(llm.LLMError):
+            client.generate("prompt")
+        self.assertEqual(client.breaker.state, "open")
+
+        now[0] += 30
+        client.generate("prompt")
+        self.assertEqual(client.breaker.state, "closed")
+        self.assertEqual(backend.calls, 4)
+
+    def test_identical_prompts_in_flight_share_one_call(self):
+        started, release = threading.Event(), threading.Event()
+
+        class SlowBackend(ScriptedBackend):
+            def generate(self, prompt):
+                started.set()
+                release.wait(5)
+                return super().generate(prompt)
+
+        backend = SlowBackend()
+        client = self.make_client(backend)
+        results = []
+        leader = threading.Thread(target=lambda: results.append(client.generate("same prompt")))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=lambda: results.append(client.generate("same prompt")))
+        follower.start()
+        # Give the follower time to find the leader's call in flight.
+        follower.join(0.2)
+        release.set()
+        leader.join()
+        follower.join()
+
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0], results[1])
+        self.assertNotEqual(client.generate("another prompt"), results[0])
+        self.assertEqual(backend.calls, 2)
+
+
+class DisputeResolutionTests(LLMTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = StubBackend()
+        patcher = mock.patch.object(llm, "_client", llm.LLMClient(self.backend, max_retries=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.alice, self.bob = make_member("alice"), make_member("bob")
+        self.sprint = make_sprint(Group.objects.create(name="Team", group_code=1))
+        self.task = Task.objects.create(title="Write the API docs", sprint=self.sprint)
+        TaskComment.objects.create(task=self.task, author=self.alice, text="Still nothing pushed.")
+
+    def open_dispute(self, description, **kwargs):
+        dispute = Dispute.objects.create(
+            raised_by=self.alice, accused_member=self.bob, sprint=self.sprint, description=description, **kwargs
+        )
+        dispute.tasks_affected.add(self.task)
+        return dispute
+
+    def test_resolves_open_disputes_from_their_evidence(self):
+        dispute = self.open_dispute("Bob skipped the docs.")
+        closed = self.open_dispute("Old complaint.", status="RESOLVED")
+
+        summary = resolve_open_disputes()
+
+        self.assertEqual(summary, {"resolved": 1, "failed": 0, "remaining": 0})
+        dispute.refresh_from_db()
+        self.assertTrue(dispute.ai_resolved)
+        self.assertEqual(dispute.ai_resolution, "UPHOLD: The evidence supports the complaint.")
+        (prompt,) = self.backend.prompts
+        self.assertIn("Bob skipped the docs.", prompt)
+        self.assertIn("Write the API docs", prompt)
+        self.assertIn("Comment from alice: Still nothing pushed.", prompt)
+        closed.refresh_from_db()
+        self.assertFalse(closed.ai_resolved)
+
+    def test_failed_calls_stay_pending_and_reruns_skip_resolved(self):
+        resolved = self.open_dispute("Bob skipped the docs.")
+        failing = self.open_dispute("FAIL this one.")
+
+        first = resolve_open_disputes()
+        second = resolve_open_disputes()
+
+        self.assertEqual(first, {"resolved": 1, "failed": 1, "remaining": 1})
+        self.assertEqual(second, {"resolved": 0, "failed": 1, "remaining": 1})
+        # The second run only retried the failed dispute.
+        self.assertEqual(len(self.backend.prompts), 3)
+        resolved.refresh_from_db()
+        failing.refresh_from_db()
+        self.assertTrue(resolved.ai_resolved)
+        self.assertFalse(failing.ai_resolved)
+        self.assertEqual(failing.ai_resolution, "")
+
+
+    def test_batches_fit_the_budget_and_the_run_stops_before_its_deadline(self):
+        from django_q.models import Schedule
+
+        for n in range(5):
+            self.open_dispute(f"Complaint {n}")
+
+        started = time.monotonic()
+        # One second before the deadline for starting calls (max_seconds less the LLM timeout).
+        summary = resolve_open_disputes(calls_per_minute=2, max_seconds=settings.LLM["TIMEOUT_SECONDS"] + 1)
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(summary, {"resolved": 2, "failed": 0, "remaining": 3})
+        self.assertEqual(len(self.backend.prompts), 2)
+        # The rest continues in a fresh run once this one has released its lease.
+        self.assertTrue(
+            Schedule.objects.filter(
+                func="myapp.dispute_resolution.resolve_open_disputes", schedule_type=Schedule.ONCE
+            ).exists()
+        )
+
+    def test_skips_while_another_run_holds_the_lease(self):
+        self.open_dispute("Bob skipped the docs.")
+        self.assertTrue(locks.acquire("resolve_open_disputes", "other-worker"))
+
+        self.assertIsNone(resolve_open_disputes())
+
+        self.assertEqual(self.backend.prompts, [])
+
+
+class MinuteBudgetTests(SimpleTestCase):
+    def test_acquire_gives_up_instead_of_waiting_past_the_deadline(self):
+        budget = MinuteBudget(calls=1)
+        self.assertEqual(budget.available(), 1)
+        self.assertTrue(budget.acquire())
+
+        started = time.monotonic()
+        self.assertFalse(budget.acquire(deadline=time.monotonic() + 1))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(budget.available(), 0)
+        self.assertGreater(budget.wait_seconds(), 59)
+
+
+class ReactionToggleTests(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        sprint = make_sprint(Group.objects.create(name="Team", group_code=1))
+        self.author, self.alice, self.bob = make_member("author"), make_member("alice"), make_member("bob")
+        self.contribution = SprintContribution.objects.create(member=self.author, sprint=sprint)
+        self.url = f"/api/contributions/{self.contribution.id}/reaction/"
+
+    def react(self, member, reaction):
+        return self.client.post(self.url, {"member_id": member.id, "reaction": reaction}, format="json")
+
+    def test_toggle_sets_switches_and_clears(self):
+        self.assertEqual(self.react(self.alice, "LOOKS_GOOD").json()["current_user_reaction"], "LOOKS_GOOD")
+        self.react(self.bob, "LOOKS_GOOD")
+        switched = self.react(self.alice, "GREAT_PROGRESS").json()
+        cleared = self.react(self.bob, "LOOKS_GOOD").json()
+
+        self.assertEqual(switched["reaction_summary"]["LOOKS_GOOD"], 1)
+        self.assertEqual(switched["reaction_summary"]["GREAT_PROGRESS"], 1)
+        self.assertIsNone(cleared["current_user_reaction"])
+        self.assertEqual(
+            cleared["reaction_summary"],
+            {"LOOKS_GOOD": 0, "NEEDS_CLARIFICATION": 0, "NEEDS_MORE_DETAIL": 0, "GREAT_PROGRESS": 1},
+        )
+        self.contribution.refresh_from_db()
+        self.assertEqual(self.contribution.reaction_summary(), cleared["reaction_summary"])
+        self.assertEqual(ContributionReaction.objects.count(), 1)
+
+    def test_rejects_own_contribution_and_unknown_member(self):
+        self.assertEqual(self.react(self.author, "LOOKS_GOOD").status_code, 400)
+        self.assertEqual(
+            self.client.post(self.url, {"member_id": 999999, "reaction": "LOOKS_GOOD"}, format="json").status_code,
+            404,
+        )
+        self.assertEqual(ContributionReaction.objects.count(), 0)
+
+
+class ReactionCounterSaveTests(TestCase):
+    def setUp(self):
+        sprint = make_sprint(Group.objects.create(name="Team", group_code=1))
+        self.author, self.alice = make_member("author"), make_member("alice")
+        self.contribution = SprintContribution.objects.create(member=self.author, sprint=sprint)
+
+    def test_patch_after_a_concurrent_toggle_keeps_the_count(self):
+        loaded = SprintContribution.objects.get(id=self.contribution.id)
+        ContributionReaction.toggle(self.contribution.id, self.alice.id, "LOOKS_GOOD")
+
+        serializer = SprintContributionSerializer(loaded, data={"description": "Wrote the docs."}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        self.contribution.refresh_from_db()
+        self.assertEqual(self.contribution.description, "Wrote the docs.")
+        self.assertEqual(self.contribution.looks_good_count, 1)
+
+    def test_patch_through_the_api_keeps_the_count(self):
+        ContributionReaction.toggle(self.contribution.id, self.alice.id, "GREAT_PROGRESS")
+
+        response = APIClient().patch(
+            f"/api/contributions/{self.contribution.id}/", {"story_points": 5}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["reaction_summary"]["GREAT_PROGRESS"], 1)
+        self.contribution.refresh_from_db()
+        self.assertEqual((self.contribution.story_points, self.contribution.great_progress_count), (5, 1))
+
+
+class ReactionConcurrencyTests(TransactionTestCase):
+    def test_concurrent_toggles_keep_counters_consistent(self):
+        group = Group.objects.create(name="Team", group_code=1)
+        authors = [make_member("author"), make_member("coauthor")]
+        contributions = [SprintContribution.objects.create(member=a, sprint=make_sprint(group)) for a in authors]
+        members = [make_member(f"clicker{i}") for i in range(4)]
+        reactions = list(REACTION_COUNTER_FIELDS)
+        errors = []
+
+        def click(seed):
+            rng = random.Random(seed)
+            try:
+                for _ in range(30):
+                    ContributionReaction.toggle(
+                        rng.choice(contributions).id, rng.choice(members).id, rng.choice(reactions)
+                    )
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=click, args=(seed,)) for seed in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for contribution in contributions:
+            contribution.refresh_from_db()
+            actual = {code: 0 for code in reactions}
+            for reaction in contribution.reactions.values_list("reaction", flat=True):
+                actual[reaction] += 1
+            self.assertEqual(contribution.reaction_summary(), actual)
+
+
+class SearchIndexTests(TestCase):
+    def test_comments_follow_their_task_to_another_group(self):
+        team, other = Group.objects.create(name="Team", group_code=1), Group.objects.create(name="Other", group_code=2)
+        task = Task.objects.create(title="Build", sprint=make_sprint(team))
+        comment = TaskComment.objects.create(task=task, author=make_member("alice"), text="Flaky websocket reconnect")
+
+        task.sprint = make_sprint(other)
+        task.save()
+
+        self.assertEqual(search("websocket", team.id)[0], 0)
+        total, rows = search("websocket", other.id)
+        self.assertEqual(total, 1)
+        self.assertEqual((rows[0]["kind"], rows[0]["id"]), ("comment", comment.id))
+
+    def test_everything_in_a_sprint_follows_it_to_another_group(self):
+        team, other = Group.objects.create(name="Team", group_code=1), Group.objects.create(name="Other", group_code=2)
+        sprint = make_sprint(team)
+        alice, bob = make_member("alice"), make_member("bob")
+        task = Task.objects.create(title="Websocket client", sprint=sprint)
+        TaskComment.objects.create(task=task, author=alice, text="Websocket drops on resume")
+        SprintContribution.objects.create(member=alice, sprint=sprint, description="Fixed the websocket retry")
+        Dispute.objects.create(raised_by=alice, accused_member=bob, sprint=sprint, description="Websocket work missing")
+        self.assertEqual(search("websocket", team.id)[0], 4)
+
+        sprint.group = other
+        sprint.save()
+
+        self.assertEqual(search("websocket", team.id)[0], 0)
+        total, rows = search("websocket", other.id)
+        self.assertEqual(total, 4)
+        self.assertEqual({row["kind"] for row in rows}, {"task", "comment", "contribution", "dispute"})
+
+
+class VelocityCacheTests(TestCase):
+    def setUp(self):
+        self.team, self.other = Group.objects.create(name="Team", group_code=1), Group.objects.create(name="Other", group_code=2)
+        self.sprint = make_sprint(self.team)
+        SprintContribution.objects.create(member=make_member("alice"), sprint=self.sprint, story_points=3)
+        self.addCleanup(cache.clear)
+
+    def sprint_names(self, group):
+        return [row["name"] for row in group_velocity(group.id)["sprints"]]
+
+    def test_sprint_moved_between_groups_invalidates_both(self):
+        self.assertEqual(self.sprint_names(self.team), ["Sprint 1"])
+        self.assertEqual(self.sprint_names(self.other), [])
+
+        sprint = Sprint.objects.get(id=self.sprint.id)
+        sprint.group = self.other
+        sprint.save()
+
+        self.assertEqual(self.sprint_names(self.team), [])
+        self.assertEqual(self.sprint_names(self.other), ["Sprint 1"])
+
+    def test_sprint_rename_and_delete_invalidate(self):
+        self.assertEqual(self.sprint_names(self.team), ["Sprint 1"])
+
+        self.sprint.name = "Kickoff"
+        self.sprint.save()
+        self.assertEqual(self.sprint_names(self.team), ["Kickoff"])
+
+        self.sprint.delete()
+        self.assertEqual(self.sprint_names(self.team), [])
+
+
+class TaskEstimatorTests(TestCase):
+    def test_only_one_all_groups_fallback(self):
+        TaskEstimator.objects.create(group=None)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TaskEstimator.objects.create(group=None)
+
+    def test_refits_update_the_fallback_in_place(self):
+        sprint = make_sprint(Group.objects.create(name="Team", group_code=1))
+        for hours in range(1, 13):
+            Task.objects.create(title=f"Task {hours}", sprint=sprint, estimated_hours=hours, actual_hours=hours + 1)
+
+        refit_estimators()
+        refit_estimators()
+
+        self.assertEqual(TaskEstimator.objects.filter(group__isnull=True).count(), 1)
+        self.assertEqual(TaskEstimator.objects.get(group__isnull=True).trained_on, 12)
+
+
+class AuditLogTests(TestCase):
+    def setUp(self):
+        audit.flush()
+        self.addCleanup(audit.flush)
+        self.client = APIClient()
+        self.group = Group.objects.create(name="Team", group_code=1)
+        self.alice = make_member("alice")
+        self.task = Task.objects.create(title="Build", sprint=make_sprint(self.group), status="TODO")
+        self.task.member.add(self.alice)
+
+    def record(self):
+        audit.record("UPDATE", self.task, {"title": ["Old", "Build"]}, group_id=self.group.id)
+
+    def test_entries_are_buffered_only_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.record()
+        self.assertEqual(len(audit.buffer), 0)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(audit.buffer), 1)
+
+    def test_rolled_back_changes_leave_no_entry(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.record()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(len(audit.buffer), 0)
+
+    def test_request_finished_flushes_the_buffer(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record()
+        self.assertFalse(AuditEntry.objects.exists())
+
+        # As the test client does: closing connections would end the test's transaction.
+        request_finished.disconnect(close_old_connections)
+        try:
+            request_finished.send(sender=self.__class__)
+        finally:
+            request_finished.connect(close_old_connections)
+
+        self.assertEqual(len(audit.buffer), 0)
+        entry = AuditEntry.objects.get()
+        self.assertEqual((entry.target_type, entry.target_id, entry.group_id), ("task", self.task.id, self.group.id))
+
+    def test_update_records_only_the_changed_fields(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f"/api/tasks/{self.task.id}/", {"status": "IN_PROGRESS", "actor_id": self.alice.id}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+
+        log = self.client.get(f"/api/groups/{self.group.id}/audit/").json()
+
+        self.assertEqual(log["count"], 1)
+        (entry,) = log["results"]
+        self.assertEqual(entry["action"], "STATUS")
+        self.assertEqual(entry["actor_id"], self.alice.id)
+        self.assertEqual(entry["changes"], {"status": ["TODO", "IN_PROGRESS"]})
+
+    def test_pages_past_the_end_are_empty(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record()
+
+        response = self.client.get(f"/api/groups/{self.group.id}/audit/?page=99999999999999999999")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [])
+        self.assertFalse(response.json()["has_more"])
+
+
+def github_response(status_code, payload):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode()
+    response.url = "https://api.github.com/test"
+    return response
+
+
+class GitHubActivityTests(TestCase):
+    def setUp(self):
+        self.member = make_member("alice")
+        self.member.github_username = "alice-gh"
+        self.member.save()
+        self.url = f"/api/members/{self.member.id}/github/"
+
+    def respond(self, *responses):
+        patcher = mock.patch.object(github.requests, "get", side_effect=list(responses))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def store(self, age, **data):
+        GitHubActivity.objects.create(
+            member=self.member, username="alice-gh", data={"issues_count": 3, **data}, fetched_at=timezone.now() - age
+        )
+
+    def test_fetches_and_stores_a_summary(self):
+        self.respond(github_response(200, []), github_response(200, {"total_count": 4}))
+
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["issues_count"], 4)
+        self.assertEqual(GitHubActivity.objects.get(member=self.member).data["issues_count"], 4)
+
+    def test_rate_limit_without_a_stored_summary_is_a_bad_gateway(self):
+        self.respond(github_response(403, {"message": "API rate limit exceeded"}))
+
+        response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, 502)
+        self.assertFalse(GitHubActivity.objects.exists())
+
+    def test_errors_keep_serving_the_previous_summary(self):
+        self.store(timedelta(hours=5))
+        self.respond(github_response(200, []), github_response(503, {}))
+
+        with self.assertLogs("myapp.github", "WARNING"):
+            response = APIClient().get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["issues_count"], 3)
+        stored = GitHubActivity.objects.get(member=self.member)
+        self.assertLess(stored.fetched_at, timezone.now() - timedelta(hours=4))
+
+    def test_refresh_job_leaves_the_stored_summary_on_errors(self):
+        self.store(timedelta(hours=5))
+        self.respond(github_response(403, {}))
+
+        with self.assertLogs("myapp.github", "WARNING"):
+            self.assertEqual(github.refresh_github_activity(), 0)
+
+        self.assertEqual(GitHubActivity.objects.get(member=self.member).data["issues_count"], 3)
+
+
+class MemberScoreTests(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name="Team", group_code=1)
+        self.sprint = make_sprint(self.group)
+        self.alice, self.bob = make_member("alice"), make_member("bob")
+        self.group.members.add(self.alice, self.bob)
+        SprintContribution.objects.create(member=self.alice, sprint=self.sprint, story_points=5, hours_worked=10)
+        SprintContribution.objects.create(member=self.bob, sprint=self.sprint, story_points=5, hours_worked=10)
+
+    def scores(self):
+        return {row.member_id: row for row in MemberSprintScore.objects.filter(sprint=self.sprint)}
+
+    def test_changes_queue_the_sprint_and_the_job_rebuilds_it(self):
+        self.assertTrue(ScoreRefresh.objects.filter(sprint=self.sprint).exists())
+
+        refresh_stale_scores()
+
+        self.assertFalse(ScoreRefresh.objects.exists())
+        scores = self.scores()
+        self.assertEqual(set(scores), {self.alice.id, self.bob.id})
+        self.assertEqual(scores[self.alice.id].story_points, 5)
+        self.assertEqual(scores[self.alice.id].contribution_score, 1.0)
+
+        task = Task.objects.create(title="Ship it", sprint=self.sprint, status="DONE")
+        task.member.add(self.alice)
+        self.assertTrue(ScoreRefresh.objects.filter(sprint=self.sprint).exists())
+        refresh_stale_scores()
+
+        scores = self.scores()
+        self.assertEqual((scores[self.alice.id].tasks_assigned, scores[self.alice.id].tasks_done), (1, 1))
+        self.assertGreater(scores[self.alice.id].score, scores[self.bob.id].score)
+
+    def test_dispute_outcomes_set_the_penalty(self):
+        for dispute_status in ("RESOLVED", "OPEN", "UNDER_REVIEW", "DISMISSED"):
+            Dispute.objects.create(raised_by=self.alice, accused_member=self.bob, sprint=self.sprint, status=dispute_status)
+
+        refresh_stale_scores()
+
+        bob = self.scores()[self.bob.id]
+        self.assertEqual((bob.disputes_upheld, bob.disputes_pending, bob.disputes_dismissed), (1, 2, 1))
+        self.assertEqual(bob.dispute_penalty, 16.0)
+        self.assertAlmostEqual(self.scores()[self.alice.id].score - bob.score, 16.0, places=3)
+
+
+class LeaseTests(TestCase):
+    def later(self, seconds):
+        patcher = mock.patch.object(locks.timezone, "now", return_value=timezone.now() + timedelta(seconds=seconds))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_second_acquire_fails_while_held(self):
+        self.assertTrue(locks.acquire("nightly", "worker-a"))
+
+        self.assertFalse(locks.acquire("nightly", "worker-b"))
+        self.assertEqual(locks.holder("nightly").owner, "worker-a")
+
+        locks.release("nightly", "worker-a")
+        self.assertTrue(locks.acquire("nightly", "worker-b"))
+
+    def test_expired_lease_can_be_taken_over(self):
+        locks.acquire("nightly", "worker-a", seconds=60)
+        self.later(61)
+
+        self.assertIsNone(locks.holder("nightly"))
+        self.assertTrue(locks.acquire("nightly", "worker-b"))
+        self.assertEqual(locks.holder("nightly").owner, "worker-b")
+        # The old holder can neither renew nor release what it lost.
+        self.assertFalse(locks.heartbeat("nightly", "worker-a"))
+        locks.release("nightly", "worker-a")
+        self.assertEqual(JobLease.objects.get(name="nightly").owner, "worker-b")
+
+    def test_heartbeat_extends_the_lease(self):
+        locks.acquire("nightly", "worker-a", seconds=60)
+        first_expiry = JobLease.objects.get(name="nightly").expires_at
+        self.later(45)
+
+        self.assertTrue(locks.heartbeat("nightly", "worker-a", seconds=60))
+
+        self.assertGreaterEqual(JobLease.objects.get(name="nightly").expires_at - first_expiry, timedelta(seconds=45))
+        self.assertFalse(locks.acquire("nightly", "worker-b"))
+
+    def test_singleton_job_skips_while_held_and_releases_after(self):
+        calls = []
+
+        @locks.singleton_job("nightly")
+        def job():
+            calls.append(locks.holder("nightly").owner)
+            return "done"
+
+        locks.acquire("nightly", "worker-a")
+        self.assertIsNone(job())
+        locks.release("nightly", "worker-a")
+
+        self.assertEqual(job(), "done")
+        self.assertEqual(len(calls), 1)
+        self.assertNotEqual(calls[0], "worker-a")
+        self.assertFalse(JobLease.objects.exists())
+
+
+class AutoDisputeTests(TestCase):
+    def setUp(self):
+        self.manager, self.bob = make_member("manager"), make_member("bob")
+        self.task = Task.objects.create(
+            title="Write tests", sprint=make_sprint(Group.objects.create(name="Team", group_code=1), days_ago=30),
+            status="TODO", created_by=self.manager,
+        )
+        self.task.member.add(self.bob)
+
+    def auto_dispute(self, **kwargs):
+        return Dispute.objects.create(
+            raised_by=self.manager, accused_member=self.bob, sprint=self.task.sprint, auto_task=self.task, **kwargs
+        )
+
+    def test_one_unresolved_auto_dispute_per_task_and_member(self):
+        first = self.auto_dispute()
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.auto_dispute(status="UNDER_REVIEW")
+
+        first.status = "RESOLVED"
+        first.save()
+        self.auto_dispute()
+
+    def test_flagging_opens_one_dispute_and_reruns_add_none(self):
+        self.assertEqual(flag_overdue_tasks_as_disputes(), 1)
+        self.assertEqual(flag_overdue_tasks_as_disputes(), 0)
+
+        dispute = Dispute.objects.get()
+        self.assertEqual((dispute.auto_task_id, dispute.accused_member_id), (self.task.id, self.bob.id))
+        self.assertEqual(list(dispute.tasks_affected.all()), [self.task])
+
+    def test_flagging_moves_on_when_a_concurrent_run_got_there_first(self):
+        # Opened by an overlapping run after this one read the existing disputes:
+        # the auto_task link exists but tasks_affected hasn't been filled in yet.
+        self.auto_dispute()
+
+        self.assertEqual(flag_overdue_tasks_as_disputes(), 0)
+
+        self.assertEqual(Dispute.objects.count(), 1)
+
+
+class OutlierDetectionTests(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name="Team", group_code=1)
+        self.sprint = make_sprint(self.group)
+        self.addCleanup(cache.clear)
+
+    def task(self, actual, estimated=10, **kwargs):
+        return Task.objects.create(
+            title="Task", sprint=self.sprint, estimated_hours=estimated, actual_hours=actual, **kwargs
+        )
+
+    def flagged(self):
+        return set(Task.objects.filter(is_estimation_outlier=True).values_list("id", flat=True))
+
+    def test_flags_by_robust_z_score_and_clears_stale_flags(self):
+        for actual in (9, 10, 10, 11, 11, 12, 12, 13, 14):
+            self.task(actual)
+        # Was flagged under an old rule, but sits inside this group's spread.
+        stale = self.task(14, is_estimation_outlier=True)
+        blowout = self.task(60)
+        unmeasured = self.task(0, is_estimation_outlier=True)
+
+        summary = detect_group_outliers(self.group.id)
+
+        self.assertEqual(summary["method"], "mad")
+        self.assertEqual((summary["tasks"], summary["measured"], summary["outliers"]), (12, 11, 1))
+        self.assertEqual(self.flagged(), {blowout.id})
+        blowout.refresh_from_db()
+        self.assertEqual(blowout.discrepancy_rating, Decimal("500.00"))
+        stale.refresh_from_db()
+        unmeasured.refresh_from_db()
+        self.assertEqual((stale.discrepancy_rating, stale.is_estimation_outlier), (Decimal("40.00"), False))
+        self.assertFalse(unmeasured.is_estimation_outlier)
+
+        # Nothing changed, so a rerun writes nothing.
+        self.assertEqual(detect_group_outliers(self.group.id)["updated"], 0)
+
+    def test_small_groups_use_the_fixed_ratio(self):
+        on_target, over = self.task(12), self.task(16)
+
+        summary = detect_group_outliers(self.group.id)
+
+        self.assertEqual(summary["method"], "fixed_ratio")
+        self.assertEqual(self.flagged(), {over.id})
+        self.assertNotIn(on_target.id, self.flagged())
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.group = Group.objects.create(name="Team", group_code=1)
+        self.sprint = make_sprint(self.group)
+        self.other_sprint = make_sprint(self.group, name="Sprint 2", days_ago=0)
+        self.first = Task.objects.create(title="Design, draft", sprint=self.sprint, estimated_hours=3)
+        self.second = Task.objects.create(title="Build", sprint=self.other_sprint, estimated_hours=5)
+        other_group = Group.objects.create(name="Other", group_code=2)
+        Task.objects.create(title="Elsewhere", sprint=make_sprint(other_group))
+
+    def fetch(self, params):
+        response = self.client.get("/api/exports/tasks/", params)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content)
+
+    def test_csv_has_a_header_and_one_row_per_task_in_the_group(self):
+        response, body = self.fetch({"group_id": self.group.id})
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn(f'filename="tasks-group{self.group.id}.csv"', response["Content-Disposition"])
+        rows = list(csv.DictReader(body.decode().splitlines()))
+        self.assertEqual([name for name, _ in exports.DATASETS["tasks"].columns], list(rows[0]))
+        self.assertEqual([row["title"] for row in rows], ["Design, draft", "Build"])
+        self.assertEqual((rows[0]["sprint"], rows[0]["estimated_hours"]), ("Sprint 1", "3.00"))
+
+    def test_gzipped_ndjson_decompresses_to_one_object_per_line(self):
+        # Force several flushes so the gzip stream spans multiple chunks.
+        with mock.patch.object(exports, "FLUSH_BYTES", 10):
+            response, body = self.fetch({"format": "ndjson", "gzip": "1", "sprint_id": self.sprint.id})
+
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertTrue(response["Content-Disposition"].endswith('.ndjson.gz"'))
+        rows = [json.loads(line) for line in gzip.decompress(body).decode().splitlines()]
+        self.assertEqual([(row["id"], row["title"]) for row in rows], [(self.first.id, "Design, draft")])
+        self.assertEqual(rows[0]["estimated_hours"], "3.00")
+
+    def test_since_and_until_are_inclusive_days(self):
+        week_ago = timezone.now() - timedelta(days=7)
+        Task.objects.filter(id=self.first.id).update(created_at=week_ago)
+        day = timezone.localdate(week_ago).isoformat()
+
+        _, body = self.fetch({"group_id": self.group.id, "since": day, "until": day, "format": "ndjson"})
+
+        self.assertEqual([json.loads(line)["id"] for line in body.decode().splitlines()], [self.first.id])
+
+    def test_bad_filters_are_rejected_before_streaming(self):
+        response = self.client.get("/api/exports/tasks/", {"since": "2024-02-01", "until": "2024-01-01"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_database_is_chosen_when_the_export_starts(self):
+        with mock.patch.object(exports, "read_alias", return_value="default") as read_alias:
+            chunks = exports.stream_export("tasks", "csv", group_id=self.group.id)
+            read_alias.assert_called_once_with()
+            self.assertEqual(len(b"".join(chunks).decode().splitlines()), 3)
+
+    @override_settings(PERF_INSTRUMENTATION={"ENABLED": True, "SLOW_REQUEST_MS": 0, "QUERY_SAMPLE_RATE": 0})
+    def test_queries_made_while_streaming_are_measured(self):
+        client = APIClient()
+        with self.assertNoLogs("myapp.perf"):
+            response = client.get("/api/exports/tasks/")
+        self.assertIn('desc="0 queries"', response["Server-Timing"])
+
+        with self.assertLogs("myapp.perf", "WARNING") as logs:
+            b"".join(response.streaming_content)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual((record["event"], record["view"]), ("slow_request", "export"))
+        self.assertGreaterEqual(record["db_queries"], 1)
+
+
+class SprintFlowTests(TestCase):
+    def setUp(self):
+        self.group = Group.objects.create(name="Team", group_code=1)
+        self.sprint = make_sprint(self.group, days_ago=4)
+        self.day = [self.sprint.start_date + timedelta(days=i) for i in range(5)]
+        self.design = Task.objects.create(title="Design", sprint=self.sprint, estimated_hours=4)
+        self.build = Task.objects.create(title="Build", sprint=self.sprint, estimated_hours=6)
+        # Replace the creation events with a known history.
+        TaskStatusEvent.objects.all().delete()
+        self.move(self.design, "", "BACKLOG", 0)
+        self.move(self.build, "", "BACKLOG", 0)
+        self.move(self.design, "BACKLOG", "TODO", 1)
+        self.move(self.build, "BACKLOG", "IN_PROGRESS", 2)
+        self.move(self.design, "TODO", "DONE", 3)
+        self.addCleanup(cache.clear)
+
+    def at(self, day, hour=12):
+        return timezone.make_aware(datetime.combine(self.day[day], datetime.min.time())) + timedelta(hours=hour)
+
+    def move(self, task, from_status, to_status, day):
+        return TaskStatusEvent.objects.create(
+            task=task, from_status=from_status, to_status=to_status, occurred_at=self.at(day)
+        )
+
+    def summary(self, flow):
+        return [
+            (row["counts"]["BACKLOG"], row["counts"]["TODO"], row["counts"]["IN_PROGRESS"], row["counts"]["DONE"],
+             row["remaining_tasks"], row["remaining_hours"])
+            for row in flow["days"]
+        ]
+
+    def test_replays_events_into_daily_counts_and_burndown(self):
+        flow = sprint_flow(self.sprint)
+
+        self.assertEqual([row["date"] for row in flow["days"]], [day.isoformat() for day in self.day])
+        self.assertEqual(
+            self.summary(flow),
+            [
+                (2, 0, 0, 0, 2, "10.00"),
+                (1, 1, 0, 0, 2, "10.00"),
+                (0, 1, 1, 0, 2, "10.00"),
+                (0, 0, 1, 1, 1, "6.00"),
+                (0, 0, 1, 1, 1, "6.00"),
+            ],
+        )
+        # Ideal line falls from the first day's hours to zero on end_date, 13 days later.
+        self.assertEqual([row["ideal_remaining_hours"] for row in flow["days"][:2]], ["10.00", "9.23"])
+
+    def test_closed_days_are_cached_and_only_later_events_are_scanned(self):
+        sprint_flow(self.sprint)
+        # Rewriting a closed day doesn't show: those rows come from the checkpoint.
+        TaskStatusEvent.objects.filter(to_status="TODO").update(occurred_at=self.at(2))
+        self.move(self.build, "IN_PROGRESS", "DONE", 4)
+
+        with self.assertNumQueries(1):
+            flow = sprint_flow(self.sprint)
+
+        self.assertEqual(self.summary(flow)[1], (1, 1, 0, 0, 2, "10.00"))
+        self.assertEqual(self.summary(flow)[4], (0, 0, 0, 2, 0, "0.00"))
+
+    def test_moving_a_task_out_drops_the_checkpoint(self):
+        sprint_flow(self.sprint)
+
+        self.build.sprint = make_sprint(self.group, name="Sprint 2")
+        self.build.save()
+
+        self.assertEqual(self.summary(sprint_flow(self.sprint))[0], (1, 0, 0, 0, 1, "4.00"))
+
+    def test_status_history_totals_time_in_each_status(self):
+        now = self.at(4)
+        with mock.patch("myapp.analytics.timezone.now", return_value=now):
+            history = task_status_history(self.design)
+
+        self.assertEqual([event["to_status"] for event in history["events"]], ["BACKLOG", "TODO", "DONE"])
+        day = 24 * 3600
+        self.assertEqual(
+            history["seconds_in_status"], {"BACKLOG": day, "TODO": 2 * day, "IN_PROGRESS": 0, "DONE": day}
+        )
+
+    def test_backfill_derives_events_from_current_status(self):
+        backfill = importlib.import_module("myapp.migrations.0019_task_status_events").backfill_status_events
+        created, updated = self.at(0, 9), self.at(2, 15)
+        Task.objects.update(created_at=created, updated_at=updated)
+        Task.objects.filter(id=self.design.id).update(status="DONE")
+        TaskStatusEvent.objects.all().delete()
+
+        with connection.cursor() as cursor:
+            backfill(django_apps, SimpleNamespace(quote_name=connection.ops.quote_name, execute=cursor.execute))
+
+        events = TaskStatusEvent.objects.order_by("task_id", "occurred_at").values_list(
+            "task_id", "from_status", "to_status", "occurred_at"
+        )
+        self.assertEqual(
+            list(events),
+            [
+                (self.design.id, "", "BACKLOG", created),
+                (self.design.id, "BACKLOG", "DONE", updated),
+                (self.build.id, "", "BACKLOG", created),
+            ],
+        )
+
+
+class TaskFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.group = Group.objects.create(name="Team", group_code=1)
+        sprint = make_sprint(self.group)
+        self.alice, self.bob = make_member("alice"), make_member("bob")
+        self.backend, self.urgent, self.docs = (
+            Tag.objects.create(name=name, group=self.group) for name in ("backend", "urgent", "docs")
+        )
+        self.api = self.task("API", sprint, "TODO", [self.backend, self.urgent])
+        self.schema = self.task("Schema", sprint, "DONE", [self.backend])
+        self.readme = self.task("Readme", sprint, "TODO", [self.docs, self.urgent])
+        self.task("Untagged", sprint, "IN_PROGRESS", [])
+        # Tagged alike but in another group's sprint, so outside every query below.
+        self.task("Other", make_sprint(Group.objects.create(name="Other", group_code=2)), "TODO", [self.backend])
+
+    def task(self, title, sprint, status, tags):
+        task = Task.objects.create(title=title, sprint=sprint, status=status, created_by=self.alice)
+        task.tags.set(tags)
+        task.member.add(self.alice, self.bob)
+        TaskComment.objects.create(task=task, author=self.bob, text="Looks fine")
+        return task
+
+    def titles(self, **params):
+        response = self.client.get("/api/tasks/", {"group_id": self.group.id, **params})
+        self.assertEqual(response.status_code, 200)
+        return sorted(task["title"] for task in response.data)
+
+    def test_any_matches_one_of_the_tags_and_all_needs_every_tag(self):
+        tags = f"{self.backend.id},{self.urgent.id}"
+        self.assertEqual(self.titles(tags=tags), ["API", "Readme", "Schema"])
+        self.assertEqual(self.titles(tags=tags, match="all"), ["API"])
+        self.assertEqual(self.titles(tags=f"{self.docs.id},{self.backend.id}", match="all"), [])
+        self.assertEqual(self.titles(tags=str(self.docs.id), match="all"), ["Readme"])
+
+    def test_bad_tag_parameters_are_rejected(self):
+        self.assertEqual(self.client.get("/api/tasks/", {"tags": "1,x"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/tasks/", {"tags": "1", "match": "some"}).status_code, 400)
+
+    def test_facets_count_the_filtered_tasks(self):
+        response = self.client.get("/api/tasks/", {"group_id": self.group.id, "tags": self.urgent.id, "facets": "1"})
+
+        self.assertEqual(sorted(task["title"] for task in response.data["results"]), ["API", "Readme"])
+        facets = response.data["facets"]
+        self.assertEqual(facets["status"], {"BACKLOG": 0, "TODO": 2, "IN_PROGRESS": 0, "DONE": 0})
+        self.assertEqual(
+            [(tag["name"], tag["count"]) for tag in facets["tags"]], [("urgent", 2), ("backend", 1), ("docs", 1)]
+        )
+
+    def test_list_query_count_does_not_grow_with_tasks(self):
+        # Tasks, assignees, tags, facets: one query each however many tasks match.
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/tasks/", {"group_id": self.group.id, "facets": "1"})
+
+        api = next(task for task in response.data["results"] if task["title"] == "API")
+        self.assertEqual((api["created_by_name"], api["comments_count"]), ("alice", 1))
+        self.assertEqual([member["name"] for member in api["assigned_members"]], ["alice", "bob"])
+
+
+class SprintBoardTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.sprint = make_sprint(Group.objects.create(name="Team", group_code=1))
+        now = timezone.now()
+        self.todo = []
+        for hours in range(1, 6):
+            task = Task.objects.create(
+                title=f"Todo {hours}", sprint=self.sprint, status="TODO", estimated_hours=hours, actual_hours="0.5"
+            )
+            # Most recently updated first: Todo 5, Todo 4, ...
+            Task.objects.filter(id=task.id).update(updated_at=now - timedelta(minutes=10 - hours))
+            self.todo.append(task)
+        Task.objects.create(title="Done", sprint=self.sprint, status="DONE", estimated_hours=8, actual_hours=9)
+
+    def board(self, **params):
+        response = self.client.get(f"/api/sprints/{self.sprint.id}/board/", params)
+        self.assertEqual(response.status_code, 200)
+        return {column["status"]: column for column in response.data["columns"]}
+
+    def test_every_column_gets_its_first_page_and_full_totals(self):
+        columns = self.board(page_size=2)
+
+        self.assertEqual(list(columns), ["BACKLOG", "TODO", "IN_PROGRESS", "DONE"])
+        todo = columns["TODO"]
+        self.assertEqual((todo["count"], todo["estimated_hours"], todo["actual_hours"]), (5, "15.00", "2.50"))
+        self.assertEqual([task["title"] for task in todo["tasks"]], ["Todo 5", "Todo 4"])
+        self.assertTrue(todo["has_more"])
+        self.assertEqual((columns["DONE"]["count"], columns["DONE"]["has_more"]), (1, False))
+        self.assertEqual((columns["BACKLOG"]["count"], columns["BACKLOG"]["tasks"]), (0, []))
+        self.assertEqual(columns["BACKLOG"]["estimated_hours"], "0.00")
+
+    def test_one_column_pages_independently(self):
+        columns = self.board(column="TODO", page=3, page_size=2)
+
+        self.assertEqual(list(columns), ["TODO"])
+        self.assertEqual([task["title"] for task in columns["TODO"]["tasks"]], ["Todo 1"])
+        self.assertEqual((columns["TODO"]["page"], columns["TODO"]["has_more"]), (3, False))
+
+        past_the_end = self.board(column="TODO", page=4, page_size=2)["TODO"]
+        self.assertEqual((past_the_end["count"], past_the_end["tasks"]), (5, []))
+
+    def test_page_size_is_capped_and_bad_columns_rejected(self):
+        self.assertEqual(self.board(page_size=10_000)["TODO"]["page_size"], 100)
+        self.assertEqual(self.board(page_size="x")["TODO"]["page_size"], 25)
+        response = self.client.get(f"/api/sprints/{self.sprint.id}/board/", {"column": "ARCHIVED"})
+        self.assertEqual(response.status_code, 400)
+
+
+class TaskEstimationWriteTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.group = Group.objects.create(name="Team", group_code=1)
+        self.sprint = make_sprint(self.group)
+        self.manager = make_member("manager")
+        self.manager.roles = "PROJECT_MANAGER"
+        self.manager.save()
+        self.assignee = make_member("assignee")
+        self.tag = Tag.objects.create(name="backend", group=self.group)
+        self.task = Task.objects.create(title="Build", sprint=self.sprint, status="TODO", estimated_hours=4)
+        self.task.member.add(self.assignee)
+
+        self.saves = mock.Mock()
+        post_save.connect(self.saves, sender=Task, dispatch_uid="estimation-write-tests")
+        self.addCleanup(post_save.disconnect, sender=Task, dispatch_uid="estimation-write-tests")
+        patcher = mock.patch.object(
+            views, "generate_task_estimation_analysis", wraps=views.generate_task_estimation_analysis
+        )
+        self.analysis = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def patch(self, actor, **data):
+        response = self.client.patch(f"/api/tasks/{self.task.id}/", {"actor_id": actor.id, **data}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_create_analyses_the_incoming_values_and_saves_once(self):
+        response = self.client.post(
+            "/api/tasks/",
+            {"actor_id": self.manager.id, "title": "Deploy", "sprint": self.sprint.id, "estimated_hours": "6.00",
+             "tag_ids": [self.tag.id]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.analysis.assert_called_once()
+        preview = self.analysis.call_args.args[0]
+        self.assertEqual((preview.id, preview.estimated_hours, preview.tag_count), (None, Decimal("6.00"), 1))
+        self.assertEqual(self.saves.call_count, 1)
+        self.assertIsNotNone(response.data["ai_estimated_hours"])
+        self.assertTrue(response.data["estimation_analysis"])
+
+    def test_status_only_and_unchanged_edits_skip_the_analysis(self):
+        self.patch(self.assignee, status="IN_PROGRESS")
+        self.patch(self.manager, title="Build", estimated_hours="4.00")
+
+        self.analysis.assert_not_called()
+        self.assertEqual(self.saves.call_count, 2)
+
+    def test_changed_inputs_rerun_the_analysis_in_the_same_save(self):
+        data = self.patch(self.manager, estimated_hours="9.00")
+        self.assertEqual(self.analysis.call_count, 1)
+        self.assertEqual(self.analysis.call_args.args[0].estimated_hours, Decimal("9.00"))
+        self.assertEqual(self.saves.call_count, 1)
+        self.task.refresh_from_db()
+        self.assertEqual(str(self.task.ai_estimated_hours), data["ai_estimated_hours"])
+
+        # The tag count feeds the estimator, so retagging counts as a change.
+        self.patch(self.manager, tag_ids=[self.tag.id])
+        self.assertEqual(self.analysis.call_count, 2)
+        self.assertEqual(self.saves.call_count, 2)
@@ -10,12 +10,16 @@ from .views import (
     SprintViewSet,
     TaskViewSet,
     TagViewSet,
+    export,
     github_contributions,
     instructor_discrepancy_dashboard,
+    job_health,
     join_group,
     leave_group,
     login,
+    metrics,
     register,
+    search,
     TaskCommentViewSet,
 )
 
@@ -37,5 +41,9 @@ urlpatterns = [
     path("groups/leave/", leave_group),
     path("members/<int:member_id>/github/", github_contributions, name="github_contributions"),
     path("dashboard/instructor-discrepancy/", instructor_discrepancy_dashboard, name="instructor_discrepancy_dashboard"),
+    path("metrics/", metrics, name="metrics"),
+    path("jobs/health/", job_health, name="job_health"),
+    path("search/", search, name="search"),
+    path("exports/<str:dataset>/", export, name="export"),
     path("", include(router.urls)),
 ]
@@ -1,13 +1,37 @@
 from decimal import Decimal
 
 import requests
-from django.db import models
-from django.db.models import Avg
+from django.db import IntegrityError, connection, models, transaction
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from django.db.models import Avg, Count, Prefetch, Sum
 from rest_framework import status, viewsets
 from rest_framework.decorators import action, api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from .models import ContributionReaction, Dispute, Group, Member, Project, Sprint, SprintContribution, Task, TaskComment, Tag
+from . import audit, exports, github, schedules, search as search_index
+from .analytics import group_velocity, sprint_flow, task_status_history
+from .estimator import count_keywords, get_model as get_estimator_model, predict
+from .outliers import detect_group_outliers, score_task
+from .filters import TAG_MATCH_MODES, filter_tasks_by_tags, parse_id_list, scope_to_group, task_facets
+from .metrics import registry
+from .replica import uses_replica
+from .models import (
+    AuditEntry,
+    ContributionReaction,
+    Dispute,
+    Group,
+    Member,
+    MemberSprintScore,
+    Project,
+    ScoreRefresh,
+    Sprint,
+    SprintContribution,
+    Task,
+    TaskComment,
+    Tag,
+)
 from .serializers import (
     
     DisputeSerializer,
@@ -29,9 +53,110 @@ def _to_decimal(value, default="0.00"):
         return Decimal(default)
 
 
-def _count_keywords(text, words):
-    content = (text or "").lower()
-    return sum(content.count(word) for word in words)
+ESTIMATION_INPUT_FIELDS = ("title", "description", "requirements", "estimated_hours", "actual_hours", "sprint")
+
+
+BOARD_PAGE_SIZE = 25
+BOARD_MAX_PAGE_SIZE = 100
+SCORE_FLOAT_FIELDS = (
+    "estimation_accuracy",
+    "contribution_score",
+    "peer_score",
+    "delivery_score",
+    "accuracy_score",
+    "dispute_penalty",
+    "score",
+)
+SCORE_FIELDS = (
+    "sprint_id",
+    "member_id",
+    "member__name",
+    "story_points",
+    "hours_worked",
+    "positive_reactions",
+    "negative_reactions",
+    "tasks_assigned",
+    "tasks_done",
+    "disputes_upheld",
+    "disputes_pending",
+    "disputes_dismissed",
+    *SCORE_FLOAT_FIELDS,
+    "computed_at",
+)
+AUDIT_PAGE_SIZE = 50
+AUDIT_MAX_PAGE_SIZE = 200
+TASK_AUDIT_FIELDS = (
+    "title",
+    "description",
+    "requirements",
+    "status",
+    "sprint",
+    "estimated_hours",
+    "actual_hours",
+    "member",
+    "tags",
+)
+DISPUTE_AUDIT_FIELDS = ("status", "description", "accused_member", "sprint", "contribution", "tasks_affected")
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+# Longer windows than prune_task_results keeps would just report fewer runs.
+JOB_HEALTH_MAX_DAYS = 14
+
+
+def _to_positive_int(value, default):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return default
+    return number if number > 0 else default
+
+
+def _estimation_inputs_changed(instance, validated_data):
+    # Tag and assignee counts feed the estimator too; any write to them re-runs it.
+    return "tags" in validated_data or "member" in validated_data or any(
+        field in validated_data and validated_data[field] != getattr(instance, field)
+        for field in ESTIMATION_INPUT_FIELDS
+    )
+
+
+def _actor_id(request):
+    """actor_id from the body or query string, for audit entries (None when absent or malformed)."""
+    actor_id = request.data.get("actor_id") or request.query_params.get("actor_id")
+    return int(actor_id) if str(actor_id).isdigit() else None
+
+
+def _sprint_group_id(sprint_id):
+    if not sprint_id:
+        return None
+    return Sprint.objects.filter(id=sprint_id).values_list("group_id", flat=True).first()
+
+
+def _audit_update(request, instance, fields, before):
+    changes = audit.diff(before, audit.snapshot(instance, fields))
+    if changes:
+        audit.record(
+            "STATUS" if changes.keys() == {"status"} else "UPDATE",
+            instance,
+            changes,
+            group_id=_sprint_group_id(instance.sprint_id),
+            actor_id=_actor_id(request),
+        )
+
+
+def _build_estimation_preview(serializer):
+    # Unsaved task carrying the incoming values, so analysis can run before the write.
+    instance = serializer.instance
+    values = {}
+    for field in ESTIMATION_INPUT_FIELDS:
+        if field in serializer.validated_data:
+            values[field] = serializer.validated_data[field]
+        elif instance is not None:
+            values[field] = getattr(instance, field)
+    preview = Task(id=instance.id if instance else None, **values)
+    # Counts for the estimator; None lets it look them up for a saved task.
+    for attr, field in (("tag_count", "tags"), ("assignee_count", "member")):
+        setattr(preview, attr, len(serializer.validated_data[field]) if field in serializer.validated_data else None)
+    return preview
 
 
 def generate_task_estimation_analysis(task):
@@ -44,43 +169,26 @@ def generate_task_estimation_analysis(task):
     historical_avg = historical_with_actuals.aggregate(avg=Avg("actual_hours"))["avg"]
     historical_avg = _to_decimal(historical_avg or "0.00")
 
-    complexity_text = f"{task.title} {task.description} {task.requirements}"
-    complexity_score = 1
-    complexity_score += _count_keywords(
-        complexity_text,
-        [
-            "api",
-            "auth",
-            "database",
-            "migration",
-            "dashboard",
-            "real-time",
-            "analytics",
-            "integration",
-            "testing",
-            "deploy",
-            "bug",
-            "ai",
-        ],
-    )
-    complexity_score += max(len((task.requirements or "").splitlines()) - 1, 0) * 0.25
-    complexity_score += min(len((task.description or "").split()) / 40, 2)
-
     base_estimate = _to_decimal(task.estimated_hours or "0.00")
     if base_estimate <= 0:
         base_estimate = historical_avg if historical_avg > 0 else Decimal("4.00")
 
-    refined_estimate = max(base_estimate, Decimal("1.00")) * Decimal(str(round(1 + (complexity_score - 1) * 0.12, 2)))
-    refined_estimate = refined_estimate.quantize(Decimal("0.01"))
+    model = get_estimator_model(group_id)
+    predicted = predict([task])[0] if model else None
+    if predicted is not None:
+        refined_estimate = max(_to_decimal(predicted), Decimal("1.00")).quantize(Decimal("0.01"))
+    else:
+        # No fitted model yet (too little history, or the first refit is still queued).
+        complexity_text = f"{task.title} {task.description} {task.requirements}"
+        complexity_score = 1
+        complexity_score += count_keywords(complexity_text)
+        complexity_score += max(len((task.requirements or "").splitlines()) - 1, 0) * 0.25
+        complexity_score += min(len((task.description or "").split()) / 40, 2)
+        refined_estimate = max(base_estimate, Decimal("1.00")) * Decimal(str(round(1 + (complexity_score - 1) * 0.12, 2)))
+        refined_estimate = refined_estimate.quantize(Decimal("0.01"))
 
     actual_hours = _to_decimal(task.actual_hours or "0.00")
-    discrepancy_rating = Decimal("0.00")
-    is_outlier = False
-
-    if actual_hours > 0 and refined_estimate > 0:
-        discrepancy_ratio = abs(actual_hours - refined_estimate) / refined_estimate
-        discrepancy_rating = (discrepancy_ratio * Decimal("100")).quantize(Decimal("0.01"))
-        is_outlier = discrepancy_ratio >= Decimal("0.50")
+    discrepancy_rating, is_outlier = score_task(group_id, refined_estimate, actual_hours)
 
     reasons = []
     if actual_hours <= 0:
@@ -96,8 +204,14 @@ def generate_task_estimation_analysis(task):
     if historical_avg > 0:
         reasons.append(f"Group historical average actual time is {historical_avg} hours for comparable work.")
 
+    if predicted is not None:
+        reasons.append(f"The refined estimate comes from a model fitted on {model['trained_on']} completed tasks.")
+
     if is_outlier:
-        reasons.append("This task is flagged as an outlier because the gap between estimated and actual time is 50% or more.")
+        reasons.append(
+            "This task is flagged as an outlier because its actual-to-estimate ratio is far outside "
+            "the group's usual range (or 50% or more off when the group has little history)."
+        )
 
     analysis = " ".join(reasons).strip()
 
@@ -195,20 +309,38 @@ class TaskViewSet(viewsets.ModelViewSet):
     serializer_class = TaskSerializer
 
     def get_queryset(self):
-        qs = Task.objects.all().prefetch_related("member", "tags")
+        qs = Task.objects.all().select_related("created_by").prefetch_related("member", "tags")
         sprint_id = self.request.query_params.get("sprint_id")
         group_id = self.request.query_params.get("group_id")
-        tag_id = self.request.query_params.get("tag_id")
+        tags = self.request.query_params.get("tags") or self.request.query_params.get("tag_id")
+        match = self.request.query_params.get("match", "any")
         if sprint_id:
             qs = qs.filter(sprint_id=sprint_id)
         if group_id:
-            qs = qs.filter(
-                models.Q(sprint__group_id=group_id) | models.Q(member__group__id=group_id)
-            ).distinct()
-        if tag_id:
-            qs = qs.filter(tags__id=tag_id).distinct()
+            qs = scope_to_group(qs, group_id)
+        if tags:
+            tag_ids = parse_id_list(tags)
+            if tag_ids is None:
+                raise ValidationError({"error": "tags must be a comma-separated list of tag ids."})
+            if match not in TAG_MATCH_MODES:
+                raise ValidationError({"error": "match must be 'any' or 'all'."})
+            qs = filter_tasks_by_tags(qs, tag_ids, match)
         return qs
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        # Comment counts come from the list query, not a COUNT per task; the
+        # facets use the plain queryset so their GROUP BYs stay on tasks.
+        tasks = queryset.annotate(comments_total=Count("comments"))
+        page = self.paginate_queryset(tasks)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        data = self.get_serializer(tasks, many=True).data
+        # ?facets=1 wraps the list so the filter sidebar gets its counts in the same request.
+        if request.query_params.get("facets") in ("1", "true"):
+            data = {"results": data, "facets": task_facets(queryset)}
+        return Response(data)
+
     def _get_actor(self, request):
         actor_id = request.data.get("actor_id") or request.query_params.get("actor_id")
         if not actor_id:
@@ -216,18 +348,28 @@ class TaskViewSet(viewsets.ModelViewSet):
         return Member.objects.filter(id=actor_id).first()
 
     def perform_create(self, serializer):
-        task = serializer.save()
-        analysis = generate_task_estimation_analysis(task)
-        for field, value in analysis.items():
-            setattr(task, field, value)
-        task.save()
+        analysis = generate_task_estimation_analysis(_build_estimation_preview(serializer))
+        serializer.save(**analysis)
 
     def perform_update(self, serializer):
-        task = serializer.save()
-        analysis = generate_task_estimation_analysis(task)
-        for field, value in analysis.items():
-            setattr(task, field, value)
-        task.save()
+        before = audit.snapshot(serializer.instance, TASK_AUDIT_FIELDS)
+        # Status-only edits skip the analysis; it only depends on ESTIMATION_INPUT_FIELDS.
+        if not _estimation_inputs_changed(serializer.instance, serializer.validated_data):
+            serializer.save()
+        else:
+            analysis = generate_task_estimation_analysis(_build_estimation_preview(serializer))
+            serializer.save(**analysis)
+        _audit_update(self.request, serializer.instance, TASK_AUDIT_FIELDS, before)
+
+    def perform_destroy(self, instance):
+        audit.record(
+            "DELETE",
+            instance,
+            audit.snapshot(instance, TASK_AUDIT_FIELDS),
+            group_id=_sprint_group_id(instance.sprint_id),
+            actor_id=_actor_id(self.request),
+        )
+        instance.delete()
 
     def partial_update(self, request, *args, **kwargs):
         task = self.get_object()
@@ -290,6 +432,11 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=True, methods=["get"], url_path="history")
+    def history(self, request, pk=None):
+        task = self.get_object()
+        return Response(task_status_history(task))
+
     @action(detail=True, methods=["get"], url_path="analysis")
     def analysis(self, request, pk=None):
         task = self.get_object()
@@ -359,6 +506,82 @@ class SprintViewSet(viewsets.ModelViewSet):
             qs = qs.filter(is_active=is_active.lower() == "true")
         return qs
 
+    @action(detail=True, methods=["get"], url_path="burndown")
+    def burndown(self, request, pk=None):
+        """Daily burndown and cumulative-flow series, replayed from task status events."""
+        sprint = self.get_object()
+        return Response(sprint_flow(sprint))
+
+    @action(detail=True, methods=["get"], url_path="board")
+    def board(self, request, pk=None):
+        """
+        Kanban board for a sprint. Column totals come from a single grouped
+        aggregate; each column's tasks are paginated independently, either
+        all columns at page 1 or one column via ?column=<STATUS>&page=<n>.
+        """
+        sprint = self.get_object()
+        sprint_tasks = Task.objects.filter(sprint=sprint)
+
+        page_size = min(
+            _to_positive_int(request.query_params.get("page_size"), BOARD_PAGE_SIZE),
+            BOARD_MAX_PAGE_SIZE,
+        )
+        page = _to_positive_int(request.query_params.get("page"), 1)
+        column = request.query_params.get("column")
+
+        statuses = Task.STATUS_CHOICES
+        if column:
+            statuses = [choice for choice in Task.STATUS_CHOICES if choice[0] == column]
+            if not statuses:
+                return Response({"error": "Invalid column."}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            page = 1
+
+        totals = {
+            row["status"]: row
+            for row in sprint_tasks.values("status").annotate(
+                count=Count("id"),
+                estimated_hours=Sum("estimated_hours"),
+                actual_hours=Sum("actual_hours"),
+            )
+        }
+
+        columns = []
+        for status_value, label in statuses:
+            column_totals = totals.get(status_value, {})
+            count = column_totals.get("count", 0)
+            offset = (page - 1) * page_size
+            column_tasks = []
+            if offset < count:
+                column_tasks = (
+                    sprint_tasks.filter(status=status_value)
+                    .select_related("created_by")
+                    .prefetch_related("member", "tags")
+                    .annotate(comments_total=Count("comments"))
+                    .order_by("-updated_at", "id")[offset:offset + page_size]
+                )
+            columns.append(
+                {
+                    "status": status_value,
+                    "label": label,
+                    "count": count,
+                    "estimated_hours": str(_to_decimal(column_totals.get("estimated_hours") or "0.00").quantize(Decimal("0.01"))),
+                    "actual_hours": str(_to_decimal(column_totals.get("actual_hours") or "0.00").quantize(Decimal("0.01"))),
+                    "page": page,
+                    "page_size": page_size,
+                    "has_more": offset + page_size < count,
+                    "tasks": TaskSerializer(column_tasks, many=True).data,
+                }
+            )
+
+        return Response(
+            {
+                "sprint_id": sprint.id,
+                "sprint_name": sprint.name,
+                "columns": columns,
+            }
+        )
+
 
 class MemberViewSet(viewsets.ModelViewSet):
     queryset = Member.objects.all()
@@ -368,30 +591,129 @@ class MemberViewSet(viewsets.ModelViewSet):
         qs = Member.objects.all()
         group_id = self.request.query_params.get("group_id")
         if group_id:
-            qs = qs.filter(group__id=group_id).distinct()
+            qs = scope_to_group(qs, group_id)
         return qs
 
 class GroupViewSet(viewsets.ModelViewSet):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
 
+    @action(detail=True, methods=["post"], url_path="detect-outliers")
+    def detect_outliers(self, request, pk=None):
+        group = self.get_object()
+        return Response(detect_group_outliers(group.id))
+
+    @action(detail=True, methods=["get"], url_path="velocity")
+    def velocity(self, request, pk=None):
+        group = self.get_object()
+        return Response(group_velocity(group.id))
+
+    @action(detail=True, methods=["get"], url_path="audit")
+    def audit_log(self, request, pk=None):
+        """
+        Newest-first audit trail for the group, filtered by ?action=,
+        ?target_type=, ?target_id= and ?actor_id=, paginated with page/page_size.
+        """
+        group = self.get_object()
+        # Entries from this process may still be buffered; write them first.
+        audit.flush()
+
+        entries = AuditEntry.objects.filter(group_id=group.id)
+        for param in ("action", "target_type"):
+            value = request.query_params.get(param)
+            if value:
+                entries = entries.filter(**{param: value.upper() if param == "action" else value})
+        for param in ("target_id", "actor_id"):
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            if not value.isdigit():
+                return Response({"error": f"{param} must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+            entries = entries.filter(**{param: int(value)})
+
+        page = _to_positive_int(request.query_params.get("page"), 1)
+        page_size = min(
+            _to_positive_int(request.query_params.get("page_size"), AUDIT_PAGE_SIZE),
+            AUDIT_MAX_PAGE_SIZE,
+        )
+        count = entries.count()
+        offset = (page - 1) * page_size
+        rows = []
+        # Pages past the end never reach the database, so an oversized ?page= can't overflow OFFSET.
+        if offset < count:
+            rows = list(
+                entries.order_by("-created_at", "-id").values(
+                    "id", "action", "target_type", "target_id", "actor_id", "changes", "created_at"
+                )[offset:offset + page_size]
+            )
+        return Response(
+            {
+                "group_id": group.id,
+                "count": count,
+                "page": page,
+                "page_size": page_size,
+                "has_more": offset + page_size < count,
+                "results": rows,
+            }
+        )
+
+    @action(detail=True, methods=["get"], url_path="scores")
+    def scores(self, request, pk=None):
+        """Materialized member scores per sprint; ?sprint_id= and ?member_id= narrow it down."""
+        group = self.get_object()
+        rows = MemberSprintScore.objects.filter(group_id=group.id)
+        for param in ("sprint_id", "member_id"):
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            if not value.isdigit():
+                return Response({"error": f"{param} must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+            rows = rows.filter(**{param: int(value)})
+
+        results = []
+        for row in rows.order_by("sprint_id", "-score").values(*SCORE_FIELDS):
+            row["hours_worked"] = str(row["hours_worked"].quantize(Decimal("0.01")))
+            for field in SCORE_FLOAT_FIELDS:
+                if row[field] is not None:
+                    row[field] = round(row[field], 2)
+            results.append(row)
+        stale = ScoreRefresh.objects.filter(sprint__group_id=group.id).values_list("sprint_id", flat=True)
+        return Response({"group_id": group.id, "stale_sprints": sorted(stale), "results": results})
+
 
 class ProjectViewSet(viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
 
     @action(detail=True, methods=["get"])
+    @uses_replica
     def timeline(self, request, pk=None):
         project = self.get_object()
         return Response(project.get_timeline())
 
 
 class SprintContributionViewSet(viewsets.ModelViewSet):
-    queryset = SprintContribution.objects.all().select_related("member", "sprint").prefetch_related("reactions")
+    queryset = SprintContribution.objects.all().select_related("member", "sprint")
     serializer_class = SprintContributionSerializer
 
+    def _current_member_id(self):
+        return (
+            self.request.query_params.get("current_member_id")
+            or self.request.query_params.get("member_id")
+            or self.request.data.get("member_id")
+        )
+
     def get_queryset(self):
-        qs = SprintContribution.objects.all().select_related("member", "sprint").prefetch_related("reactions")
+        qs = SprintContribution.objects.all().select_related("member", "sprint").prefetch_related("tasks_handled")
+        current_member_id = self._current_member_id()
+        if current_member_id and str(current_member_id).isdigit():
+            qs = qs.prefetch_related(
+                Prefetch(
+                    "reactions",
+                    queryset=ContributionReaction.objects.filter(member_id=current_member_id),
+                    to_attr="current_user_reactions",
+                )
+            )
         member_id = self.request.query_params.get("member_id")
         sprint_id = self.request.query_params.get("sprint_id")
         group_id = self.request.query_params.get("group_id")
@@ -400,31 +722,27 @@ class SprintContributionViewSet(viewsets.ModelViewSet):
         if sprint_id:
             qs = qs.filter(sprint_id=sprint_id)
         if group_id:
-            qs = qs.filter(sprint__group_id=group_id)
+            qs = scope_to_group(qs, group_id)
         return qs
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-        context["member_id"] = (
-            self.request.query_params.get("current_member_id")
-            or self.request.query_params.get("member_id")
-            or self.request.data.get("member_id")
-        )
+        context["member_id"] = self._current_member_id()
         return context
 
     @action(detail=True, methods=["post"], url_path="reaction")
     def reaction(self, request, pk=None):
-        contribution = self.get_object()
-        member_id = request.data.get("member_id")
+        contribution = SprintContribution.objects.filter(pk=pk).values("id", "member_id").first()
+        if not contribution:
+            return Response({"error": "Contribution not found."}, status=status.HTTP_404_NOT_FOUND)
 
+        member_id = request.data.get("member_id")
         if not member_id:
             return Response({"error": "member_id is required."}, status=status.HTTP_400_BAD_REQUEST)
-
-        member = Member.objects.filter(id=member_id).first()
-        if not member:
+        if not str(member_id).isdigit():
             return Response({"error": "Member not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        if contribution.member_id == member.id:
+        if contribution["member_id"] == int(member_id):
             return Response(
                 {"error": "Users cannot react to their own contributions."},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -438,18 +756,21 @@ class SprintContributionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        existing = ContributionReaction.objects.filter(contribution=contribution, member=member).first()
-        if existing and existing.reaction == reaction:
-            existing.delete()
-        else:
-            ContributionReaction.objects.update_or_create(
-                contribution=contribution,
-                member=member,
-                defaults={"reaction": reaction},
-            )
+        # The member's existence is enforced by the reaction's foreign key rather than a lookup.
+        try:
+            summary, current = ContributionReaction.toggle(contribution["id"], int(member_id), reaction)
+        except SprintContribution.DoesNotExist:
+            return Response({"error": "Contribution not found."}, status=status.HTTP_404_NOT_FOUND)
+        except IntegrityError:
+            return Response({"error": "Member not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = self.get_serializer(self.get_object())
-        return Response(serializer.data)
+        return Response(
+            {
+                "id": contribution["id"],
+                "reaction_summary": summary,
+                "current_user_reaction": current,
+            }
+        )
 
 
 class DisputeViewSet(viewsets.ModelViewSet):
@@ -470,8 +791,31 @@ class DisputeViewSet(viewsets.ModelViewSet):
 
         return qs
 
+    def perform_update(self, serializer):
+        before = audit.snapshot(serializer.instance, DISPUTE_AUDIT_FIELDS)
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError:
+            # dispute_open_auto_unique: reopening a duplicate of an unresolved auto-generated dispute.
+            raise ValidationError({"error": "This member already has an unresolved dispute for this task."})
+        _audit_update(self.request, serializer.instance, DISPUTE_AUDIT_FIELDS, before)
+
+
+def metrics(request):
+    """Process-local metrics in Prometheus text format; plain Django view so DRF renderers stay out of it."""
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@api_view(["GET"])
+def job_health(request):
+    """Last run, recent success rate and duration, next run and queue depth for every scheduled job."""
+    days = _to_positive_int(request.query_params.get("days"), schedules.JOB_HEALTH_WINDOW_DAYS)
+    return Response(schedules.job_health(window_days=min(days, JOB_HEALTH_MAX_DAYS)))
+
 
 @api_view(["GET"])
+@uses_replica
 def instructor_discrepancy_dashboard(request):
     group_id = request.query_params.get("group_id")
     task_qs = Task.objects.all().select_related("sprint", "sprint__group")
@@ -529,6 +873,73 @@ def instructor_discrepancy_dashboard(request):
     )
 
 
+@api_view(["GET"])
+def search(request):
+    query = (request.query_params.get("q") or "").strip()
+    group_id = request.query_params.get("group_id")
+    kinds = [kind for kind in (request.query_params.get("kind") or "").split(",") if kind]
+
+    if not query:
+        return Response({"error": "q is required."}, status=status.HTTP_400_BAD_REQUEST)
+    if not group_id or not str(group_id).isdigit():
+        return Response({"error": "group_id is required."}, status=status.HTTP_400_BAD_REQUEST)
+    if any(kind not in search_index.KINDS for kind in kinds):
+        return Response(
+            {"error": f"kind must be one of: {', '.join(search_index.KINDS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if connection.vendor != "sqlite":
+        return Response({"error": "Search requires SQLite FTS5."}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    page = _to_positive_int(request.query_params.get("page"), 1)
+    page_size = min(
+        _to_positive_int(request.query_params.get("page_size"), SEARCH_PAGE_SIZE),
+        SEARCH_MAX_PAGE_SIZE,
+    )
+    total, results = search_index.search(
+        query, group_id, kinds=kinds, limit=page_size, offset=(page - 1) * page_size,
+    )
+    return Response(
+        {
+            "count": total,
+            "page": page,
+            "page_size": page_size,
+            "has_more": page * page_size < total,
+            "results": results,
+        }
+    )
+
+
+@require_GET
+def export(request, dataset):
+    """
+    Streams a whole-cohort export (GET /api/exports/<dataset>/) as CSV or
+    NDJSON, optionally gzipped. Plain Django view: rows are written as they
+    are read, which DRF's buffered Response can't do.
+    """
+    if dataset not in exports.DATASETS:
+        return JsonResponse(
+            {"error": f"dataset must be one of: {', '.join(exports.DATASETS)}."}, status=status.HTTP_404_NOT_FOUND
+        )
+    fmt = request.GET.get("format", "csv")
+    if fmt not in exports.FORMATS:
+        return JsonResponse(
+            {"error": f"format must be one of: {', '.join(exports.FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        filters = exports.parse_filters(request.GET)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    compress = request.GET.get("gzip") in {"1", "true"}
+
+    response = StreamingHttpResponse(
+        exports.stream_export(dataset, fmt, compress, **filters),
+        content_type="application/gzip" if compress else exports.CONTENT_TYPES[fmt],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{exports.filename(dataset, fmt, compress, filters)}"'
+    return response
+
+
 @api_view(["POST"])
 def register(request):
     data = request.data or {}
@@ -640,50 +1051,9 @@ def github_contributions(request, member_id):
     if not member.github_username:
         return Response({"error": "No GitHub account linked."}, status=status.HTTP_400_BAD_REQUEST)
 
-    username = member.github_username
-    headers = {"Accept": "application/vnd.github.v3+json"}
-    if member.github_token:
-        headers["Authorization"] = f"token {member.github_token}"
-
-    commits = []
-    repos_set = set()
-    issues_count = 0
-
     try:
-        events_url = f"https://api.github.com/users/{username}/events/public"
-        events_res = requests.get(events_url, headers=headers, timeout=10)
-        if events_res.status_code == 200:
-            events = events_res.json()
-            for event in events[:30]:
-                if event.get("type") == "PushEvent":
-                    repo_name = event.get("repo", {}).get("name", "")
-                    repos_set.add(repo_name)
-                    for c in event.get("payload", {}).get("commits", [])[:5]:
-                        commits.append(
-                            {
-                                "repo": repo_name,
-                                "message": c.get("message", ""),
-                                "sha": c.get("sha", "")[:7],
-                            }
-                        )
-                elif event.get("type") in ["CreateEvent", "PullRequestEvent", "IssuesEvent"]:
-                    repo_name = event.get("repo", {}).get("name", "")
-                    repos_set.add(repo_name)
-
-        issues_url = f"https://api.github.com/search/issues?q=author:{username}+type:issue"
-        issues_res = requests.get(issues_url, headers=headers, timeout=10)
-        if issues_res.status_code == 200:
-            issues_count = issues_res.json().get("total_count", 0)
-
+        activity = github.get_activity(member)
     except requests.RequestException as e:
         return Response({"error": f"GitHub API error: {str(e)}"}, status=status.HTTP_502_BAD_GATEWAY)
 
-    return Response(
-        {
-            "username": username,
-            "commits": commits[:20],
-            "issues_count": issues_count,
-            "repos": list(repos_set)[:15],
-        },
-        status=status.HTTP_200_OK,
-    )
+    return Response(activity, status=status.HTTP_200_OK)
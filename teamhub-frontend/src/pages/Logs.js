@@ -154,7 +154,8 @@ export default function Logs() {
         method: "POST",
         body: JSON.stringify({ member_id: memberId, reaction }),
       });
-      setContributions((prev) => prev.map((c) => (c.id === contribution.id ? updated : c)));
+      // The reaction endpoint returns only the new counts and the caller's reaction.
+      setContributions((prev) => prev.map((c) => (c.id === contribution.id ? { ...c, ...updated } : c)));
     } catch (err) {
       setError(err.message);
     }